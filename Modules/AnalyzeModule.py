@@ -0,0 +1,290 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import ensure_packages
+
+ensure_packages(["numpy", "pandas"])
+
+import numpy as np
+import pandas as pd
+
+_URL_PATTERN = r"https?://"
+# compare metric -> (turn column, aggregate over the matched turns)
+_COMPARE_METRICS = {
+    "pass_rate": ("passed", "mean"),
+    "loops_mean": ("loops", "mean"),
+    "latency_p50_s": ("latency_s", "median"),
+    "tokens_mean": ("tokens", "mean"),
+    "refs_mean": ("refs", "mean"),
+    "length_mean": ("length", "mean"),
+}
+_TURN_KEY = ["case_key", "run", "turn"]
+
+
+class AnalyzeModule:
+    """Aggregates EXP outputs (wide CSV, matrix long CSV, trace JSONL/Parquet) into one report.
+
+    Every input is reduced to a turn-level frame (one row per source/config,
+    case, run, turn) plus, for traces, a stage-level frame; all metrics are
+    vectorized group-bys over those frames.
+
+    Comparisons are per configuration (the EXP directory, plus the config
+    label for matrix/trace outputs) against `baseline` (default: the
+    configuration of the first input), over the turns both have run: the
+    same case (first user message, or case_id for traces), run and turn.
+    """
+
+    def __init__(self, inputs: List[str], report_path: Path = None, baseline: Optional[str] = None) -> None:
+        self.inputs = [Path(p) for p in inputs]
+        self.report_path = Path(report_path) if report_path else None
+        self.baseline = baseline
+
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        turns, stages = self._load(self._expand_inputs())
+        if turns.empty:
+            print("[CritiqueBot] analyze: 분석할 결과 파일을 찾지 못했습니다.")
+            return {}
+        report = {
+            "summary": self._summary(turns),
+            "loops_to_pass": self._loops_to_pass(turns),
+            "stage_latency": self._stage_latency(stages),
+        }
+        report["compare"] = self._compare(turns)
+        self._print(report)
+        if self.report_path:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"[CritiqueBot] analyze 리포트 저장: {self.report_path}")
+        print(f"[CritiqueBot] analyze: {len(turns):,}턴 / {len(stages):,}단계 레코드, {time.perf_counter() - started:.2f}s")
+        return report
+
+    def _expand_inputs(self) -> List[Path]:
+        files: List[Path] = []
+        for path in self.inputs:
+            if path.is_dir():
+                files.extend(sorted(path.glob("*.trace.jsonl")))
+                files.extend(sorted(path.glob("*.parquet")))
+                files.extend(sorted(p for p in path.glob("out*.csv")))
+            elif path.exists():
+                files.append(path)
+            else:
+                print(f"[CritiqueBot] analyze: 경로를 찾을 수 없습니다: {path}")
+        return files
+
+    def _source_label(self, path: Path) -> str:
+        name = path.name
+        for suffix in (".trace.jsonl", ".jsonl", ".parquet", ".csv"):
+            if name.endswith(suffix):
+                name = name[: -len(suffix)]
+                break
+        return f"{path.parent.name}/{name}"
+
+    @staticmethod
+    def _config_label(path: Path) -> str:
+        return path.parent.name or "."
+
+    def _load(self, files: List[Path]):
+        turn_frames, stage_frames = [], []
+        for path in files:
+            if path.stat().st_size == 0:
+                continue
+            source = self._source_label(path)
+            if path.suffix == ".parquet" or path.name.endswith(".jsonl"):
+                turns, stages = self._from_trace(path, source)
+                stage_frames.append(stages)
+            else:
+                turns = self._from_csv(path, source)
+            turn_frames.append(turns)
+        turns = pd.concat(turn_frames, ignore_index=True) if turn_frames else pd.DataFrame()
+        stages = pd.concat(stage_frames, ignore_index=True) if stage_frames else pd.DataFrame()
+        return turns, stages
+
+    def _from_csv(self, path: Path, source: str) -> pd.DataFrame:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        if {"config", "turn", "model"}.issubset(df.columns):
+            # Long format written by matrix runs.
+            long = df.rename(columns={"ref": "refs_text"})
+            long["source"] = source + ":" + long["config"]
+            long["turn"] = pd.to_numeric(long["turn"], errors="coerce")
+            long["case_key"] = long.groupby(["config", "case_id", "run"], sort=False)["user"].transform("first")
+            long["config"] = self._config_label(path) + ":" + long["config"]
+        else:
+            model_cols = [c for c in df.columns if c.startswith("model") and c[5:].isdigit()]
+            frames = []
+            for col in model_cols:
+                idx = col[5:]
+                part = df[["case_id", "run"]].copy()
+                part["turn"] = int(idx)
+                part["model"] = df[col]
+                part["refs_text"] = df.get(f"ref{idx}", "")
+                part["case_key"] = df["user1"] if "user1" in df.columns else df["case_id"]
+                frames.append(part)
+            long = (
+                pd.concat(frames, ignore_index=True)
+                if frames
+                else pd.DataFrame(columns=["case_id", "run", "turn", "model", "case_key"])
+            )
+            long["source"] = source
+            long["config"] = self._config_label(path)
+            long = long[long["model"].str.len() > 0]
+        out = pd.DataFrame(
+            {
+                "source": long["source"],
+                "config": long["config"],
+                "case_key": long["case_key"],
+                "case_id": long["case_id"],
+                "run": pd.to_numeric(long["run"], errors="coerce"),
+                "turn": long["turn"],
+                "length": long["model"].str.len(),
+                "refs": long["refs_text"].str.count(_URL_PATTERN),
+            }
+        )
+        for col in ("passed", "loops", "latency_s", "tokens", "score"):
+            out[col] = np.nan
+        return out
+
+    def _from_trace(self, path: Path, source: str):
+        if path.suffix == ".parquet":
+            ensure_packages(["pyarrow"])
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_json(path, lines=True, dtype=False)
+        df["source"] = source + ":" + df["config"].astype(str)
+        final = df[df["stage"] == "final"]
+        refs = final["refs"].map(_count_refs)
+        turns = pd.DataFrame(
+            {
+                "source": final["source"],
+                "config": self._config_label(path) + ":" + final["config"].astype(str),
+                "case_key": final["case_id"].astype(str),
+                "case_id": final["case_id"],
+                "run": final["run"],
+                "turn": final["turn"],
+                "length": final["rebuttal"].fillna("").astype(str).str.len(),
+                "refs": refs,
+                "passed": final["passed"].astype(float),
+                "loops": final["loop"].astype(float),
+                "latency_s": final["duration_ms"] / 1000,
+                "tokens": final["total_tokens"].astype(float),
+                "score": pd.to_numeric(final["score"], errors="coerce"),
+            }
+        )
+        stages = df.loc[df["stage"] != "final", ["source", "stage", "duration_ms", "total_tokens"]]
+        return turns, stages
+
+    def _summary(self, turns: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        grouped = turns.groupby("source", sort=False)
+        summary = pd.DataFrame(
+            {
+                "turns": grouped.size(),
+                "pass_rate": grouped["passed"].mean() * 100,
+                "loops_mean": grouped["loops"].mean(),
+                "score_mean": grouped["score"].mean(),
+                "latency_p50_s": grouped["latency_s"].quantile(0.5),
+                "latency_p95_s": grouped["latency_s"].quantile(0.95),
+                "tokens_mean": grouped["tokens"].mean(),
+                "tokens_total": grouped["tokens"].sum(min_count=1),
+                "refs_mean": grouped["refs"].mean(),
+                "refs_zero_rate": turns["refs"].eq(0).groupby(turns["source"], sort=False).mean() * 100,
+                "length_mean": grouped["length"].mean(),
+                "length_p95": grouped["length"].quantile(0.95),
+            }
+        )
+        return _records(summary)
+
+    def _loops_to_pass(self, turns: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        passed = turns[turns["passed"] == 1]
+        if passed.empty:
+            return {}
+        table = passed.groupby(["source", "loops"]).size().unstack(fill_value=0)
+        table.columns = [str(int(c)) for c in table.columns]
+        return _records(table)
+
+    def _stage_latency(self, stages: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        if stages.empty:
+            return {}
+        grouped = stages.groupby(["source", "stage"], sort=False)
+        table = pd.DataFrame(
+            {
+                "count": grouped.size(),
+                "p50_ms": grouped["duration_ms"].quantile(0.5),
+                "p95_ms": grouped["duration_ms"].quantile(0.95),
+                "p99_ms": grouped["duration_ms"].quantile(0.99),
+                "tokens_mean": grouped["total_tokens"].mean(),
+            }
+        )
+        table.index = [f"{source} | {stage}" for source, stage in table.index]
+        return _records(table)
+
+    def _compare(self, turns: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        configs = list(dict.fromkeys(turns["config"]))
+        if len(configs) < 2:
+            return {}
+        baseline = self.baseline or configs[0]
+        if baseline not in configs:
+            print(f"[CritiqueBot] analyze: 기준 설정 '{baseline}' 이(가) 없습니다. 사용 가능: {', '.join(configs)}")
+            return {}
+        columns = list(dict.fromkeys(column for column, _ in _COMPARE_METRICS.values()))
+        frame = turns.assign(passed=turns["passed"] * 100)
+        # One value per (config, case, run, turn); repeated outputs of a config (e.g. out29 and out99) are averaged.
+        per_turn = frame.groupby(["config", *_TURN_KEY], sort=False)[columns].mean()
+        base = per_turn.xs(baseline, level="config")
+        compare = {}
+        for config in configs:
+            if config == baseline:
+                continue
+            other = per_turn.xs(config, level="config")
+            shared = other.index.intersection(base.index)
+            deltas: Dict[str, Any] = {"matched_turns": float(len(shared))}
+            for metric, (column, how) in _COMPARE_METRICS.items():
+                a = getattr(base.loc[shared, column], how)()
+                b = getattr(other.loc[shared, column], how)()
+                deltas[metric] = None if pd.isna(a) or pd.isna(b) else round(float(b - a), 3)
+            compare[f"{config} vs {baseline}"] = deltas
+        return compare
+
+    def _print(self, report: Dict[str, Any]) -> None:
+        _print_table("결과 요약", report["summary"])
+        if report["loops_to_pass"]:
+            _print_table("통과까지 루프 수 분포", report["loops_to_pass"])
+        if report["stage_latency"]:
+            _print_table("단계별 지연 (ms)", report["stage_latency"])
+        if report["compare"]:
+            _print_table("기준 설정 대비 차이 (같은 케이스/run/턴끼리)", report["compare"])
+
+
+def _count_refs(value) -> int:
+    if isinstance(value, dict):
+        return len(value)
+    if isinstance(value, str) and value:
+        try:
+            return len(json.loads(value))
+        except ValueError:
+            return 0
+    return 0
+
+
+def _records(frame: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    frame = frame.astype(float).round(3)
+    return {
+        str(index): {col: (None if pd.isna(val) else val) for col, val in row.items()}
+        for index, row in frame.to_dict(orient="index").items()
+    }
+
+
+def _print_table(title: str, rows: Dict[str, Dict[str, Any]]) -> None:
+    columns: List[str] = []
+    for values in rows.values():
+        columns.extend(c for c in values if c not in columns)
+    label_width = max([len(title)] + [len(k) for k in rows]) + 2
+    print(f"\n[CritiqueBot] {title}")
+    print(f"{'':<{label_width}}" + "".join(f"{c:>15}" for c in columns))
+    for label, values in rows.items():
+        cells = []
+        for col in columns:
+            val = values.get(col)
+            cells.append(f"{'-':>15}" if val is None else f"{val:>15,.2f}")
+        print(f"{label:<{label_width}}" + "".join(cells))
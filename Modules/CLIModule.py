@@ -1,3 +1,6 @@
+from .ReferenceValidator import REFERENCE_VALIDATOR
+
+
 class CLIModule:
     def __init__(self, critic_module, evaluation_module=None):
         self.cm = critic_module
@@ -41,7 +44,9 @@ class CLIModule:
             print("\n🤖 봇의 반박:")
             print(rsp["txt"])
 
-            refs = rsp.get("ref") or {}
+            # A validating critic already probed these; only read its cached verdicts then.
+            network = not getattr(self.cm, "validate_refs", False)
+            refs = REFERENCE_VALIDATOR.filter_refs(rsp.get("ref") or {}, network=network)
             if refs:
                 print("\n🔗 참조 링크:")
                 for title, url in refs.items():
@@ -0,0 +1,142 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .Metrics import METRICS
+
+CIRCUIT_BREAKER_DEFAULTS: Dict[str, Any] = {
+    # Consecutive failed calls that open the breaker.
+    "failure_threshold": 3,
+    # Seconds an open breaker waits before letting one half-open probe through.
+    "reset_timeout_s": 30.0,
+}
+
+# Gauge values for critiquebot_circuit_state.
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+CIRCUIT_STATE = METRICS.gauge(
+    "critiquebot_circuit_state", "Circuit breaker state by backend (0 closed, 1 half-open, 2 open).", ("backend",)
+)
+CIRCUIT_TRANSITIONS = METRICS.counter(
+    "critiquebot_circuit_transitions_total", "Circuit breaker state changes by backend and new state.", ("backend", "state")
+)
+CIRCUIT_REJECTED = METRICS.counter(
+    "critiquebot_circuit_rejected_total", "Calls skipped because the breaker was open, by backend.", ("backend",)
+)
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling a backend whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker shared by every caller of one backend.
+
+    closed -> open after `failure_threshold` failures in a row; open -> half-open
+    once `reset_timeout_s` has passed, where a single probe call decides between
+    closed (success) and another open period (failure).
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        failure_threshold: int = 3,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.stats = {"opened": 0, "rejected": 0, "probes": 0}
+        CIRCUIT_STATE.set(_STATE_VALUES["closed"], backend=backend)
+
+    def configure(self, options: Optional[Dict[str, Any]]) -> None:
+        settings = dict(CIRCUIT_BREAKER_DEFAULTS)
+        settings.update({k: v for k, v in (options or {}).items() if k in CIRCUIT_BREAKER_DEFAULTS})
+        with self._lock:
+            self.failure_threshold = max(1, int(settings["failure_threshold"]))
+            self.reset_timeout_s = float(settings["reset_timeout_s"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._set_state("closed")
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+            self.stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            CIRCUIT_TRANSITIONS.inc(backend=self.backend, state=state)
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], backend=self.backend)
+
+    def _probe_due(self) -> bool:
+        return self.opened_at is not None and self._clock() - self.opened_at >= self.reset_timeout_s
+
+    def available(self) -> bool:
+        """Whether a call made now could go through (closed, or a half-open probe slot is free)."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                return self._probe_due()
+            return not self._probe_in_flight
+
+    def allow(self) -> bool:
+        """Claims permission for one call; in half-open only the first caller gets through as the probe."""
+        with self._lock:
+            if self.state == "open" and self._probe_due():
+                self._set_state("half_open")
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.stats["probes"] += 1
+                return True
+            self.stats["rejected"] += 1
+        CIRCUIT_REJECTED.inc(backend=self.backend)
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self.opened_at = None
+            self._set_state("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            probe_failed = self.state == "half_open"
+            self._probe_in_flight = False
+            if probe_failed or (self.state == "closed" and self.failures >= self.failure_threshold):
+                if self.state == "closed":
+                    self.stats["opened"] += 1
+                self.opened_at = self._clock()
+                self._set_state("open")
+
+    def release(self) -> None:
+        """Ends a call without a verdict (e.g. cut short by our own request deadline): frees a claimed
+        probe slot and leaves the failure count alone."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            stats, state = dict(self.stats), self.state
+        if not stats["opened"] and not stats["rejected"]:
+            return []
+        return [
+            f"[CritiqueBot] {self.backend} 차단기: 현재 {state}, 열림 {stats['opened']}회, "
+            f"건너뛴 호출 {stats['rejected']}회, half-open 재시도 {stats['probes']}회"
+        ]
+
+
+TAVILY_BREAKER = CircuitBreaker("tavily", **CIRCUIT_BREAKER_DEFAULTS)
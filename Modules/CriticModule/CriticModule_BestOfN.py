@@ -0,0 +1,207 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..Deadline import DEADLINE_DEFAULTS, Deadline, deadline_scope, is_timeout
+from ..Metrics import JUDGE_VERDICTS, LOOPS_PER_TURN
+from ..TraceWriter import emit_trace, rebuttal_fields, trace_stage
+from ..utils import SUBMODULE_PROGRESS_LOGGER, _submit_in_context, _test_mode_print, _usage_scope
+from .CriticModule_ver1 import TIMEOUT_REBUTTAL, public_rebuttal
+
+BEST_OF_N_DEFAULTS = {
+    "n_candidates": 3,
+    "refine_rounds": 1,
+}
+
+
+class CriticModule_BestOfN:
+    """Parallel variant of CriticModule_ver1.
+
+    One summary (and, for rebuttal modules exposing prepare/compose, one evidence
+    pool) is shared by N concurrently generated rebuttal candidates, which are then
+    judged concurrently. The top scorer is returned; TextGrad refinement only runs
+    when no candidate passes the judge threshold.
+
+    Like CriticModule_ver1, every call runs under a request Deadline: candidates
+    whose generation times out are dropped, ones whose judging times out stay
+    unscored, and any other timeout returns the best candidate so far.
+    """
+
+    def __init__(self, summarizer, rebuttal, internal_judge, text_grad, options=None):
+        self.s = summarizer
+        self.r = rebuttal
+        self.ij = internal_judge
+        self.tg = text_grad
+        opts = dict(BEST_OF_N_DEFAULTS)
+        opts.update({k: v for k, v in (options or {}).items() if k in BEST_OF_N_DEFAULTS})
+        self.n_candidates = max(1, int(opts["n_candidates"]))
+        self.refine_rounds = max(0, int(opts["refine_rounds"]))
+        self.deadline_options = {k: v for k, v in (options or {}).items() if k in DEADLINE_DEFAULTS}
+        self.deadline_s = (options or {}).get("deadline_s")
+
+    def _extract_grad(self, grad, key):
+        if isinstance(grad, dict):
+            return grad.get(key)
+        return grad
+
+    def _label(self, round_label, name):
+        if SUBMODULE_PROGRESS_LOGGER.single_line:
+            return name
+        return f"{round_label} {name}"
+
+    def _compose_candidate(self, round_no, idx, fn, *args):
+        with trace_stage("rebuttal", round_no, candidate=idx) as trace:
+            candidate = fn(*args)
+            trace.update(rebuttal_fields(candidate))
+        return candidate
+
+    def _score_candidate(self, round_no, idx, history, smry, candidate):
+        try:
+            with trace_stage("judge", round_no, candidate=idx) as trace:
+                score, feedback = self.ij.score(history, smry, candidate)
+                passed = self._passed(score)
+                trace.update(score=score, passed=passed, feedback=feedback)
+        except Exception as exc:
+            if not is_timeout(exc):
+                raise
+            _test_mode_print(f"[CritiqueBot] 후보 {idx} 심사 시간 초과 - 점수 없이 유지: {exc}")
+            return None, None
+        JUDGE_VERDICTS.inc(result="pass" if passed else "fail")
+        return score, feedback
+
+    @staticmethod
+    def _finished(futures):
+        """Results of the futures that did not time out; re-raises the timeout when none finished."""
+        results, timeout = [], None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                if not is_timeout(exc):
+                    raise
+                timeout = exc
+        if timeout is not None:
+            _test_mode_print(f"[CritiqueBot] 후보 {len(futures) - len(results)}개 생성 시간 초과: {timeout}")
+            if not results:
+                raise timeout
+        return results
+
+    def _generate_candidates(self, pool, round_no, history, smry, grad):
+        if hasattr(self.r, "prepare") and hasattr(self.r, "compose"):
+            # Shared query generation + search; traced on its own so stage tokens add up to the turn's.
+            with trace_stage("evidence", round_no) as trace:
+                context = self.r.prepare(history, smry, grad)
+                trace["queries"] = context.get("queries") if isinstance(context, dict) else None
+            futures = [
+                _submit_in_context(
+                    pool, self._compose_candidate, round_no, idx, self.r.compose, history, smry, grad, context
+                )
+                for idx in range(self.n_candidates)
+            ]
+        else:
+            futures = [
+                _submit_in_context(pool, self._compose_candidate, round_no, idx, self.r.call, history, smry, grad)
+                for idx in range(self.n_candidates)
+            ]
+        return self._finished(futures)
+
+    def _judge_candidates(self, pool, round_no, history, smry, candidates):
+        futures = [
+            _submit_in_context(pool, self._score_candidate, round_no, idx, history, smry, candidate)
+            for idx, candidate in enumerate(candidates)
+        ]
+        return [future.result() for future in futures]
+
+    def _passed(self, score):
+        threshold = getattr(self.ij, "pass_threshold", None)
+        if threshold is None:
+            return True
+        return score is not None and score >= threshold
+
+    def call(self, history, max_loop=None):
+        rounds = 1 + self.refine_rounds
+        if max_loop is not None:
+            rounds = max(1, min(rounds, max_loop))
+        started = time.monotonic()
+        deadline = Deadline.from_options(self.deadline_options, self.deadline_s)
+        # Best (candidate, score, feedback, summary) and rounds started so far, kept for a timeout.
+        progress = {"best": None, "rounds": 0}
+        stop_reason = None
+        with _usage_scope() as usage, deadline_scope(deadline):
+            try:
+                self._run_rounds(history, rounds, progress)
+            except Exception as exc:
+                if not is_timeout(exc):
+                    raise
+                stop_reason = "deadline" if deadline.expired() else "timeout"
+                _test_mode_print(
+                    f"[CritiqueBot] 라운드 중단 ({stop_reason}: {exc}) - 지금까지의 최고 후보 반환 "
+                    f"(점수: {progress['best'][1] if progress['best'] else None})"
+                )
+        best = progress["best"]
+        rebuttal, score = (dict(TIMEOUT_REBUTTAL), None) if best is None else (best[0], best[1])
+        passed = best is not None and self._passed(score)
+        stop_reason = stop_reason or ("pass" if passed else "max_loop")
+        if SUBMODULE_PROGRESS_LOGGER.single_line and stop_reason in ("deadline", "timeout"):
+            SUBMODULE_PROGRESS_LOGGER.append_token(f"Stop({stop_reason})")
+        LOOPS_PER_TURN.observe(progress["rounds"], critic="bon", stop_reason=stop_reason)
+        emit_trace(
+            "final",
+            progress["rounds"],
+            duration_ms=(time.monotonic() - started) * 1000,
+            calls=usage["calls"],
+            prompt_tokens=usage["prompt_tokens"],
+            cached_tokens=usage["cached_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            total_tokens=usage["total_tokens"],
+            score=score,
+            passed=passed,
+            stop_reason=stop_reason,
+            **rebuttal_fields(rebuttal),
+        )
+        return public_rebuttal(rebuttal)
+
+    def _run_rounds(self, history, rounds, progress):
+        """Plays up to `rounds` rounds, keeping the best candidate and rounds played in `progress`."""
+        grad = None
+        best = None
+        with ThreadPoolExecutor(max_workers=self.n_candidates) as pool:
+            for round_no in range(1, rounds + 1):
+                progress["rounds"] = round_no
+                round_label = f"Round {round_no}"
+                _test_mode_print(f"\n[CritiqueBot] ===== Best-of-{self.n_candidates} {round_label} 시작 =====")
+                SUBMODULE_PROGRESS_LOGGER.prepare(3)
+                with SUBMODULE_PROGRESS_LOGGER.step(self._label(round_label, "Summarizer")), trace_stage(
+                    "summarizer", round_no
+                ) as trace:
+                    smry = self.s.call(history, self._extract_grad(grad, "summarizer_grad"))
+                    trace["summary"] = smry
+                rbtl_grad = self._extract_grad(grad, "rebuttal_grad")
+                with SUBMODULE_PROGRESS_LOGGER.step(self._label(round_label, f"Rebuttal x{self.n_candidates}")):
+                    candidates = self._generate_candidates(pool, round_no, history, smry, rbtl_grad)
+                with SUBMODULE_PROGRESS_LOGGER.step(self._label(round_label, f"Judge x{self.n_candidates}")):
+                    judged = self._judge_candidates(pool, round_no, history, smry, candidates)
+
+                for candidate, (score, feedback) in zip(candidates, judged):
+                    _test_mode_print(f"[CritiqueBot] 후보 점수: {score} | {feedback}")
+                    if best is None or (score is not None and (best[1] is None or score > best[1])):
+                        best = progress["best"] = (candidate, score, feedback, smry)
+                best_score = best[1]
+                if SUBMODULE_PROGRESS_LOGGER.single_line:
+                    status = "Pass" if self._passed(best_score) else "Fail"
+                    score_text = "n.a." if best_score is None else f"{best_score:.1f}"
+                    SUBMODULE_PROGRESS_LOGGER.append_token(f"{status} {score_text}")
+                if self._passed(best_score):
+                    _test_mode_print(f"[CritiqueBot] 후보 통과 - 최고 점수 {best_score}")
+                    return
+                if round_no >= rounds:
+                    break
+
+                _test_mode_print("[CritiqueBot] 통과 후보 없음 - 최고 점수 후보로 TextGrad 지침 생성")
+                SUBMODULE_PROGRESS_LOGGER.extend(1)
+                with SUBMODULE_PROGRESS_LOGGER.step(self._label(round_label, "TextGrad")), trace_stage(
+                    "textgrad", round_no
+                ) as trace:
+                    grad = self.tg.ga(history, best[3], best[0], best[2])
+                    trace["grad"] = grad
+
+        _test_mode_print(f"[CritiqueBot] 라운드 종료 - 최고 점수 후보 반환 (점수: {best[1]})")
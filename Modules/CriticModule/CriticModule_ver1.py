@@ -1,13 +1,86 @@
-from ..utils import SUBMODULE_PROGRESS_LOGGER, _test_mode_print
+from ..Deadline import DEADLINE_DEFAULTS, Deadline, deadline_scope, is_timeout
+from ..Metrics import JUDGE_VERDICTS, LOOPS_PER_TURN
+from ..ReferenceValidator import REFERENCE_VALIDATOR
+from ..TraceWriter import emit_trace, rebuttal_fields, trace_stage
+from ..utils import SUBMODULE_PROGRESS_LOGGER, _test_mode_print, _usage_scope
+from .InternalJudge.LocalPreJudge import LOCAL_PREJUDGE_DEFAULTS, LocalPreJudge
+from .LoopController import LOOP_CONTROLLER_DEFAULTS, LoopController
+from .ModelRouter import MODEL_ROUTER_DEFAULTS, ModelRouter
+
+# What a critic hands back to its callers (CLI, Streamlit, EXP). Rebuttal modules may add
+# internal signals (parsed, pool, queries, dead_refs) for the pre-judge and traces.
+PUBLIC_REBUTTAL_KEYS = ("txt", "ref")
+
+# Returned when the deadline expires before any rebuttal was produced.
+TIMEOUT_REBUTTAL = {
+    "txt": "죄송합니다. 응답 시간이 초과되어 반박을 준비하지 못했습니다. 잠시 후 다시 시도해 주세요.",
+    "ref": {},
+}
+
+
+def public_rebuttal(rebuttal):
+    if not isinstance(rebuttal, dict):
+        return rebuttal
+    return {key: rebuttal[key] for key in PUBLIC_REBUTTAL_KEYS if key in rebuttal}
 
 
 class CriticModule_ver1:
-    def __init__(self, summarizer, rebuttal, internal_judge, text_grad):
+    def __init__(self, summarizer, rebuttal, internal_judge, text_grad, options=None, routes=None):
         # Summarize -> Rebut (-> Internal judging)
         self.s = summarizer
         self.r = rebuttal
         self.ij = internal_judge
         self.tg = text_grad
+        # Per-turn model routing: submodule name -> instance built with the strong model (see ModelRouter).
+        self.routes = dict(routes or {})
+        self.router = None
+        routing = (options or {}).get("routing")
+        if routing and self.routes:
+            router_options = dict(MODEL_ROUTER_DEFAULTS)
+            router_options.update({k: v for k, v in routing.items() if k in MODEL_ROUTER_DEFAULTS})
+            self.router = ModelRouter(**router_options)
+        self.loop_options = dict(LOOP_CONTROLLER_DEFAULTS)
+        self.loop_options.update(
+            {k: v for k, v in (options or {}).items() if k in LOOP_CONTROLLER_DEFAULTS}
+        )
+        # Hard request deadline + per-stage network timeouts (Modules/Deadline.py).
+        self.deadline_options = {k: v for k, v in (options or {}).items() if k in DEADLINE_DEFAULTS}
+        self.validate_refs = bool((options or {}).get("validate_refs"))
+        # Recording mode: never stop on a pass, trace every loop's candidate with cumulative cost
+        # so thresholds / max_loop can be swept offline (Modules/ThresholdSweep.py).
+        self.record_loops = bool((options or {}).get("record_loops"))
+        prejudge = (options or {}).get("prejudge")
+        self.prejudge = None
+        if prejudge:
+            prejudge_options = dict(LOCAL_PREJUDGE_DEFAULTS)
+            if isinstance(prejudge, dict):
+                prejudge_options.update(prejudge)
+            self.prejudge = LocalPreJudge(**prejudge_options)
+
+    def _validate_refs(self, rbtl, network=True):
+        refs = rbtl.get("ref") or {}
+        kept = REFERENCE_VALIDATOR.filter_refs(refs, network=network)
+        dead = {title: url for title, url in refs.items() if title not in kept}
+        if dead:
+            _test_mode_print(f"[CritiqueBot] 접속할 수 없는 참조 제거: {dead}")
+        return dict(rbtl, ref=kept, dead_refs=dead)
+
+    def report_lines(self):
+        lines = self.prejudge.report_lines() if self.prejudge else []
+        if self.router:
+            lines.extend(self.router.report_lines())
+        return lines
+
+    def _routed(self, name, module, features, trace):
+        """The module instance to use for this call: `module` or its strong-model twin."""
+        if self.router is None or name not in self.routes:
+            return module
+        tier, reasons = self.router.route(name, features)
+        chosen = self.routes[name] if tier == "strong" else module
+        model = getattr(chosen, "model", None)
+        trace["route"] = {"module": name, "tier": tier, "model": model, "reasons": reasons, **features}
+        _test_mode_print(f"[CritiqueBot] 모델 라우팅 {name}: {tier} ({model}) {reasons or ''}")
+        return chosen
 
     def _extract_grad(self, grad, key):
         if isinstance(grad, dict):
@@ -19,10 +92,66 @@ class CriticModule_ver1:
             return name
         return f"{loop_label} {name}"
 
-    def call(self, history, max_loop=5):
+    def call(self, history, max_loop=None):
+        options = dict(self.loop_options)
+        if max_loop is not None:
+            options["max_loop"] = max_loop
+        controller = LoopController(**options)
+        # One knob: a loop deadline_s (e.g. the interactive preset's 45 s) also bounds each network call.
+        deadline = Deadline.from_options(self.deadline_options, options["deadline_s"])
+        with _usage_scope() as usage, deadline_scope(deadline):
+            try:
+                result = self._run_loops(history, controller, usage)
+                result = self._final_refcheck(result, controller.loops_done)
+            except Exception as exc:
+                if not is_timeout(exc):
+                    raise
+                result = self._timed_out(controller, deadline, exc)
+        LOOPS_PER_TURN.observe(controller.loops_done, critic="v1", stop_reason=controller.stop_reason)
+        emit_trace(
+            "final",
+            controller.loops_done,
+            duration_ms=controller.elapsed() * 1000,
+            calls=usage["calls"],
+            prompt_tokens=usage["prompt_tokens"],
+            cached_tokens=usage["cached_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            total_tokens=usage["total_tokens"],
+            score=controller.best_score,
+            passed=controller.stop_reason == "pass",
+            stop_reason=controller.stop_reason,
+            **rebuttal_fields(result),
+        )
+        return public_rebuttal(result)
+
+    def _final_refcheck(self, rbtl, loop_no):
+        """Probe the returned rebuttal's URLs: the turn's one network round-trip for references."""
+        if not (self.validate_refs and isinstance(rbtl, dict) and rbtl.get("ref")):
+            return rbtl
+        SUBMODULE_PROGRESS_LOGGER.extend(1)
+        with SUBMODULE_PROGRESS_LOGGER.step("RefCheck"), trace_stage("refcheck", loop_no) as trace:
+            rbtl = self._validate_refs(rbtl)
+            trace["refs"] = rbtl.get("ref")
+        return rbtl
+
+    def _timed_out(self, controller, deadline, exc):
+        """A network call timed out or the deadline passed: stop and return the best rebuttal so far."""
+        reason = controller.stop_reason = "deadline" if deadline.expired() else "timeout"
+        if SUBMODULE_PROGRESS_LOGGER.single_line:
+            SUBMODULE_PROGRESS_LOGGER.append_token(f"Stop({reason})")
+        _test_mode_print(
+            f"[CritiqueBot] 루프 중단 ({reason}: {exc}) - 지금까지의 최선 반박 반환 (점수: {controller.best_score}, "
+            f"{controller.loops_done}회, {controller.elapsed():.1f}s)"
+        )
+        best = controller.best_so_far()
+        return dict(TIMEOUT_REBUTTAL) if best is None else best
+
+    def _run_loops(self, history, controller, usage):
         grad = None
-        for loop_idx in range(max_loop):
+        prev_rbtl, prev_score = None, None
+        for loop_idx in range(controller.max_loop):
             loop_no = loop_idx + 1
+            features = ModelRouter.features(history, loop_no, prev_rbtl, prev_score) if self.router else None
             _test_mode_print(
                 f"""
 [CritiqueBot] ===== Loop {loop_no} 시작 ====="""
@@ -32,8 +161,11 @@ class CriticModule_ver1:
             summ_grad = self._extract_grad(grad, "summarizer_grad")
             _test_mode_print(f"[CritiqueBot] Summarizer 호출 (grad 제공 여부: {bool(summ_grad)})")
             SUBMODULE_PROGRESS_LOGGER.prepare(3)
-            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Summarizer")):
-                smry = self.s.call(history, summ_grad)
+            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Summarizer")), trace_stage(
+                "summarizer", loop_no
+            ) as trace:
+                smry = self._routed("summarizer", self.s, features, trace).call(history, summ_grad)
+                trace["summary"] = smry
             _test_mode_print(
                 f"""[CritiqueBot] Summarizer 결과:
 {smry}"""
@@ -41,19 +173,59 @@ class CriticModule_ver1:
 
             rbtl_grad = self._extract_grad(grad, "rebuttal_grad")
             _test_mode_print("[CritiqueBot] Rebuttal 호출")
-            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Rebuttal")):
-                rbtl = self.r.call(history, smry, rbtl_grad)
+            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Rebuttal")), trace_stage(
+                "rebuttal", loop_no
+            ) as trace:
+                rbtl = self._routed("rebuttal", self.r, features, trace).call(history, smry, rbtl_grad)
+                trace.update(rebuttal_fields(rbtl))
+            controller.pending = rbtl
             _test_mode_print(
                 f"""[CritiqueBot] Rebuttal 결과:
 {rbtl}"""
             )
+            if self.validate_refs and isinstance(rbtl, dict) and rbtl.get("ref"):
+                # Cached verdicts only, so the pre-judge sees links already known dead; the network
+                # probe runs once, on the rebuttal the turn returns (_final_refcheck).
+                rbtl = self._validate_refs(rbtl, network=False)
 
-            _test_mode_print("[CritiqueBot] Internal Judge 호출")
-            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Judge")):
-                is_pass, rbtl, feedback = self.ij.call(history, smry, rbtl)
-            _test_mode_print(f"[CritiqueBot] Internal Judge 결과 - 통과 여부: {is_pass}, 진단: {feedback}")
-            if SUBMODULE_PROGRESS_LOGGER.single_line:
-                score = getattr(self.ij, "last_total_score", None)
+            prejudge_ok, issues = True, []
+            if self.prejudge is not None and getattr(self.ij, "pass_threshold", None) is not None:
+                prejudge_ok, issues = self.prejudge.check(rbtl)
+            if not prejudge_ok:
+                is_pass, score = False, None
+                feedback = self.prejudge.feedback(issues)
+                _test_mode_print(f"[CritiqueBot] 로컬 사전 심사 실패 - Judge 생략: {feedback}")
+                SUBMODULE_PROGRESS_LOGGER.append_token("PreJudge Fail")
+                emit_trace("prejudge", loop_no, passed=False, feedback=feedback)
+                JUDGE_VERDICTS.inc(result="prejudge_fail")
+                controller.observe(rbtl, score)
+            else:
+                _test_mode_print("[CritiqueBot] Internal Judge 호출")
+                with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "Judge")), trace_stage(
+                    "judge", loop_no
+                ) as trace:
+                    verdict = self._routed("judge", self.ij, features, trace).call(history, smry, rbtl)
+                    is_pass, rbtl, score, feedback = verdict.passed, verdict.rebuttal, verdict.score, verdict.feedback
+                    trace.update(score=score, passed=is_pass, feedback=feedback)
+                _test_mode_print(f"[CritiqueBot] Internal Judge 결과 - 통과 여부: {is_pass}, 진단: {feedback}")
+                JUDGE_VERDICTS.inc(result="pass" if is_pass else "fail")
+                controller.observe(rbtl, score)
+            if self.record_loops:
+                emit_trace(
+                    "candidate",
+                    loop_no,
+                    duration_ms=controller.elapsed() * 1000,
+                    calls=usage["calls"],
+                    prompt_tokens=usage["prompt_tokens"],
+                    cached_tokens=usage["cached_tokens"],
+                    completion_tokens=usage["completion_tokens"],
+                    total_tokens=usage["total_tokens"],
+                    score=score,
+                    passed=is_pass,
+                    feedback=feedback,
+                    **rebuttal_fields(rbtl),
+                )
+            if prejudge_ok and SUBMODULE_PROGRESS_LOGGER.single_line:
                 threshold = getattr(self.ij, "pass_threshold", None)
                 if threshold is None:
                     score_text = "n.a."
@@ -63,18 +235,34 @@ class CriticModule_ver1:
                     score_text = f"{score:.1f}/{threshold:.0f}"
                 status = "Pass" if is_pass else "Fail"
                 SUBMODULE_PROGRESS_LOGGER.append_token(f"{status} {score_text}")
-            if is_pass:
+            if is_pass and not self.record_loops:
                 _test_mode_print("[CritiqueBot] 루프 종료 - 판정 통과")
+                controller.stop_reason = "pass"
                 return rbtl
+            if not controller.should_continue(usage["total_tokens"]):
+                break
+            prev_rbtl, prev_score = rbtl, score
+            # TextGrad answers the verdict just given, so it is routed on this loop's rebuttal and score.
+            if self.router:
+                features = ModelRouter.features(history, loop_no, rbtl, score, failed=True)
 
             _test_mode_print("[CritiqueBot] TextGrad 지침 생성")
             SUBMODULE_PROGRESS_LOGGER.extend(1)
-            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "TextGrad")):
-                grad = self.tg.ga(history, smry, rbtl, feedback)
+            with SUBMODULE_PROGRESS_LOGGER.step(self._label(loop_label, "TextGrad")), trace_stage(
+                "textgrad", loop_no
+            ) as trace:
+                grad = self._routed("textgrad", self.tg, features, trace).ga(history, smry, rbtl, feedback)
+                trace["grad"] = grad
             _test_mode_print(
                 f"""[CritiqueBot] TextGrad 결과:
 {grad}"""
             )
 
-        _test_mode_print("[CritiqueBot] 최대 루프 도달 - 마지막 반박 반환")
-        return rbtl
+        reason = controller.stop_reason = controller.stop_reason or "max_loop"
+        if SUBMODULE_PROGRESS_LOGGER.single_line and reason != "max_loop":
+            SUBMODULE_PROGRESS_LOGGER.append_token(f"Stop({reason})")
+        _test_mode_print(
+            f"[CritiqueBot] 루프 종료 ({reason}) - 최고 점수 반박 반환 (점수: {controller.best_score}, "
+            f"{controller.loops_done}회, {controller.elapsed():.1f}s, {usage['total_tokens']} tokens)"
+        )
+        return controller.best_rebuttal
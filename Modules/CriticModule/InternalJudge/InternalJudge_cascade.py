@@ -0,0 +1,124 @@
+import random
+import threading
+from typing import List, Optional, Tuple
+
+from ...utils import _test_mode_print, _usage_scope
+from .InternalJudge_ver1 import InternalJudge_ver1
+from .JudgeResult import JudgeResult
+
+MODULE_TYPE = "judge"
+MODULE_VERSION = "cascade"
+
+
+class InternalJudge_cascade:
+    """Cheap judge first; only scores within `band` of the threshold go to the strong model.
+
+    `audit_rate` escalates a random share of clear-cut cases as well, so the
+    agreement rate outside the band can be measured when tuning `band`.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        client,
+        cheap_model: str = "gpt-4o-mini",
+        band: float = 5.0,
+        audit_rate: float = 0.0,
+        pass_threshold: float = 90.0,
+    ) -> None:
+        self.model = model
+        self.openai = client
+        self.cheap = InternalJudge_ver1(cheap_model, client, pass_threshold=pass_threshold)
+        self.strong = InternalJudge_ver1(model, client, pass_threshold=pass_threshold)
+        self.band = float(band)
+        self.audit_rate = float(audit_rate)
+        self.pass_threshold = float(pass_threshold)
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+        self.stats = {
+            "judged": 0,
+            "escalated": 0,
+            "audited": 0,
+            "agreed": 0,
+            "abs_diff_sum": 0.0,
+            "audit_agreed": 0,
+        }
+
+    def call(self, history, summary, rebuttal) -> JudgeResult:
+        with _usage_scope() as usage:
+            total_score, feedback = self.score(history, summary, rebuttal)
+        return JudgeResult(total_score >= self.pass_threshold, rebuttal, total_score, feedback, dict(usage))
+
+    def score(self, history, summary, rebuttal) -> Tuple[float, Optional[str]]:
+        cheap_score, cheap_feedback = self.cheap.score(history, summary, rebuttal)
+        borderline = abs(cheap_score - self.pass_threshold) <= self.band
+        with self._lock:
+            audit = not borderline and self.audit_rate > 0 and self._rng.random() < self.audit_rate
+        if not borderline and not audit:
+            with self._lock:
+                self.stats["judged"] += 1
+            _test_mode_print(f"[CritiqueBot] Judge cascade: {self.cheap.model} {cheap_score:.1f} 확정 (에스컬레이션 없음)")
+            return cheap_score, cheap_feedback
+
+        strong_score, strong_feedback = self.strong.score(history, summary, rebuttal)
+        agreed = (cheap_score >= self.pass_threshold) == (strong_score >= self.pass_threshold)
+        with self._lock:
+            self.stats["judged"] += 1
+            if borderline:
+                self.stats["escalated"] += 1
+                self.stats["agreed"] += int(agreed)
+                self.stats["abs_diff_sum"] += abs(strong_score - cheap_score)
+            else:
+                self.stats["audited"] += 1
+                self.stats["audit_agreed"] += int(agreed)
+        _test_mode_print(
+            f"[CritiqueBot] Judge cascade: {self.cheap.model} {cheap_score:.1f} -> "
+            f"{self.strong.model} {strong_score:.1f} ({'audit' if audit else 'borderline'}, 판정 일치: {agreed})"
+        )
+        if audit:
+            # Audits only measure agreement; the cheap verdict stands.
+            return cheap_score, cheap_feedback
+        return strong_score, strong_feedback
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            stats = dict(self.stats)
+        judged = stats["judged"]
+        if not judged:
+            return []
+        escalated = stats["escalated"]
+        lines = [
+            f"[CritiqueBot] Judge cascade ({self.cheap.model} -> {self.model}, band ±{self.band:g}): "
+            f"{judged}건 중 에스컬레이션 {escalated}건 ({escalated / judged * 100:.1f}%)"
+        ]
+        if escalated:
+            lines.append(
+                f"[CritiqueBot] Judge cascade 경계 구간 판정 일치율 {stats['agreed'] / escalated * 100:.1f}%, "
+                f"평균 점수 차 {stats['abs_diff_sum'] / escalated:.1f}"
+            )
+        if stats["audited"]:
+            lines.append(
+                f"[CritiqueBot] Judge cascade 감사 {stats['audited']}건 판정 일치율 "
+                f"{stats['audit_agreed'] / stats['audited'] * 100:.1f}%"
+            )
+        return lines
+
+
+def build(
+    model_name: str,
+    *,
+    openai_client,
+    cheap_model: str = "gpt-4o-mini",
+    band: float = 5.0,
+    audit_rate: float = 0.0,
+    pass_threshold: float = 90.0,
+    **_,
+):
+    return InternalJudge_cascade(
+        model_name,
+        openai_client,
+        cheap_model=cheap_model,
+        band=band,
+        audit_rate=audit_rate,
+        pass_threshold=pass_threshold,
+    )
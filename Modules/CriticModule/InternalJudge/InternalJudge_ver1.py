@@ -1,18 +1,37 @@
 import json
-from typing import Any, Dict, Tuple
+from typing import Optional, Tuple
 
-from ...utils import _format_history_for_prompt, _log_submodule_io
+from ...utils import _chat_json, _format_history_for_prompt, _usage_scope
+from .JudgeResult import JudgeResult
 
 MODULE_TYPE = "judge"
 MODULE_VERSION = "v1"
+# score() does not depend on these, so matrix runs can share it across thresholds.
+MEMO_IGNORED_OPTIONS = ("pass_threshold",)
+
+JUDGE_METRIC_KEYS = ("context_alignment", "evidence_quality", "civility", "actionability")
+JUDGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scores": {
+            "type": "object",
+            "properties": {key: {"type": "number"} for key in JUDGE_METRIC_KEYS},
+            "required": list(JUDGE_METRIC_KEYS),
+            "additionalProperties": False,
+        },
+        "total_score": {"type": "number"},
+        "feedback": {"type": "string"},
+    },
+    "required": ["scores", "total_score", "feedback"],
+    "additionalProperties": False,
+}
 
 
 class InternalJudge_ver1:
-    def __init__(self, model: str, client) -> None:
+    def __init__(self, model: str, client, pass_threshold: float = 90.0) -> None:
         self.model = model
         self.openai = client
-        self.pass_threshold = 90.0
-        self.last_total_score = None
+        self.pass_threshold = float(pass_threshold)
         self.sys = (
             "You are the Judge sub-module for a debate assistant."
             "Score the assistant's rebuttal across the values required for a constructive counterargument"
@@ -25,7 +44,13 @@ class InternalJudge_ver1:
             ("actionability", "대화 진전을 위한 구체성이 있는가"),
         )
 
-    def call(self, history, summary, rebuttal) -> Tuple[bool, Any, str]:
+    def call(self, history, summary, rebuttal) -> JudgeResult:
+        with _usage_scope() as usage:
+            total_score, feedback = self.score(history, summary, rebuttal)
+        return JudgeResult(total_score >= self.pass_threshold, rebuttal, total_score, feedback, dict(usage))
+
+    def score(self, history, summary, rebuttal) -> Tuple[float, Optional[str]]:
+        """(total_score, feedback) without the pass decision; StageMemo memoizes this leaf."""
         convo = _format_history_for_prompt(history)
         summary_text = summary if summary else "요약 정보가 제공되지 않았습니다."
         if isinstance(rebuttal, dict):
@@ -36,7 +61,15 @@ class InternalJudge_ver1:
             references = {}
         ref_str = "\n".join(f"- {title}: {url}" for title, url in references.items()) or "(참조 없음)"
         metric_desc = "\n".join(f"- {key}: {desc}" for key, desc in self.metrics)
-        user_prompt = f"""대화 히스토리:
+        user_prompt = (
+            "다음 평가 항목별로 0~25 점을 부여하고 (모두 합해 최대 100점), 총점을 계산하세요:\n"
+            f"{metric_desc}\n"
+            'JSON 형식: {"scores": {"context_alignment": number, "evidence_quality": number, "civility": number, "actionability": number}, "total_score": number(0-100), "feedback": "..."}.\n'
+            "feedback에는 개선해야 할 구체적인 조치 2~3가지를 포함하세요."
+        )
+        user_prompt += f"""
+
+대화 히스토리:
 {convo}
 
 요약:
@@ -46,25 +79,17 @@ class InternalJudge_ver1:
 {rebuttal_txt}
 
 참조 링크:
-{ref_str}
-
-"""
-        user_prompt += (
-            "다음 평가 항목별로 0~25 점을 부여하고 (모두 합해 최대 100점), 총점을 계산하세요:\n"
-            f"{metric_desc}\n"
-            'JSON 형식: {"scores": {"context_alignment": number, "evidence_quality": number, "civility": number, "actionability": number}, "total_score": number(0-100), "feedback": "..."}.\n'
-            "feedback에는 개선해야 할 구체적인 조치 2~3가지를 포함하세요."
+{ref_str}"""
+        data, _ = _chat_json(
+            self.openai,
+            self.model,
+            self.sys,
+            user_prompt,
+            tag="Judge",
+            module_name=self.__class__.__name__,
+            schema_name="judge_scores",
+            schema=JUDGE_SCHEMA,
         )
-        rsp = self.openai.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self.sys},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
-        content = rsp.choices[0].message.content.strip()
-        _log_submodule_io("Judge", user_prompt, content, self.__class__.__name__, self.model)
-        data = self._parse_structured_response(content)
         scores = data.get("scores") or {}
         if isinstance(scores, list):
             converted = {}
@@ -93,27 +118,9 @@ class InternalJudge_ver1:
             total_score = float(total_score)
         except (TypeError, ValueError):
             total_score = sum(scores.values())
-        self.last_total_score = total_score
-        feedback = data.get("feedback", "").strip()
-        passed = total_score >= self.pass_threshold
-        return passed, rebuttal, feedback if feedback else None
-
-    @staticmethod
-    def _parse_structured_response(text: str) -> Dict[str, Any]:
-        cleaned = (text or "").strip()
-        if cleaned.startswith("```"):
-            trimmed = cleaned[3:]
-            parts = trimmed.split("```", 1)
-            cleaned = parts[0].strip()
-            if cleaned.lower().startswith("json"):
-                cleaned = cleaned[4:].strip()
-        try:
-            import json as _json
-
-            return _json.loads(cleaned)
-        except Exception:
-            return {}
+        feedback = str(data.get("feedback") or "").strip()
+        return total_score, feedback if feedback else None
 
 
-def build(model_name: str, *, openai_client, **_):
-    return InternalJudge_ver1(model_name, openai_client)
+def build(model_name: str, *, openai_client, pass_threshold: float = 90.0, **_):
+    return InternalJudge_ver1(model_name, openai_client, pass_threshold=pass_threshold)
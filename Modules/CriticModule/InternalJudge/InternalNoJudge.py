@@ -1,3 +1,5 @@
+from .JudgeResult import JudgeResult
+
 MODULE_TYPE = "judge"
 MODULE_VERSION = "none"
 
@@ -6,11 +8,13 @@ class InternalNoJudge:
     def __init__(self, model, client) -> None:
         self.model = model
         self.openai = client
-        self.last_total_score = None
         self.pass_threshold = None
 
     def call(self, history, summary, rebuttal):
-        return True, rebuttal, None
+        return JudgeResult(True, rebuttal)
+
+    def score(self, history, summary, rebuttal):
+        return None, None
 
 
 def build(model_name: str, *, openai_client, **_):
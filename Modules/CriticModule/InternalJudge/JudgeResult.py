@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class JudgeResult:
+    """Outcome of one judge call.
+
+    Judges keep no per-call state on the instance, so one cached critic can
+    judge concurrent conversations; everything a caller needs is returned here.
+    """
+
+    passed: bool
+    rebuttal: Any
+    score: Optional[float] = None
+    feedback: Optional[str] = None
+    # Token usage of this call (calls, prompt/cached/completion/total tokens); zero on a StageMemo hit.
+    usage: Dict[str, int] = field(default_factory=dict)
@@ -0,0 +1,98 @@
+import re
+import threading
+from typing import Any, List, Optional, Tuple
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+LOCAL_PREJUDGE_DEFAULTS = {
+    "max_sentences": 5,
+    "min_references": 1,
+    "require_pool_refs": True,
+    "require_parsed": True,
+}
+
+
+def _canonical_url(url: str) -> str:
+    return str(url or "").strip().rstrip("/").lower()
+
+
+def count_sentences(text: str) -> int:
+    parts = [part for part in _SENTENCE_END.split((text or "").strip()) if part.strip()]
+    return len(parts)
+
+
+class LocalPreJudge:
+    """Local checks run in front of the LLM judge.
+
+    Catches mechanical failures (too many sentences, no references, references
+    outside the search ref_pool, JSON that fell back to raw text) without a model
+    call; failing rebuttals go straight to TextGrad with synthesized feedback.
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 5,
+        min_references: int = 1,
+        require_pool_refs: bool = True,
+        require_parsed: bool = True,
+    ) -> None:
+        self.max_sentences = max_sentences
+        self.min_references = min_references
+        self.require_pool_refs = require_pool_refs
+        self.require_parsed = require_parsed
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected = 0
+
+    def check(self, rebuttal: Any) -> Tuple[bool, List[str]]:
+        issues: List[str] = []
+        if isinstance(rebuttal, dict):
+            text = rebuttal.get("txt") or ""
+            refs = rebuttal.get("ref") or {}
+            pool = rebuttal.get("pool")
+            parsed = rebuttal.get("parsed", True)
+            dead = rebuttal.get("dead_refs") or {}
+        else:
+            text, refs, pool, parsed, dead = str(rebuttal), {}, None, False, {}
+
+        if self.require_parsed and not parsed:
+            issues.append("응답이 JSON 형식이 아니어서 원문 그대로 사용되었습니다. 반드시 지정된 JSON 형식으로만 답하세요.")
+        sentences = count_sentences(text)
+        if self.max_sentences and sentences > self.max_sentences:
+            issues.append(
+                f"반박문이 {sentences}문장으로 3~{self.max_sentences}문장 제한을 넘었습니다. 핵심 근거만 남겨 줄이세요."
+            )
+        if dead:
+            issues.append(
+                "접속되지 않는 참조 URL이 있어 제외되었습니다: " + ", ".join(list(dead.values())[:3]) + ". 실제로 열리는 출처만 사용하세요."
+            )
+        if len(refs) < self.min_references:
+            issues.append("참조 링크가 없습니다. 주장을 뒷받침하는 출처를 references에 포함하세요.")
+        if self.require_pool_refs and pool:
+            pool_urls = {_canonical_url(url) for url in pool.values()}
+            unknown = [url for url in refs.values() if _canonical_url(url) not in pool_urls]
+            if unknown:
+                issues.append(
+                    "검색 근거에 없는 URL을 인용했습니다: " + ", ".join(unknown[:3]) + ". 검색 결과의 URL만 사용하세요."
+                )
+
+        with self._lock:
+            self.checked += 1
+            if issues:
+                self.rejected += 1
+        return not issues, issues
+
+    @staticmethod
+    def feedback(issues: List[str]) -> Optional[str]:
+        if not issues:
+            return None
+        return "[로컬 사전 심사] " + " ".join(f"{idx}) {issue}" for idx, issue in enumerate(issues, 1))
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            checked, rejected = self.checked, self.rejected
+        if not checked:
+            return []
+        return [
+            f"[CritiqueBot] 로컬 사전 심사: {checked}건 중 {rejected}건 기계적 실패 -> LLM Judge 호출 {rejected}회 절약"
+        ]
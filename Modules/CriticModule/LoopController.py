@@ -0,0 +1,88 @@
+import time
+from typing import Any, Optional
+
+LOOP_CONTROLLER_DEFAULTS = {
+    "max_loop": 5,
+    "deadline_s": None,
+    "token_budget": None,
+    "plateau_margin": None,
+    "plateau_patience": 1,
+}
+
+
+class LoopController:
+    """Per-call stop policy for the Summarize -> Rebut -> Judge -> TextGrad loop.
+
+    Stops on max_loop, wall-clock deadline, token budget or a score plateau and
+    keeps the best-scoring rebuttal seen so far.
+    """
+
+    def __init__(
+        self,
+        max_loop: int = 5,
+        deadline_s: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        plateau_margin: Optional[float] = None,
+        plateau_patience: int = 1,
+    ) -> None:
+        self.max_loop = max(1, int(max_loop))
+        self.deadline_s = deadline_s
+        self.token_budget = token_budget
+        self.plateau_margin = plateau_margin
+        self.plateau_patience = max(1, int(plateau_patience or 1))
+        self.started_at = time.monotonic()
+        self.loops_done = 0
+        self.best_rebuttal: Any = None
+        self.best_score: Optional[float] = None
+        # Latest rebuttal not judged yet; the fallback when a call times out before any verdict.
+        self.pending: Any = None
+        self.stale_loops = 0
+        self.stop_reason: Optional[str] = None
+
+    def observe(self, rebuttal: Any, score: Optional[float]) -> None:
+        self.loops_done += 1
+        self.pending = None
+        if self.best_rebuttal is None:
+            self.best_rebuttal = rebuttal
+            self.best_score = score
+            return
+        if score is None:
+            return
+        if self.best_score is None or score > self.best_score:
+            improved = self.best_score is None or self.plateau_margin is None or (
+                score - self.best_score >= self.plateau_margin
+            )
+            self.best_rebuttal = rebuttal
+            self.best_score = score
+            if improved:
+                self.stale_loops = 0
+                return
+        self.stale_loops += 1
+
+    def best_so_far(self) -> Any:
+        return self.best_rebuttal if self.best_rebuttal is not None else self.pending
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def should_continue(self, tokens_used: int = 0) -> bool:
+        """Called after a failed judge, before spending TextGrad on another loop."""
+        if self.loops_done >= self.max_loop:
+            self.stop_reason = "max_loop"
+        elif self.deadline_s is not None and self._projected_elapsed() > self.deadline_s:
+            self.stop_reason = "deadline"
+        elif self.token_budget is not None and self._projected_tokens(tokens_used) > self.token_budget:
+            self.stop_reason = "token_budget"
+        elif self.plateau_margin is not None and self.stale_loops >= self.plateau_patience:
+            self.stop_reason = "plateau"
+        else:
+            return True
+        return False
+
+    def _projected_elapsed(self) -> float:
+        # Another loop is only worth starting if an average loop still fits.
+        elapsed = self.elapsed()
+        return elapsed + elapsed / max(1, self.loops_done)
+
+    def _projected_tokens(self, tokens_used: int) -> float:
+        return tokens_used + tokens_used / max(1, self.loops_done)
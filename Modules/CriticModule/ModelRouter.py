@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..Metrics import METRICS
+
+MODEL_ROUTER_DEFAULTS = {
+    # submodule -> strong model; the module's configured model is the base tier.
+    "modules": {},
+    # Escalation triggers (None disables the trigger).
+    "long_claim_chars": 280,
+    "hard_turn": 3,
+    "escalate_without_evidence": True,
+    # After a failed judge loop: escalate when the previous score is below this (None: after any failed loop).
+    "escalate_below": None,
+}
+
+ROUTING_DECISIONS = METRICS.counter(
+    "critiquebot_routing_decisions_total", "Per-turn model routing decisions by submodule, tier and first reason.",
+    ("module", "tier", "reason"),
+)
+
+
+class ModelRouter:
+    """Picks the base or strong model per submodule call from cheap local features.
+
+    Features are the claim length, the turn index (user messages so far),
+    whether the last judged rebuttal's search found evidence, and the last
+    judge verdict (failed, score). Any trigger escalates to the strong model;
+    otherwise the module's configured (cheap) model is used.
+    """
+
+    def __init__(
+        self,
+        modules: Dict[str, str],
+        long_claim_chars: Optional[int] = 280,
+        hard_turn: Optional[int] = 3,
+        escalate_without_evidence: bool = True,
+        escalate_below: Optional[float] = None,
+    ) -> None:
+        self.modules = dict(modules or {})
+        self.long_claim_chars = long_claim_chars
+        self.hard_turn = hard_turn
+        self.escalate_without_evidence = escalate_without_evidence
+        self.escalate_below = escalate_below
+        self._lock = threading.Lock()
+        self.stats: Dict[Tuple[str, str], int] = {}
+
+    @staticmethod
+    def features(
+        history, loop_no: int, prev_rebuttal: Any = None, prev_score: Optional[float] = None, failed: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """`failed`: whether the last verdict failed; by default any loop after the first follows a failed one."""
+        user_turns = [m.get("content") or "" for m in history if m.get("role") == "user"]
+        evidence = None
+        if isinstance(prev_rebuttal, dict) and "pool" in prev_rebuttal:
+            evidence = bool(prev_rebuttal.get("pool"))
+        return {
+            "claim_chars": len(user_turns[-1]) if user_turns else 0,
+            "turn": len(user_turns),
+            "loop": loop_no,
+            "failed": loop_no > 1 if failed is None else failed,
+            "evidence": evidence,
+            "prev_score": prev_score,
+        }
+
+    def reasons(self, features: Dict[str, Any]) -> List[str]:
+        reasons = []
+        if self.long_claim_chars is not None and features["claim_chars"] >= self.long_claim_chars:
+            reasons.append("long_claim")
+        if self.hard_turn is not None and features["turn"] >= self.hard_turn:
+            reasons.append("late_turn")
+        if self.escalate_without_evidence and features["evidence"] is False:
+            reasons.append("no_evidence")
+        if features["failed"]:
+            score = features["prev_score"]
+            if self.escalate_below is None or score is None or score < self.escalate_below:
+                reasons.append("failed_loop")
+        return reasons
+
+    def route(self, module_name: str, features: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """Returns (tier, reasons) with tier "strong" or "base"."""
+        reasons = self.reasons(features)
+        tier = "strong" if reasons else "base"
+        ROUTING_DECISIONS.inc(module=module_name, tier=tier, reason=reasons[0] if reasons else "none")
+        with self._lock:
+            self.stats[(module_name, tier)] = self.stats.get((module_name, tier), 0) + 1
+        return tier, reasons
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            stats = dict(self.stats)
+        lines = []
+        for module_name, strong_model in sorted(self.modules.items()):
+            strong = stats.get((module_name, "strong"), 0)
+            total = strong + stats.get((module_name, "base"), 0)
+            if total:
+                lines.append(
+                    f"[CritiqueBot] 모델 라우팅 {module_name}: {total}회 중 {strong}회 {strong_model} 사용 "
+                    f"({strong / total * 100:.1f}%)"
+                )
+        return lines
@@ -0,0 +1,178 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from ...utils import _test_mode_print
+
+# Exact tracking keys (plus every utm_* key); look-alikes such as refid= or sourceid= identify content.
+_TRACKING_PARAMS = frozenset(("fbclid", "gclid", "ref", "source"))
+_HANGUL_RUN = re.compile(r"[가-힣]+")
+_WORD = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def canonical_url(url: str) -> str:
+    parsed = urlparse(str(url or "").strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ]
+    path = parsed.path.rstrip("/")
+    return urlunparse(("", host, path, "", urlencode(sorted(query)), ""))
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in _TRACKING_PARAMS or key.startswith("utm_")
+
+
+def dedupe_key(hit: Dict[str, Any]) -> str:
+    """Canonical URL, or a hash of the title and snippet for hits without one."""
+    if hit.get("url"):
+        return canonical_url(hit["url"])
+    content = " ".join(f"{hit.get('title') or ''} {hit.get('snippet') or ''}".lower().split())
+    return "content:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def tokenize(text: str) -> List[str]:
+    """Latin/number words plus Hangul character bigrams (robust to Korean particles)."""
+    lowered = (text or "").lower()
+    tokens = _WORD.findall(lowered)
+    for run in _HANGUL_RUN.findall(lowered):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    # Korean runs ~1 token per 1-2 characters with current tokenizers; stay conservative.
+    return max(1, len(text or "") // 2)
+
+
+class BM25:
+    def __init__(self, docs: List[List[str]], k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.doc_tf = [Counter(doc) for doc in docs]
+        self.doc_len = [len(doc) for doc in docs]
+        self.avg_len = sum(self.doc_len) / len(docs) if docs else 0.0
+        df: Counter = Counter()
+        for tf in self.doc_tf:
+            df.update(tf.keys())
+        n_docs = len(docs)
+        self.idf = {term: math.log(1 + (n_docs - freq + 0.5) / (freq + 0.5)) for term, freq in df.items()}
+
+    def score(self, query: List[str], idx: int) -> float:
+        tf = self.doc_tf[idx]
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[idx] / (self.avg_len or 1))
+        total = 0.0
+        for term in set(query):
+            freq = tf.get(term)
+            if freq:
+                total += self.idf.get(term, 0.0) * freq * (self.k1 + 1) / (freq + norm)
+        return total
+
+
+class EvidenceProcessor:
+    """Dedupe -> BM25 rerank -> extractive compression of Tavily hits before prompting."""
+
+    def __init__(self, budget_tokens: int = 1200, max_sentences_per_hit: int = 2) -> None:
+        self.budget_tokens = budget_tokens
+        self.max_sentences_per_hit = max_sentences_per_hit
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "raw_tokens": 0, "kept_tokens": 0, "duplicates": 0, "rerank_ms": 0.0}
+
+    @staticmethod
+    def dedupe(evidence: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        merged: Dict[str, Dict[str, Any]] = {}
+        duplicates = 0
+        for block in evidence:
+            for hit in block["hits"]:
+                key = dedupe_key(hit)
+                if key in merged:
+                    duplicates += 1
+                    kept = merged[key]
+                    kept["queries"].append(block["query"])
+                    if len(hit.get("snippet") or "") > len(kept.get("snippet") or ""):
+                        kept["snippet"] = hit["snippet"]
+                    continue
+                merged[key] = dict(hit, queries=[block["query"]])
+        return list(merged.values()), duplicates
+
+    def _extract(self, snippet: str, query: List[str], bm25_idf: Dict[str, float]) -> List[str]:
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(snippet or "") if s.strip()]
+        if len(sentences) <= self.max_sentences_per_hit:
+            return sentences
+        query_terms = set(query)
+        scored = []
+        for pos, sentence in enumerate(sentences):
+            terms = set(tokenize(sentence))
+            scored.append((sum(bm25_idf.get(t, 0.0) for t in terms & query_terms), -pos, sentence))
+        top = sorted(scored, reverse=True)[: self.max_sentences_per_hit]
+        # Keep the original order so the extract still reads naturally.
+        return [sentence for _, _, sentence in sorted(top, key=lambda item: -item[1])]
+
+    def process(self, evidence: List[Dict[str, Any]], claim: str, summary: Optional[str]) -> List[Dict[str, Any]]:
+        raw_tokens = sum(estimate_tokens(hit.get("snippet") or "") for block in evidence for hit in block["hits"])
+        started = time.perf_counter()
+        hits, duplicates = self.dedupe(evidence)
+        query = tokenize(f"{claim}\n{summary or ''}")
+        docs = [tokenize(f"{hit.get('title') or ''} {hit.get('snippet') or ''}") for hit in hits]
+        bm25 = BM25(docs) if docs else None
+        ranked = sorted(
+            ((bm25.score(query, idx), hit) for idx, hit in enumerate(hits)),
+            key=lambda item: item[0],
+            reverse=True,
+        ) if bm25 else []
+
+        processed: List[Dict[str, Any]] = []
+        used = 0
+        for score, hit in ranked:
+            extract = []
+            for sentence in self._extract(hit.get("snippet") or "", query, bm25.idf):
+                cost = estimate_tokens(sentence)
+                if used + cost > self.budget_tokens:
+                    break
+                extract.append(sentence)
+                used += cost
+            if not extract:
+                if used >= self.budget_tokens:
+                    break
+                continue
+            processed.append(dict(hit, snippet=" ".join(extract), score=round(score, 3)))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["raw_tokens"] += raw_tokens
+            self.stats["kept_tokens"] += used
+            self.stats["duplicates"] += duplicates
+            self.stats["rerank_ms"] += elapsed_ms
+        _test_mode_print(
+            f"[CritiqueBot] 근거 처리: 중복 {duplicates}건 제거, {len(hits)}건 중 {len(processed)}건 사용, "
+            f"약 {raw_tokens} -> {used} tokens, rerank {elapsed_ms:.1f}ms"
+        )
+        return processed
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            stats = dict(self.stats)
+        if not stats["calls"]:
+            return []
+        saved = stats["raw_tokens"] - stats["kept_tokens"]
+        ratio = saved / stats["raw_tokens"] * 100 if stats["raw_tokens"] else 0.0
+        return [
+            f"[CritiqueBot] 근거 처리 {stats['calls']}회: 중복 {stats['duplicates']}건 제거, "
+            f"근거 토큰 약 {stats['raw_tokens']} -> {stats['kept_tokens']} ({ratio:.1f}% 절감), "
+            f"평균 rerank {stats['rerank_ms'] / stats['calls']:.2f}ms"
+        ]
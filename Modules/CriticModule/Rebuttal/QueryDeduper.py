@@ -0,0 +1,86 @@
+import re
+import threading
+from typing import FrozenSet, List, Tuple
+
+from ...utils import _test_mode_print
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+# Trailing particles / endings that make paraphrases of the same question look different.
+_KOREAN_SUFFIXES = ("인가요", "입니까", "일까", "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "로", "요")
+
+
+def _normalize_token(token: str) -> str:
+    for suffix in _KOREAN_SUFFIXES:
+        if len(token) > len(suffix) + 1 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def shingles(text: str, n: int = 2) -> FrozenSet[str]:
+    """Character n-grams per normalized word, so word order and particles do not matter."""
+    grams = set()
+    for token in _NON_WORD.split((text or "").lower()):
+        token = _normalize_token(token)
+        if not token:
+            continue
+        if len(token) <= n:
+            grams.add(token)
+        else:
+            grams.update(token[i:i + n] for i in range(len(token) - n + 1))
+    return frozenset(grams)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QueryDeduper:
+    """Collapses near-duplicate search queries before they are sent to Tavily.
+
+    Candidates are compared with exact shingle Jaccard; with at most a handful
+    of queries per turn this is cheaper than building MinHash signatures.
+    """
+
+    def __init__(self, threshold: float = 0.7, backfill: bool = False) -> None:
+        self.threshold = threshold
+        self.backfill = backfill
+        self._lock = threading.Lock()
+        self.stats = {"batches": 0, "considered": 0, "collapsed": 0, "backfilled": 0, "saved": 0}
+
+    def select(self, candidates: List[str], limit: int) -> List[str]:
+        kept: List[Tuple[str, FrozenSet[str]]] = []
+        collapsed = backfilled = considered = 0
+        for idx, query in enumerate(candidates):
+            if len(kept) >= limit or (not self.backfill and idx >= limit):
+                break
+            considered += 1
+            grams = shingles(query)
+            match = next((q for q, g in kept if jaccard(grams, g) >= self.threshold), None)
+            if match is not None:
+                collapsed += 1
+                _test_mode_print(f"[CritiqueBot] 유사 검색 질의 병합: '{query}' ≈ '{match}'")
+                continue
+            if idx >= limit:
+                backfilled += 1
+            kept.append((query, grams))
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["considered"] += considered
+            self.stats["collapsed"] += collapsed
+            self.stats["backfilled"] += backfilled
+            # Without dedupe the first `limit` candidates would all have been searched.
+            self.stats["saved"] += min(limit, len(candidates)) - len(kept)
+        return [query for query, _ in kept]
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            stats = dict(self.stats)
+        if not stats["considered"]:
+            return []
+        return [
+            f"[CritiqueBot] 검색 질의 중복 제거: {stats['considered']}건 중 {stats['collapsed']}건 병합 "
+            f"({stats['collapsed'] / stats['considered'] * 100:.1f}%), 보충 {stats['backfilled']}건, "
+            f"Tavily 호출 {stats['saved']}회 절약"
+        ]
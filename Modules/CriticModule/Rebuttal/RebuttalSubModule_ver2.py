@@ -1,17 +1,35 @@
+import threading
+import time
 from typing import Any, Dict, List
 
+from ...CircuitBreaker import TAVILY_BREAKER, CircuitOpen
+from ...Deadline import DeadlineExceeded, call_timeout, is_timeout, record_timeout, stage_cap
+from ...Metrics import TAVILY_CALLS, TAVILY_LATENCY
 from ...utils import (
+    _chat_json,
     _format_grad_for_module,
     _format_history_for_prompt,
-    _log_submodule_io,
     _parse_bullet_list,
+    _shared_in_batch,
     _test_mode_print,
 )
-from .RebuttalSubModule_ver1 import RebuttalSubModule_ver1
+from .EvidenceProcessor import EvidenceProcessor
+from .QueryDeduper import QueryDeduper
+from .RebuttalSubModule_ver1 import REBUTTAL_SCHEMA, RebuttalSubModule_ver1
 
 MODULE_TYPE = "rebuttal"
 MODULE_VERSION = "v2"
 
+QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {"queries": {"type": "array", "items": {"type": "string"}}},
+    "required": ["queries"],
+    "additionalProperties": False,
+}
+
+# A basic search is "weak" when fewer than min_hits results clear both thresholds.
+SEARCH_ESCALATION_DEFAULTS = {"min_hits": 2, "min_score": 0.5, "min_snippet_chars": 80}
+
 
 class RebuttalSubModule_ver2:
     def __init__(
@@ -21,36 +39,60 @@ class RebuttalSubModule_ver2:
         tavily_client,
         max_queries: int = 3,
         top_k_per_query: int = 3,
-        search_depth: str = "advanced",
+        search_depth: str = "adaptive",
+        escalation: Dict[str, Any] = None,
+        process_evidence: bool = True,
+        evidence_budget_tokens: int = 1200,
+        sentences_per_hit: int = 2,
+        dedupe_queries: bool = True,
+        query_similarity: float = 0.7,
+        backfill_queries: bool = False,
     ) -> None:
         self.model = model
         self.openai = client
         self.tavily = tavily_client
         self.max_queries = max_queries
         self.top_k_per_query = top_k_per_query
+        # "basic", "advanced" or "adaptive" (basic first, advanced only when basic comes back weak).
         self.search_depth = search_depth
+        self.escalation = dict(SEARCH_ESCALATION_DEFAULTS, **(escalation or {}))
+        self._search_lock = threading.Lock()
+        self.search_stats = {"basic": 0, "advanced": 0, "escalated": 0, "seconds": 0.0, "fallback": 0}
+        # Search-free v1 prompt used while the shared Tavily breaker is open.
+        self.fallback = RebuttalSubModule_ver1(model, client)
+        self.evidence_processor = (
+            EvidenceProcessor(budget_tokens=evidence_budget_tokens, max_sentences_per_hit=sentences_per_hit)
+            if process_evidence
+            else None
+        )
+        self.query_deduper = (
+            QueryDeduper(threshold=query_similarity, backfill=backfill_queries) if dedupe_queries else None
+        )
         self.sys = (
             "You are the Rebuttal sub-module for a conversational debate assistant."
             "Speak in a natural, friendly Korean tone when the dialogue is Korean, acknowledging the user's points while presenting evidence-backed counterarguments."
             "Only use the evidence provided (검색 결과 및 요약) and always produce JSON with keys `rebuttal` and `references`."
         )
 
-    def _call_model(self, prompt: str, tag: str = "Rebuttal") -> str:
-        rsp = self.openai.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self.sys},
-                {"role": "user", "content": prompt},
-            ],
+    def _call_model(self, prompt: str, schema_name: str, schema, tag: str = "Rebuttal"):
+        return _chat_json(
+            self.openai,
+            self.model,
+            self.sys,
+            prompt,
+            tag=tag,
+            module_name=self.__class__.__name__,
+            schema_name=schema_name,
+            schema=schema,
         )
-        content = rsp.choices[0].message.content.strip()
-        _log_submodule_io(tag, prompt, content, self.__class__.__name__, self.model)
-        return content
 
     def _generate_queries(self, convo: str, summary_text: str, grad_text: str) -> List[str]:
+        # With back-fill on, ask for spare candidates to replace collapsed near-duplicates.
+        backfill = self.query_deduper is not None and self.query_deduper.backfill
+        n_candidates = self.max_queries * 2 if backfill else self.max_queries
         prompt = (
             "당신은 토론 반박을 준비하는 리서치 전략가입니다."
-            "주어진 대화와 요약을 읽고, 건전한 반박을 위해 추가로 조사해야 할 검색 질의를 1~3개 제안하세요."
+            f"주어진 대화와 요약을 읽고, 건전한 반박을 위해 추가로 조사해야 할 검색 질의를 1~{n_candidates}개 제안하세요."
             """JSON 형식: {"queries": ["..."]}."""
             "검색 질의는 사실 검증, 통계, 사례 등을 포함한 명확한 문장형 질문이어야 합니다."
             f"""
@@ -67,8 +109,7 @@ class RebuttalSubModule_ver2:
 
 [개선 지시]
 {grad_text}"""
-        content = self._call_model(prompt, tag="Rebuttal-Queries")
-        data = RebuttalSubModule_ver1._parse_structured_response(content)
+        data, content = self._call_model(prompt, "search_queries", QUERY_SCHEMA, tag="Rebuttal-Queries")
         queries = data.get("queries")
         if isinstance(queries, str):
             queries = [queries]
@@ -79,20 +120,39 @@ class RebuttalSubModule_ver2:
             q = (q or "").strip()
             if q:
                 cleaned.append(q)
-            if len(cleaned) >= self.max_queries:
-                break
-        return cleaned
+        if self.query_deduper:
+            return self.query_deduper.select(cleaned, self.max_queries)
+        return cleaned[: self.max_queries]
 
-    def _search_with_tavily(self, query: str, loop_state: str) -> List[Dict[str, Any]]:
-        loop_prefix = f"[CritiqueBot] Tavily 검색 {loop_state}: {query}"
-        _test_mode_print(loop_prefix)
+    def _tavily_hits(self, query: str, depth: str) -> List[Dict[str, Any]]:
+        timeout = call_timeout("search")
+        # A timeout the request deadline shortened says nothing about Tavily's health.
+        deadline_limited = timeout < stage_cap("search")
+        if not TAVILY_BREAKER.allow():
+            raise CircuitOpen("Tavily 차단기 열림 - 검색 생략")
+        started = time.perf_counter()
+        status = "error"
         try:
-            resp = self.tavily.search(
-                query, search_depth=self.search_depth, max_results=self.top_k_per_query
-            )
+            resp = self.tavily.search(query, search_depth=depth, max_results=self.top_k_per_query, timeout=timeout)
+            status = "ok"
         except Exception as exc:
-            _test_mode_print(f"{loop_prefix} -> 실패: {exc}")
-            return []
+            if is_timeout(exc):
+                status = "timeout"
+                record_timeout("search")
+            if status == "timeout" and deadline_limited:
+                TAVILY_BREAKER.release()
+            else:
+                TAVILY_BREAKER.record_failure()
+            raise
+        else:
+            TAVILY_BREAKER.record_success()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._search_lock:
+                self.search_stats[depth] = self.search_stats.get(depth, 0) + 1
+                self.search_stats["seconds"] += elapsed
+            TAVILY_CALLS.inc(depth=depth, status=status)
+            TAVILY_LATENCY.observe(elapsed, depth=depth)
         hits = []
         for item in resp.get("results", [])[: self.top_k_per_query]:
             hits.append(
@@ -101,8 +161,47 @@ class RebuttalSubModule_ver2:
                     "title": item.get("title") or item.get("url") or "출처 미상",
                     "url": item.get("url"),
                     "snippet": (item.get("content") or item.get("snippet") or item.get("excerpt") or "").strip(),
+                    "score": item.get("score"),
                 }
             )
+        return hits
+
+    def _shared_hits(self, query: str, depth: str) -> List[Dict[str, Any]]:
+        # Runs batched by EXP batch_runs issue an identical search once.
+        return _shared_in_batch(("tavily", id(self), query, depth), self._tavily_hits, query, depth)
+
+    def _needs_escalation(self, hits: List[Dict[str, Any]]) -> bool:
+        policy = self.escalation
+        strong = [
+            hit
+            for hit in hits
+            if (hit["score"] is None or hit["score"] >= policy["min_score"])
+            and len(hit["snippet"]) >= policy["min_snippet_chars"]
+        ]
+        return len(strong) < policy["min_hits"]
+
+    def _search_with_tavily(self, query: str, loop_state: str) -> List[Dict[str, Any]]:
+        loop_prefix = f"[CritiqueBot] Tavily 검색 {loop_state}: {query}"
+        _test_mode_print(loop_prefix)
+        adaptive = self.search_depth == "adaptive"
+        skipped = False
+        try:
+            hits = self._shared_hits(query, "basic" if adaptive else self.search_depth)
+        except Exception as exc:
+            _test_mode_print(f"{loop_prefix} -> 실패: {exc}")
+            hits = None
+            # Not sent at all (open breaker, passed deadline): an advanced retry would be skipped too.
+            skipped = isinstance(exc, (CircuitOpen, DeadlineExceeded))
+        if adaptive and not skipped and (hits is None or self._needs_escalation(hits)):
+            _test_mode_print(f"{loop_prefix} -> basic 결과 부족, advanced 재검색")
+            with self._search_lock:
+                self.search_stats["escalated"] += 1
+            try:
+                hits = self._shared_hits(query, "advanced")
+            except Exception as exc:
+                _test_mode_print(f"{loop_prefix} -> 실패: {exc}")
+        if hits is None:
+            return []
         if hits:
             _test_mode_print(f"{loop_prefix} -> {len(hits)}건 수집")
             for idx, hit in enumerate(hits, 1):
@@ -136,6 +235,17 @@ class RebuttalSubModule_ver2:
                 lines.append(f"    요약: {snippet}")
         return "\n".join(lines)
 
+    def _format_ranked_evidence(self, hits) -> str:
+        if not hits:
+            return "(검색 결과 없음)"
+        lines = []
+        for idx, hit in enumerate(hits, 1):
+            lines.append(f"  - ({idx}) 제목: {hit['title']}")
+            lines.append(f"    URL: {hit['url'] or '(없음)'}")
+            lines.append(f"    검색어: {' / '.join(hit['queries'])}")
+            lines.append(f"    발췌: {hit['snippet']}")
+        return "\n".join(lines)
+
     def _reference_pool(self, evidence) -> Dict[str, str]:
         refs: Dict[str, str] = {}
         for block in evidence:
@@ -146,7 +256,37 @@ class RebuttalSubModule_ver2:
                     refs[title] = url
         return refs
 
-    def call(self, history, summary, grad):
+    def report_lines(self) -> List[str]:
+        lines: List[str] = []
+        with self._search_lock:
+            stats = dict(self.search_stats)
+        searches = stats["basic"] + stats["advanced"]
+        if searches:
+            lines.append(
+                f"[CritiqueBot] Tavily 검색 {searches}회 ({self.search_depth}): basic {stats['basic']}회, "
+                f"advanced {stats['advanced']}회 (에스컬레이션 {stats['escalated']}회), "
+                f"평균 {stats['seconds'] / searches:.2f}s"
+            )
+        if stats["fallback"]:
+            lines.append(f"[CritiqueBot] Tavily 차단으로 검색 없는 반박(v1 프롬프트) 사용 {stats['fallback']}회")
+        for stage in (self.query_deduper, self.evidence_processor):
+            if stage:
+                lines.extend(stage.report_lines())
+        return lines
+
+    def _fallback_context(self, queries: List[str]) -> Dict[str, Any]:
+        with self._search_lock:
+            self.search_stats["fallback"] += 1
+        _test_mode_print("[CritiqueBot] Tavily 차단기 열림 - 검색 없이 v1 프롬프트로 반박 생성")
+        return {"fallback": True, "queries": queries}
+
+    def prepare(self, history, summary, grad) -> Dict[str, Any]:
+        """Query generation + search; the result can be shared by several compose() calls.
+
+        While the Tavily breaker is open both are skipped and compose() falls back to the v1 prompt.
+        """
+        if not TAVILY_BREAKER.available():
+            return self._fallback_context([])
         grad_text = _format_grad_for_module(grad)
         convo = _format_history_for_prompt(history)
         summary_text = summary if summary else "요약 정보가 제공되지 않았습니다."
@@ -154,39 +294,96 @@ class RebuttalSubModule_ver2:
         queries = self._generate_queries(convo, summary_text, grad_text)
         _test_mode_print(f"[CritiqueBot] 생성된 검색 질의: {queries}")
         evidence = self._gather_evidence(queries)
-        evidence_block = self._format_evidence_block(evidence)
-        ref_pool = self._reference_pool(evidence)
+        if not evidence and not TAVILY_BREAKER.available():
+            return self._fallback_context(queries)
+        if self.evidence_processor:
+            claim = next((m["content"] for m in reversed(history) if m.get("role") == "user"), "")
+            hits = self.evidence_processor.process(evidence, claim, summary)
+            return {
+                "evidence_block": self._format_ranked_evidence(hits),
+                "ref_pool": self._reference_pool([{"hits": hits}]),
+                "queries": queries,
+            }
+        return {
+            "evidence_block": self._format_evidence_block(evidence),
+            "ref_pool": self._reference_pool(evidence),
+            "queries": queries,
+        }
 
-        user_prompt = f"""대화 히스토리:
-{convo}
-
-요약:
-{summary_text}
+    def call(self, history, summary, grad):
+        return self.compose(history, summary, grad, self.prepare(history, summary, grad))
 
-검색 근거:
-{evidence_block}
+    def compose(self, history, summary, grad, context: Dict[str, Any]):
+        grad_text = _format_grad_for_module(grad)
+        if context.get("fallback"):
+            rebuttal = self.fallback.call(history, summary, grad_text)
+            return dict(rebuttal, pool={}, queries=context.get("queries"))
+        convo = _format_history_for_prompt(history)
+        summary_text = summary if summary else "요약 정보가 제공되지 않았습니다."
+        evidence_block = context["evidence_block"]
+        ref_pool = context["ref_pool"]
 
-"""
-        user_prompt += (
-            "위 검색 근거와 대화 요약에 명시된 사실만 사용해 자연스럽고 친근한 반박문을 작성하세요. 상대의 주장도 짧게 인정한 뒤, 근거를 들며 차분히 반박하세요.\n"
+        user_prompt = (
+            "아래 검색 근거와 대화 요약에 명시된 사실만 사용해 자연스럽고 친근한 반박문을 작성하세요. 상대의 주장도 짧게 인정한 뒤, 근거를 들며 차분히 반박하세요.\n"
             "반박문은 3~5문장 이내로 간결하게 작성하세요.\n"
             'JSON {"rebuttal": "...", "references": [{"title": "...", "url": "..."}]} 형식으로 출력하세요.\n'
             "각 근거가 어느 검색 결과에서 왔는지 문장 내에서 자연스럽게 언급하세요."
         )
+        user_prompt += f"""
+
+대화 히스토리:
+{convo}
+
+요약:
+{summary_text}
+
+검색 근거:
+{evidence_block}"""
         if grad_text:
             user_prompt += f"""
 
 [개선 지시]
 {grad_text}"""
 
-        content = self._call_model(user_prompt, tag="Rebuttal")
-        data = RebuttalSubModule_ver1._parse_structured_response(content)
-        rebuttal = data.get("rebuttal", content).strip()
+        data, content = self._call_model(user_prompt, "rebuttal", REBUTTAL_SCHEMA, tag="Rebuttal")
+        rebuttal = str(data.get("rebuttal") or content).strip()
         refs = RebuttalSubModule_ver1._normalize_refs(data.get("references", []))
         if not refs and ref_pool:
             refs = ref_pool
-        return {"txt": rebuttal, "ref": refs}
+        return {
+            "txt": rebuttal,
+            "ref": refs,
+            "parsed": bool(data.get("rebuttal")),
+            "pool": ref_pool,
+            "queries": context.get("queries"),
+        }
 
 
-def build(model_name: str, *, openai_client, tavily_client, **_):
-    return RebuttalSubModule_ver2(model_name, openai_client, tavily_client)
+def build(
+    model_name: str,
+    *,
+    openai_client,
+    tavily_client,
+    search_depth: str = "adaptive",
+    escalation: Dict[str, Any] = None,
+    process_evidence: bool = True,
+    evidence_budget_tokens: int = 1200,
+    sentences_per_hit: int = 2,
+    dedupe_queries: bool = True,
+    query_similarity: float = 0.7,
+    backfill_queries: bool = False,
+    **_,
+):
+    return RebuttalSubModule_ver2(
+        model_name,
+        openai_client,
+        tavily_client,
+        search_depth=search_depth,
+        escalation=escalation,
+        process_evidence=process_evidence,
+        evidence_budget_tokens=evidence_budget_tokens,
+        sentences_per_hit=sentences_per_hit,
+        dedupe_queries=dedupe_queries,
+        query_similarity=query_similarity,
+        backfill_queries=backfill_queries,
+    )
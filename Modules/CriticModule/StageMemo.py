@@ -0,0 +1,119 @@
+import contextvars
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..Metrics import CACHE_REQUESTS
+
+# Leaf methods whose outputs are memoized (TextGrad's only entry point is ga); a
+# module's call() that delegates to them (judge call -> score, rebuttal v2 call ->
+# prepare/compose) is re-run on the proxy so only the leaves hit the cache.
+_LEAF_METHODS = ("score", "prepare", "compose", "ga")
+
+
+def _fingerprint(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class StageMemo:
+    """Stage outputs shared by several critic configs of one experiment matrix.
+
+    Entries are keyed by (scope, module type, version, model, options, inputs,
+    occurrence). The scope (case/run) keeps separate runs independent samples;
+    the occurrence index keeps repeated identical calls inside one critic
+    (best-of-N candidates) distinct, while the k-th such call of another config
+    reuses the k-th result. drop_scope() frees a finished (case, run).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # scope -> {entry key -> value}
+        self._entries: Dict[Any, Dict[Tuple, Any]] = {}
+        self._proxies: List["_MemoizedStage"] = []
+        self._scope = contextvars.ContextVar("stage_memo_scope", default=None)
+        self.stats = {"hits": 0, "misses": 0}
+
+    @contextmanager
+    def scope(self, *key):
+        token = self._scope.set(key)
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+
+    def drop_scope(self, *key) -> None:
+        """Forgets the entries and occurrence counters of a scope no config will revisit."""
+        with self._lock:
+            self._entries.pop(key, None)
+            proxies = list(self._proxies)
+        for proxy in proxies:
+            proxy._drop_scope(key)
+
+    def wrap(self, module, module_type: str, module_cfg: Dict[str, Any], ignored_options: Iterable[str] = ()):
+        options = {k: v for k, v in (module_cfg.get("options") or {}).items() if k not in set(ignored_options)}
+        spec = (module_type, module_cfg.get("version"), module_cfg.get("model"), _fingerprint(options))
+        proxy = _MemoizedStage(self, module, spec)
+        with self._lock:
+            self._proxies.append(proxy)
+        return proxy
+
+    def _lookup(self, key: Tuple):
+        with self._lock:
+            entries = self._entries.get(key[0], {})
+            found = key in entries
+            self.stats["hits" if found else "misses"] += 1
+            value = copy.deepcopy(entries[key]) if found else None
+        CACHE_REQUESTS.inc(cache="stage_memo", result="hit" if found else "miss")
+        return found, value
+
+    def _store(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            self._entries.setdefault(key[0], {})[key] = copy.deepcopy(value)
+
+    def report_lines(self):
+        with self._lock:
+            hits, misses = self.stats["hits"], self.stats["misses"]
+        total = hits + misses
+        if not total:
+            return []
+        return [f"[CritiqueBot] 매트릭스 단계 공유: 단계 호출 {total}회 중 {hits}회 재사용 ({hits / total * 100:.1f}%)"]
+
+
+class _MemoizedStage:
+    """Proxy around a submodule instance; attribute reads fall through to it."""
+
+    def __init__(self, memo: StageMemo, inner, spec: Tuple) -> None:
+        self._memo = memo
+        self._inner = inner
+        self._spec = spec
+        self._occurrences: Dict[Tuple, int] = {}
+        self._occ_lock = threading.Lock()
+        self._leaves = tuple(name for name in _LEAF_METHODS if callable(getattr(inner, name, None)))
+
+    def __getattr__(self, name):
+        if name in self._leaves or (name == "call" and not self._leaves):
+            return lambda *args: self._memoized(name, args)
+        if name == "call":
+            return lambda *args: type(self._inner).call(self, *args)
+        return getattr(self._inner, name)
+
+    def _drop_scope(self, scope) -> None:
+        with self._occ_lock:
+            for base in [base for base in self._occurrences if base[0] == scope]:
+                del self._occurrences[base]
+
+    def _memoized(self, method: str, args: Tuple):
+        scope = self._memo._scope.get()
+        base = (scope, *self._spec, method, _fingerprint(args))
+        with self._occ_lock:
+            occurrence = self._occurrences.get(base, 0)
+            self._occurrences[base] = occurrence + 1
+        key = (*base, occurrence)
+        found, value = self._memo._lookup(key)
+        if found:
+            return value
+        value = getattr(self._inner, method)(*args)
+        self._memo._store(key, value)
+        return value
@@ -2,9 +2,9 @@ import json
 from typing import Any, Dict, List, Optional
 
 from ...utils import (
+    _chat_completion,
     _format_grad_for_module,
     _format_history_for_prompt,
-    _log_submodule_io,
     _parse_bullet_list,
     _role_transcript,
 )
@@ -25,16 +25,14 @@ class SummarizerSubModule_ver1:
         self.openai = client
 
     def _call_model(self, prompt: str, tag: str = "Summarizer") -> str:
-        rsp = self.openai.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self.sys},
-                {"role": "user", "content": prompt},
-            ],
+        return _chat_completion(
+            self.openai,
+            self.model,
+            self.sys,
+            prompt,
+            tag=tag,
+            module_name=self.__class__.__name__,
         )
-        content = rsp.choices[0].message.content.strip()
-        _log_submodule_io(tag, prompt, content, self.__class__.__name__, self.model)
-        return content
 
     def _summarize_role(
         self, transcript: str, label: str, grad_text: Optional[str]
@@ -44,11 +42,11 @@ class SummarizerSubModule_ver1:
         token_count = len(transcript.split())
         bullet_limit = 1 if token_count <= 20 else 3
         prompt = (
-            f"""다음은 {label} 발화 기록입니다:
-{transcript}
+            f"아래 {label} 발화 기록의 핵심 주장 1~{bullet_limit}개를 bullet list로 요약하세요. 존재하는 정보만 사용하고, 내용이 부족하면 1개 이하로만 작성하세요. 새로운 내용은 절대 만들지 마세요."
+            f"""
 
-"""
-            f"핵심 주장 1~{bullet_limit}개를 bullet list로 요약하세요. 존재하는 정보만 사용하고, 내용이 부족하면 1개 이하로만 작성하세요. 새로운 내용은 절대 만들지 마세요."
+{label} 발화 기록:
+{transcript}"""
         )
         if grad_text:
             prompt += f"""
@@ -69,16 +67,16 @@ class SummarizerSubModule_ver1:
         assistant_lines = assistant_summary or ["(정보 없음)"]
         user_block = "\n- ".join(user_lines)
         assistant_block = "\n- ".join(assistant_lines)
-        prompt = f"""대화 히스토리:
+        prompt = f"""아래 정보를 바탕으로 아직 해결되지 않은 쟁점이나 추가 질문을 bullet list로 1~3개 작성하세요. 근거가 없는 질문은 만들지 마세요.
+
+대화 히스토리:
 {history_text}
 
 사용자 요약:
 - {user_block}
 
 어시스턴트 요약:
-- {assistant_block}
-
-위 정보를 바탕으로 아직 해결되지 않은 쟁점이나 추가 질문을 bullet list로 1~3개 작성하세요. 근거가 없는 질문은 만들지 마세요."""
+- {assistant_block}"""
         if grad_text:
             prompt += f"""
 
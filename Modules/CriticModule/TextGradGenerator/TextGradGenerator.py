@@ -1,10 +1,20 @@
 import json
 
-from ...utils import _format_history_for_prompt, _log_submodule_io
+from ...utils import _chat_json, _format_history_for_prompt
 
 MODULE_TYPE = "textgrad"
 MODULE_VERSION = "v1"
 
+GRAD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summarizer_grad": {"type": "array", "items": {"type": "string"}},
+        "rebuttal_grad": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["summarizer_grad", "rebuttal_grad"],
+    "additionalProperties": False,
+}
+
 
 class TextGradGenerator:
     def __init__(self, model: str, client) -> None:
@@ -24,7 +34,14 @@ class TextGradGenerator:
         else:
             rebuttal_text = str(rebuttal)
         feedback_text = feedback or "내부 심사 피드백이 없지만, 명확성/근거/톤을 개선하세요."
-        user_prompt = f"""대화 히스토리:
+        user_prompt = (
+            "Summarizer와 Rebuttal 모듈이 다음 시도에서 개선해야 할 2~3개의 구체적 지침을 번호 목록으로 작성하세요.\n"
+            "Summarizer 지침과 Rebuttal 지침을 분리해 주세요.\n"
+            'JSON 형식: {"summarizer_grad": ["..."], "rebuttal_grad": ["..."]}'
+        )
+        user_prompt += f"""
+
+대화 히스토리:
 {convo}
 
 현재 요약:
@@ -34,39 +51,22 @@ class TextGradGenerator:
 {rebuttal_text}
 
 내부 심사 피드백:
-{feedback_text}
-
-"""
-        user_prompt += (
-            "Summarizer와 Rebuttal 모듈이 다음 시도에서 개선해야 할 2~3개의 구체적 지침을 번호 목록으로 작성하세요.\n"
-            "Summarizer 지침과 Rebuttal 지침을 분리해 주세요.\n"
-            'JSON 형식: {"summarizer_grad": ["..."], "rebuttal_grad": ["..."]}'
-        )
-        rsp = self.openai.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self.sys},
-                {"role": "user", "content": user_prompt},
-            ],
+{feedback_text}"""
+        data, _ = _chat_json(
+            self.openai,
+            self.model,
+            self.sys,
+            user_prompt,
+            tag="TextGrad",
+            module_name=self.__class__.__name__,
+            schema_name="textgrad",
+            schema=GRAD_SCHEMA,
         )
-        content = rsp.choices[0].message.content.strip()
-        _log_submodule_io("TextGrad", user_prompt, content, self.__class__.__name__, self.model)
-        return self._parse_grad_response(content)
+        return self._parse_grad_response(data)
 
     @staticmethod
-    def _parse_grad_response(text):
-        cleaned = (text or "").strip()
-        if cleaned.startswith("```"):
-            trimmed = cleaned[3:]
-            parts = trimmed.split("```", 1)
-            cleaned = parts[0].strip()
-            if cleaned.lower().startswith("json"):
-                cleaned = cleaned[4:].strip()
-        try:
-            import json as _json
-
-            data = _json.loads(cleaned)
-        except Exception:
+    def _parse_grad_response(data):
+        if not data:
             return {}
 
         def _ensure_list(val):
@@ -1,10 +1,19 @@
 import json
+import sys
+import threading
+from collections import OrderedDict
 from importlib import import_module
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
+from .CriticModule_BestOfN import BEST_OF_N_DEFAULTS, CriticModule_BestOfN
 from .CriticModule_ver1 import CriticModule_ver1
-from ..utils import _test_mode_print
+from .LoopController import LOOP_CONTROLLER_DEFAULTS
+from ..CircuitBreaker import TAVILY_BREAKER
+from ..Deadline import DEADLINE_DEFAULTS
+from ..Metrics import CACHE_REQUESTS
+from ..ReferenceValidator import REFERENCE_VALIDATOR
+from ..utils import REQUEST_HEDGER, _test_mode_print
 
 SUPPORTED_MODEL_SHORTCUTS = [
     "gpt-5-chat-latest",
@@ -12,15 +21,63 @@ SUPPORTED_MODEL_SHORTCUTS = [
     "gpt-5",
 ]
 
+SUBMODULE_KEYS = ("summarizer", "rebuttal", "judge", "textgrad")
+
+CRITIC_VARIANTS = {
+    "v1": CriticModule_ver1,
+    "bon": CriticModule_BestOfN,
+}
+
 DEFAULT_EXPERIMENT_TEMPLATE = {
     "summarizer": {"version": "v1", "model": "gpt-4o-mini"},
     "rebuttal": {"version": "v2", "model": "gpt-5-chat-latest"},
     "judge": {"version": "v1", "model": "gpt-4o-mini"},
     "textgrad": {"version": "v1", "model": "gpt-4o-mini"},
+    # Critic variant and its loop policy (see CRITIC_VARIANTS); not a submodule.
+    "critic": {
+        "version": "v1",
+        "options": dict(LOOP_CONTROLLER_DEFAULTS, **DEADLINE_DEFAULTS, prejudge=False, validate_refs=False, routing=None),
+    },
 }
 
 PRESET_EXPERIMENTS = {
     "default": DEFAULT_EXPERIMENT_TEMPLATE,
+    "interactive": {
+        "critic": {
+            "options": {
+                "deadline_s": 45,
+                "plateau_margin": 1.0,
+                "plateau_patience": 1,
+                "prejudge": True,
+                "validate_refs": True,
+            },
+        },
+    },
+    "judge-cascade": {
+        "judge": {
+            "version": "cascade",
+            "model": "gpt-5-chat-latest",
+            "options": {"cheap_model": "gpt-4o-mini", "band": 5.0},
+        },
+    },
+    "parallel": {
+        "critic": {"version": "bon", "options": dict(BEST_OF_N_DEFAULTS)},
+    },
+    # Runs every loop up to max_loop and traces each candidate; use with exp_config "trace": true
+    # and replay thresholds offline with `main.py --mode sweep`.
+    "recording": {
+        "critic": {"options": {"record_loops": True}},
+    },
+    # Cheap models by default; the router escalates rebuttal/textgrad to gpt-5-chat-latest on long claims,
+    # late turns, searches without evidence and after a failed judge loop (see ModelRouter).
+    "routed": {
+        "default_model": "gpt-4o-mini",
+        "critic": {
+            "options": {
+                "routing": {"modules": {"rebuttal": "gpt-5-chat-latest", "textgrad": "gpt-5-chat-latest"}},
+            },
+        },
+    },
     "budget": {
         "default_model": "gpt-4o-mini",
         "rebuttal": {"version": "v1"},
@@ -28,20 +85,39 @@ PRESET_EXPERIMENTS = {
     },
     "max-grounding": {
         "default_model": "gpt-5",
-        "rebuttal": {"version": "v2", "model": "gpt-5"},
+        "rebuttal": {
+            "version": "v2",
+            "model": "gpt-5",
+            "options": {"search_depth": "advanced", "evidence_budget_tokens": 2400, "sentences_per_hit": 3},
+        },
     },
 }
 
 
 class CriticFactory:
-    def __init__(self, openai_client, tavily_client, custom_presets: Dict[str, Any] = None) -> None:
+    """Builds critics from experiment configs.
+
+    Critics are kept in an LRU cache of `cache_size` configs. Submodule
+    instances come from a pool keyed by (type, version, model, options), so
+    configs that differ in one module share the other instances (and their
+    clients, caches and statistics); pool entries no cached critic uses are
+    dropped on eviction. Submodules keep no per-call state, so shared
+    instances may serve concurrent calls.
+    """
+
+    def __init__(self, openai_client, tavily_client, custom_presets: Dict[str, Any] = None, cache_size: int = 32) -> None:
         self.openai_client = openai_client
         self.tavily_client = tavily_client
         self.presets = dict(PRESET_EXPERIMENTS)
         if custom_presets:
             self.presets.update(custom_presets)
         self.builders = self._discover_module_builders()
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache_size = max(1, int(cache_size))
+        # config key -> critic entry, least recently used first
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.instances: Dict[Tuple, Any] = {}
+        self._lock = threading.RLock()
+        self.cache_stats = {"hits": 0, "misses": 0, "evicted": 0, "instances_built": 0, "instances_reused": 0}
 
     def _discover_module_builders(self) -> Dict[str, Dict[str, Any]]:
         registry: Dict[str, Dict[str, Any]] = {}
@@ -62,25 +138,83 @@ class CriticFactory:
             registry.setdefault(module_type, {})[version] = build_fn
         return registry
 
-    def get_or_build(self, experiment=None):
-        entry = self._get_entry(experiment)
+    def get_or_build(self, experiment=None, stage_memo=None):
+        """Cached critic for a config; with a StageMemo its submodules share stage outputs through it."""
+        entry = self._get_entry(experiment, stage_memo)
         return entry["critic"]
 
     def describe(self, experiment=None) -> Tuple[Dict[str, Any], Dict[str, str]]:
         entry = self._get_entry(experiment)
         return entry["config"], entry["runtime_meta"]
 
-    def _get_entry(self, experiment):
+    def prewarm(self, presets: Iterable = None) -> None:
+        """Builds critics before the first request; presets are names or experiment configs (None: every preset)."""
+        targets = list(self.presets) if presets is None else list(presets)
+        for experiment in targets:
+            self._get_entry(experiment)
+        _test_mode_print(f"[CritiqueBot] critic 사전 생성 {len(targets)}개, 서브모듈 인스턴스 {len(self.instances)}개")
+
+    def _get_entry(self, experiment, stage_memo=None):
         config = self._normalize_experiment_config(experiment)
         key = json.dumps(config, sort_keys=True, ensure_ascii=False)
-        if key not in self.cache:
-            critic, runtime_meta = self._build_critic_from_config(config)
-            self.cache[key] = {
+        if stage_memo is not None:
+            key = f"{key}|memo:{id(stage_memo)}"
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                CACHE_REQUESTS.inc(cache="critic", result="hit")
+                return entry
+            self.cache_stats["misses"] += 1
+            CACHE_REQUESTS.inc(cache="critic", result="miss")
+            critic, runtime_meta = self._build_critic_from_config(config, stage_memo)
+            entry = self.cache[key] = {
                 "critic": critic,
                 "config": config,
                 "runtime_meta": runtime_meta,
+                "instance_keys": [self._instance_key(name, config[name]) for name in SUBMODULE_KEYS]
+                + [self._instance_key(name, cfg) for name, cfg in self._routed_configs(config).items()],
             }
-        return self.cache[key]
+            evicted = 0
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+                evicted += 1
+            if evicted:
+                self.cache_stats["evicted"] += evicted
+                live = {k for cached in self.cache.values() for k in cached["instance_keys"]}
+                for stale in [k for k in self.instances if k not in live]:
+                    del self.instances[stale]
+            return entry
+
+    @staticmethod
+    def _instance_key(module_name: str, module_cfg: Dict[str, Any]) -> Tuple:
+        options = json.dumps(module_cfg.get("options") or {}, sort_keys=True, ensure_ascii=False)
+        return (module_name, module_cfg.get("version"), module_cfg.get("model"), options)
+
+    def report_lines(self) -> List[str]:
+        """Runtime statistics of the cached critics and pooled submodules (for EXP summaries)."""
+        lines: List[str] = []
+        with self._lock:
+            modules = [entry["critic"] for entry in self.cache.values()] + list(self.instances.values())
+            stats = dict(self.cache_stats)
+        seen = set()
+        for module in modules:
+            reporter = getattr(module, "report_lines", None)
+            if reporter is None or id(module) in seen:
+                continue
+            seen.add(id(module))
+            lines.extend(reporter())
+        if stats["instances_reused"] or stats["evicted"]:
+            lines.append(
+                f"[CritiqueBot] critic 캐시: {len(self.cache)}/{self.cache_size}개 (적중 {stats['hits']}회, "
+                f"생성 {stats['misses']}회, 제거 {stats['evicted']}회), 서브모듈 인스턴스 {stats['instances_built']}개 생성 "
+                f"/ {stats['instances_reused']}회 공유"
+            )
+        lines.extend(REFERENCE_VALIDATOR.report_lines())
+        lines.extend(REQUEST_HEDGER.report_lines())
+        lines.extend(TAVILY_BREAKER.report_lines())
+        return lines
 
     def _clone_config(self, data: Dict[str, Any]) -> Dict[str, Any]:
         return json.loads(json.dumps(data, ensure_ascii=False))
@@ -105,11 +239,11 @@ class CriticFactory:
 
         default_model = experiment.pop("default_model", None)
         if default_model:
-            for module in cfg:
+            for module in SUBMODULE_KEYS:
                 cfg[module]["model"] = default_model
         default_version = experiment.pop("default_version", None)
         if default_version:
-            for module in cfg:
+            for module in SUBMODULE_KEYS:
                 cfg[module]["version"] = default_version
 
         module_models = experiment.pop("models", {}) or {}
@@ -133,37 +267,82 @@ class CriticFactory:
                         cfg[module]["model"] = override["model"]
                     if "version" in override:
                         cfg[module]["version"] = override["version"]
+                    if isinstance(override.get("options"), dict):
+                        cfg[module].setdefault("options", {}).update(override["options"])
         for leftover in experiment.keys():
             if leftover not in cfg and leftover not in ("modules",):
                 _test_mode_print(f"[CritiqueBot] 경고: 사용되지 않은 실험 키 {leftover}")
         return cfg
 
-    def _build_critic_from_config(self, config: Dict[str, Any]):
-        runtime_meta = {}
-        modules = {}
-        for module_name, module_cfg in config.items():
-            builders = self.builders.get(module_name, {})
-            version = module_cfg.get("version")
-            builder = builders.get(version)
-            if builder is None:
-                available = ", ".join(builders.keys()) or "(none)"
-                raise ValueError(
-                    f"Unsupported {module_name} version '{version}'. 사용 가능: {available}"
-                )
+    def _pooled_instance(self, module_name: str, module_cfg: Dict[str, Any], stage_memo=None):
+        builders = self.builders.get(module_name, {})
+        version = module_cfg.get("version")
+        builder = builders.get(version)
+        if builder is None:
+            available = ", ".join(builders.keys()) or "(none)"
+            raise ValueError(
+                f"Unsupported {module_name} version '{version}'. 사용 가능: {available}"
+            )
+        instance_key = self._instance_key(module_name, module_cfg)
+        instance = self.instances.get(instance_key)
+        if instance is None:
             instance = builder(
                 module_cfg.get("model"),
                 openai_client=self.openai_client,
                 tavily_client=self.tavily_client,
+                **(module_cfg.get("options") or {}),
             )
-            modules[module_name] = instance
+            self.instances[instance_key] = instance
+            self.cache_stats["instances_built"] += 1
+        else:
+            self.cache_stats["instances_reused"] += 1
+        if stage_memo is not None:
+            ignored = getattr(sys.modules[builder.__module__], "MEMO_IGNORED_OPTIONS", ())
+            return instance, stage_memo.wrap(instance, module_name, module_cfg, ignored)
+        return instance, instance
+
+    @staticmethod
+    def _routed_configs(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Strong-model twins of the submodules named in the critic's routing option."""
+        routing = (config["critic"].get("options") or {}).get("routing") or {}
+        return {
+            module_name: dict(config[module_name], model=strong_model)
+            for module_name, strong_model in (routing.get("modules") or {}).items()
+            if module_name in SUBMODULE_KEYS and strong_model != config[module_name].get("model")
+        }
+
+    def _build_critic_from_config(self, config: Dict[str, Any], stage_memo=None):
+        runtime_meta = {}
+        modules = {}
+        for module_name in SUBMODULE_KEYS:
+            module_cfg = config[module_name]
+            instance, modules[module_name] = self._pooled_instance(module_name, module_cfg, stage_memo)
             runtime_meta[module_name] = {
                 "class": instance.__class__.__name__,
                 "model": module_cfg.get("model"),
             }
-        critic = CriticModule_ver1(
+        routes = {}
+        for module_name, strong_cfg in self._routed_configs(config).items():
+            _, routes[module_name] = self._pooled_instance(module_name, strong_cfg, stage_memo)
+            runtime_meta[module_name]["model"] = f"{config[module_name].get('model')} -> {strong_cfg['model']}"
+        critic_version = config["critic"].get("version")
+        critic_cls = CRITIC_VARIANTS.get(critic_version)
+        if critic_cls is None:
+            available = ", ".join(CRITIC_VARIANTS.keys())
+            raise ValueError(f"Unsupported critic version '{critic_version}'. 사용 가능: {available}")
+        extra = {}
+        if routes:
+            if critic_cls is CriticModule_ver1:
+                extra["routes"] = routes
+            else:
+                _test_mode_print(f"[CritiqueBot] critic '{critic_version}'은 모델 라우팅을 지원하지 않아 무시합니다.")
+        critic = critic_cls(
             summarizer=modules["summarizer"],
             rebuttal=modules["rebuttal"],
             internal_judge=modules["judge"],
             text_grad=modules["textgrad"],
+            options=config["critic"].get("options"),
+            **extra,
         )
+        runtime_meta["critic"] = {"class": critic.__class__.__name__, "model": None}
         return critic, runtime_meta
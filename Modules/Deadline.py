@@ -0,0 +1,127 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from .Metrics import METRICS
+
+# Per-network-call caps by stage (seconds); "default" covers stages without an entry.
+# "search" is a single Tavily request, the LLM stages are one chat completion each.
+STAGE_TIMEOUT_DEFAULTS: Dict[str, float] = {
+    "default": 120.0,
+    "summarizer": 60.0,
+    "rebuttal": 120.0,
+    "evidence": 120.0,
+    "judge": 90.0,
+    "textgrad": 90.0,
+    "search": 20.0,
+}
+DEADLINE_DEFAULTS: Dict[str, Any] = {
+    # Hard wall-clock limit for one critic call; None leaves only the per-stage caps.
+    "request_timeout_s": 600.0,
+    "stage_timeouts": {},
+}
+
+STAGE_TIMEOUTS = METRICS.counter(
+    "critiquebot_stage_timeouts_total", "Network calls that timed out or were skipped past the deadline, by stage.",
+    ("stage",),
+)
+
+_DEADLINE: contextvars.ContextVar = contextvars.ContextVar("critiquebot_deadline", default=None)
+_STAGE: contextvars.ContextVar = contextvars.ContextVar("critiquebot_deadline_stage", default="default")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting a network call once the request deadline has passed."""
+
+
+class Deadline:
+    """Request-scoped time budget; every network call under it gets min(remaining, stage cap) as its timeout."""
+
+    def __init__(self, budget_s: Optional[float] = None, stage_timeouts: Optional[Dict[str, float]] = None) -> None:
+        self.budget_s = budget_s
+        self.stage_timeouts = dict(STAGE_TIMEOUT_DEFAULTS, **(stage_timeouts or {}))
+        self.started_at = time.monotonic()
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]], deadline_s: Optional[float] = None) -> "Deadline":
+        """Deadline from critic options; the loop deadline_s, when set, is the budget if it is tighter."""
+        settings = dict(DEADLINE_DEFAULTS)
+        settings.update({k: v for k, v in (options or {}).items() if k in DEADLINE_DEFAULTS})
+        budget_s = settings["request_timeout_s"]
+        if deadline_s is not None:
+            budget_s = deadline_s if budget_s is None else min(budget_s, deadline_s)
+        return cls(budget_s, settings["stage_timeouts"])
+
+    def remaining(self) -> Optional[float]:
+        if self.budget_s is None:
+            return None
+        return self.budget_s - (time.monotonic() - self.started_at)
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout_for(self, stage: str) -> float:
+        cap = self.stage_timeouts.get(stage, self.stage_timeouts["default"])
+        remaining = self.remaining()
+        return cap if remaining is None else min(cap, remaining)
+
+
+_DEFAULT_DEADLINE = Deadline()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline):
+    """Applies deadline to every call made inside the block (and threads started via _submit_in_context)."""
+    token = _DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _DEADLINE.reset(token)
+
+
+@contextmanager
+def deadline_stage(stage: str):
+    token = _STAGE.set(stage)
+    try:
+        yield
+    finally:
+        _STAGE.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _DEADLINE.get()
+
+
+def call_timeout(stage: Optional[str] = None) -> float:
+    """Timeout for the next network call of `stage` (default: the enclosing stage).
+
+    Outside a deadline scope only the stage cap applies. Raises DeadlineExceeded
+    (counted for the stage) when the request deadline has already passed.
+    """
+    stage = stage or _STAGE.get()
+    deadline = _DEADLINE.get() or _DEFAULT_DEADLINE
+    timeout = deadline.timeout_for(stage)
+    if timeout <= 0:
+        STAGE_TIMEOUTS.inc(stage=stage)
+        raise DeadlineExceeded(f"[CritiqueBot] {stage}: 요청 제한 시간 초과")
+    return timeout
+
+
+def stage_cap(stage: Optional[str] = None) -> float:
+    """The per-call cap of `stage` alone; call_timeout() below it means the request deadline cut the call short."""
+    stage = stage or _STAGE.get()
+    deadline = _DEADLINE.get() or _DEFAULT_DEADLINE
+    return deadline.stage_timeouts.get(stage, deadline.stage_timeouts["default"])
+
+
+def record_timeout(stage: Optional[str] = None) -> None:
+    STAGE_TIMEOUTS.inc(stage=stage or _STAGE.get())
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """True for timeouts of any client (TimeoutError, openai.APITimeoutError, httpx/requests Timeout)."""
+    if isinstance(exc, TimeoutError):
+        return True
+    return any("Timeout" in cls.__name__ for cls in type(exc).__mro__)
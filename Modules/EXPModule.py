@@ -1,60 +1,184 @@
+import contextlib
 import csv
+import json
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .utils import SUBMODULE_PROGRESS_LOGGER
+from .CriticModule.StageMemo import StageMemo
+from .Metrics import CACHE_REQUESTS, METRICS
+from .TraceWriter import TraceWriter, trace_context, trace_sink
+from .utils import SUBMODULE_PROGRESS_LOGGER, USAGE_STATS, _SampleBatch, _submit_in_context
+
+LONG_HEADER = ["config", "case_id", "run", "turn", "user", "model", "ref"]
+
+
+_END = object()
+
+
+def _read_ahead(items: Iterable, size: int) -> Iterator:
+    """Iterates `items` on a background thread, keeping at most `size` of them buffered."""
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, int(size)))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fill() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as exc:  # surfaced in the consuming thread
+            put(exc)
+        put(_END)
+
+    threading.Thread(target=fill, name="critiquebot-exp-reader", daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
 
 
 class EXPModule:
-    """Batch runner that replays scripted user turns from CSV."""
+    """Batch runner that replays scripted user turns from CSV (or JSONL)."""
 
     def __init__(self, critic_factory, exp_config: Dict, input_csv: Path, output_csv: Path) -> None:
         self.factory = critic_factory
         self.exp_cfg = exp_config
         self.input_csv = Path(input_csv)
         self.output_csv = Path(output_csv)
+        # (critic config, run key, leading user turns) -> model turns for that prefix, least recently used first
+        self._prefix_cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self.prefix_stats = {"executed": 0, "reused": 0}
+        self._prefix_lock = threading.Lock()
+        self.batch_stats = {"requests": 0, "dispatched": 0}
 
     def run(self) -> None:
-        entries = self._load_inputs()
-        if not entries:
-            print(f"[CritiqueBot] EXPModule: 입력 CSV({self.input_csv})에서 실행할 행을 찾지 못했습니다.")
-            return
+        stream = bool(self.exp_cfg.get("stream"))
+        if stream:
+            if not self.input_csv.exists():
+                raise FileNotFoundError(f"in.csv not found: {self.input_csv}")
+            entries = _read_ahead(self._iter_inputs(), self.exp_cfg.get("read_ahead") or 64)
+            total_cases = None
+        else:
+            entries = self._load_inputs()
+            if not entries:
+                print(f"[CritiqueBot] EXPModule: 입력 CSV({self.input_csv})에서 실행할 행을 찾지 못했습니다.")
+                return
+        self.output_csv.parent.mkdir(parents=True, exist_ok=True)
+        share_prefixes = self._share_prefixes_mode()
+        matrix = self._matrix_configs()
+        USAGE_STATS.reset()
+        report = []
+        trace_writer = self._trace_writer()
+        if not stream:
+            total_cases = sum(self._row_settings(entry)[0] for entry in entries) * (len(matrix) if matrix else 1)
+        SUBMODULE_PROGRESS_LOGGER.start_dashboard(total_cases)
+        try:
+            with trace_writer or contextlib.nullcontext(), trace_sink(trace_writer):
+                if matrix:
+                    stage_memo = StageMemo()
+                    self._run_matrix(entries, matrix, stage_memo, share_prefixes)
+                    report = stage_memo.report_lines()
+                elif stream:
+                    self._run_long(entries, share_prefixes)
+                else:
+                    self._run_wide(entries, share_prefixes)
+        finally:
+            SUBMODULE_PROGRESS_LOGGER.stop_dashboard()
+            if stream:
+                entries.close()
+        if trace_writer is not None:
+            report.append(f"[CritiqueBot] 단계별 trace {trace_writer.records}건 기록: {trace_writer.jsonl_path}")
+        metrics_path = self._output_path(self.exp_cfg.get("metrics"), ".prom")
+        if metrics_path is not None:
+            report.append(f"[CritiqueBot] 메트릭 저장: {METRICS.write(metrics_path)}")
+        report.extend(self._batch_report_lines())
+        for line in USAGE_STATS.report_lines() + self.factory.report_lines() + self._prefix_report_lines() + report:
+            print(line)
+
+    def _output_path(self, option, suffix: str) -> Optional[Path]:
+        """exp_config output option: true -> next to the output CSV with `suffix`, a string -> path (relative to it)."""
+        if not option:
+            return None
+        if option is True:
+            return self.output_csv.with_suffix(suffix)
+        path = Path(option)
+        return path if path.is_absolute() else self.output_csv.parent / path
+
+    def _trace_writer(self) -> Optional[TraceWriter]:
+        jsonl_path = self._output_path(self.exp_cfg.get("trace"), ".trace.jsonl")
+        if jsonl_path is None:
+            return None
+        parquet_path = jsonl_path.with_suffix(".parquet") if self.exp_cfg.get("trace_parquet") else None
+        return TraceWriter(jsonl_path, parquet_path)
+
+    @staticmethod
+    def _config_label(experiment) -> str:
+        if experiment is None:
+            return "default"
+        if isinstance(experiment, str):
+            return experiment
+        return json.dumps(experiment, sort_keys=True, ensure_ascii=False)
+
+    def _row_settings(self, entry) -> Tuple[int, Any]:
+        row_cfg = self.exp_cfg["rows"].get(entry["case_id"]) or self.exp_cfg["rows"].get(entry["alias"], {})
+        runs = row_cfg.get("runs", self.exp_cfg["default_runs"]) or 1
+        row_version = row_cfg.get("version")
+        if row_version is None:
+            row_version = row_cfg.get("experiment")
+        exp_override = row_version if row_version is not None else self.exp_cfg.get("default_version")
+        if exp_override is None:
+            exp_override = self.exp_cfg.get("default_experiment")
+        return runs, exp_override
+
+    def _prefix_key(self, share_prefixes: Optional[str], experiment, run_idx: int) -> Optional[Tuple]:
+        if not share_prefixes:
+            return None
+        run_key = run_idx if share_prefixes == "cases" else 0
+        return (json.dumps(experiment, sort_keys=True, ensure_ascii=False), run_key)
+
+    def _run_wide(self, entries, share_prefixes: Optional[str]) -> None:
+        """One row per (case, run) with user/model/ref columns per turn."""
         max_turns = max(len(entry["turns"]) for entry in entries)
         header = ["case_id", "run"]
         for idx in range(1, max_turns + 1):
             header.append(f"user{idx}")
             header.append(f"model{idx}")
             header.append(f"ref{idx}")
-        self.output_csv.parent.mkdir(parents=True, exist_ok=True)
-        total_rows = len(entries)
         with self.output_csv.open("w", newline="", encoding="utf-8") as f_out:
             writer = csv.writer(f_out)
             writer.writerow(header)
             for row_idx, entry in enumerate(entries, start=1):
                 case_id = entry["case_id"]
-                alias = entry["alias"]
                 user_turns = entry["turns"]
-                row_cfg = self.exp_cfg["rows"].get(case_id) or self.exp_cfg["rows"].get(alias, {})
-                runs = row_cfg.get("runs", self.exp_cfg["default_runs"]) or 1
-                row_version = row_cfg.get("version")
-                if row_version is None:
-                    row_version = row_cfg.get("experiment")
-                exp_override = row_version if row_version is not None else self.exp_cfg.get("default_version")
-                if exp_override is None:
-                    exp_override = self.exp_cfg.get("default_experiment")
-                for run_idx in range(1, runs + 1):
-                    prefix_base = f"[Row {row_idx}/{total_rows} | {case_id} | Run {run_idx}/{runs}"
-                    critic = self.factory.get_or_build(exp_override)
-                    model_turns = self._play_case(critic, list(user_turns), prefix_base)
-                    SUBMODULE_PROGRESS_LOGGER.set_prefix("")
+                runs, exp_override = self._row_settings(entry)
+                prefix_base = f"[{self._row_label(row_idx, entries)} | {case_id}"
+                all_runs = self._play_runs(exp_override, case_id, user_turns, runs, prefix_base, share_prefixes)
+                for run_idx, model_turns in enumerate(all_runs, start=1):
                     row = [case_id, str(run_idx)]
                     for idx in range(max_turns):
                         user_text = user_turns[idx] if idx < len(user_turns) else ""
                         model_entry = model_turns[idx] if idx < len(model_turns) else None
                         if model_entry:
                             model_text = model_entry.get("txt") or ""
-                            refs = model_entry.get("ref") or {}
-                            ref_snippet = "; ".join(f"{title}: {url}" for title, url in refs.items()) if refs else ""
+                            ref_snippet = self._ref_snippet(model_entry.get("ref"))
                         else:
                             model_text = ""
                             ref_snippet = ""
@@ -63,45 +187,219 @@ class EXPModule:
                         row.append(ref_snippet)
                     writer.writerow(row)
 
+    @staticmethod
+    def _row_label(row_idx: int, entries) -> str:
+        return f"Row {row_idx}/{len(entries)}" if isinstance(entries, list) else f"Row {row_idx}"
+
+    def _write_long_rows(self, f_out, writer, label: str, case_id: str, run_idx: int, user_turns, model_turns) -> None:
+        for turn_idx, (user_text, model_entry) in enumerate(zip(user_turns, model_turns), start=1):
+            writer.writerow(
+                [
+                    label,
+                    case_id,
+                    str(run_idx),
+                    str(turn_idx),
+                    user_text,
+                    model_entry.get("txt") or "",
+                    self._ref_snippet(model_entry.get("ref")),
+                ]
+            )
+        f_out.flush()
+
+    def _run_long(self, entries, share_prefixes: Optional[str]) -> None:
+        """Streaming counterpart of _run_wide: one long-format row per (case, run, turn), written as cases finish."""
+        with self.output_csv.open("w", newline="", encoding="utf-8") as f_out:
+            writer = csv.writer(f_out)
+            writer.writerow(LONG_HEADER)
+            f_out.flush()
+            for row_idx, entry in enumerate(entries, start=1):
+                case_id = entry["case_id"]
+                user_turns = entry["turns"]
+                runs, exp_override = self._row_settings(entry)
+                label = self._config_label(exp_override)
+                prefix_base = f"[{self._row_label(row_idx, entries)} | {case_id}"
+                all_runs = self._play_runs(exp_override, case_id, user_turns, runs, prefix_base, share_prefixes)
+                for run_idx, model_turns in enumerate(all_runs, start=1):
+                    self._write_long_rows(f_out, writer, label, case_id, run_idx, user_turns, model_turns)
+
+    def _play_runs(self, experiment, case_id: str, user_turns, runs: int, prefix_base: str, share_prefixes):
+        """Model turns of every run of a case; with batch_runs the runs play side by side in one _SampleBatch."""
+
+        def play(run_idx: int) -> List[Dict[str, Any]]:
+            critic = self.factory.get_or_build(experiment)
+            prefix_key = self._prefix_key(share_prefixes, experiment, run_idx)
+            with trace_context(config=self._config_label(experiment), case_id=case_id, run=run_idx):
+                model_turns = self._play_case(critic, list(user_turns), f"{prefix_base} | Run {run_idx}/{runs}", prefix_key)
+            SUBMODULE_PROGRESS_LOGGER.case_done()
+            return model_turns
+
+        # With share_prefixes "all" later runs fork the first one, so there is nothing to batch.
+        if not self.exp_cfg.get("batch_runs") or runs < 2 or share_prefixes == "all":
+            return [play(run_idx) for run_idx in range(1, runs + 1)]
+        batch = _SampleBatch(runs)
+
+        def member(run_idx: int) -> List[Dict[str, Any]]:
+            with batch.member(run_idx):
+                return play(run_idx)
+
+        with ThreadPoolExecutor(max_workers=runs, thread_name_prefix="critiquebot-run") as pool:
+            futures = [_submit_in_context(pool, member, run_idx) for run_idx in range(1, runs + 1)]
+            results = [future.result() for future in futures]
+        for key, value in batch.stats.items():
+            self.batch_stats[key] += value
+        return results
+
+    def _batch_report_lines(self) -> List[str]:
+        requests, dispatched = self.batch_stats["requests"], self.batch_stats["dispatched"]
+        if not requests:
+            return []
+        return [
+            f"[CritiqueBot] run 묶음 실행: 모델/검색 호출 {requests}회를 {dispatched}회로 발송 "
+            f"({(requests - dispatched) / requests * 100:.1f}% 절감)"
+        ]
+
+    def _run_matrix(self, entries, matrix: Dict[str, Any], stage_memo: StageMemo, share_prefixes: Optional[str]) -> None:
+        """Every matrix config per (case, run); one long-format row per (config, case, run, turn).
+
+        Critics are built around a shared StageMemo, so stages whose module spec
+        and inputs match across configs are computed once per (case, run).
+        """
+        with self.output_csv.open("w", newline="", encoding="utf-8") as f_out:
+            writer = csv.writer(f_out)
+            writer.writerow(LONG_HEADER)
+            for row_idx, entry in enumerate(entries, start=1):
+                case_id = entry["case_id"]
+                user_turns = entry["turns"]
+                runs, _ = self._row_settings(entry)
+                for run_idx in range(1, runs + 1):
+                    for label, experiment in matrix.items():
+                        prefix_base = (
+                            f"[{self._row_label(row_idx, entries)} | {case_id} | Run {run_idx}/{runs} | {label}"
+                        )
+                        critic = self.factory.get_or_build(experiment, stage_memo=stage_memo)
+                        prefix_key = self._prefix_key(share_prefixes, experiment, run_idx)
+                        with stage_memo.scope(case_id, run_idx), trace_context(
+                            config=label, case_id=case_id, run=run_idx
+                        ):
+                            model_turns = self._play_case(critic, list(user_turns), prefix_base, prefix_key)
+                        SUBMODULE_PROGRESS_LOGGER.case_done()
+                        self._write_long_rows(f_out, writer, label, case_id, run_idx, user_turns, model_turns)
+                    stage_memo.drop_scope(case_id, run_idx)
+
+    def _matrix_configs(self) -> Optional[Dict[str, Any]]:
+        matrix = self.exp_cfg.get("matrix")
+        if not matrix:
+            return None
+        if isinstance(matrix, dict):
+            return dict(matrix)
+        if isinstance(matrix, list):
+            labeled = {}
+            for idx, experiment in enumerate(matrix, start=1):
+                label = experiment if isinstance(experiment, str) else f"config{idx}"
+                labeled[label] = experiment
+            return labeled
+        raise ValueError("[CritiqueBot] matrix는 {라벨: 실험 설정} 또는 실험 설정 목록이어야 합니다.")
+
+    @staticmethod
+    def _ref_snippet(refs) -> str:
+        return "; ".join(f"{title}: {url}" for title, url in refs.items()) if refs else ""
+
+    def _share_prefixes_mode(self) -> Optional[str]:
+        mode = self.exp_cfg.get("share_prefixes")
+        if mode in (None, False, "", "none"):
+            return None
+        if mode in (True, "cases"):
+            return "cases"
+        if mode == "all":
+            return "all"
+        raise ValueError(f"[CritiqueBot] share_prefixes 값이 올바르지 않습니다: {mode!r} (false, true, \"cases\", \"all\")")
+
+    def _prefix_report_lines(self) -> List[str]:
+        executed, reused = self.prefix_stats["executed"], self.prefix_stats["reused"]
+        if not reused:
+            return []
+        total = executed + reused
+        return [f"[CritiqueBot] 공유 prefix: 전체 {total}턴 중 {reused}턴 재사용 ({reused / total * 100:.1f}%), {executed}턴 실행"]
+
     def _load_inputs(self) -> List[Dict[str, List[str]]]:
-        path = self.input_csv
-        if not path.exists():
-            raise FileNotFoundError(f"in.csv not found: {path}")
-        entries: List[Dict[str, List[str]]] = []
-        with path.open("r", encoding="utf-8") as f_in:
+        if not self.input_csv.exists():
+            raise FileNotFoundError(f"in.csv not found: {self.input_csv}")
+        return list(self._iter_inputs())
+
+    def _iter_inputs(self) -> Iterator[Dict[str, Any]]:
+        """Cases from the input file, one at a time: CSV rows (case_id, turn1, turn2, ...) or JSONL objects
+        ({"case_id": ..., "turns": [...]})."""
+        with self.input_csv.open("r", encoding="utf-8") as f_in:
+            if self.input_csv.suffix == ".jsonl":
+                for idx, line in enumerate(f_in, start=1):
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    turns = data.get("turns") or []
+                    if isinstance(turns, str):
+                        turns = [turns]
+                    turns = [str(turn).strip() for turn in turns if str(turn).strip()]
+                    case_id = str(data.get("case_id") or data.get("id") or f"row{idx}")
+                    yield {"case_id": case_id, "alias": f"row{idx}", "turns": turns}
+                return
             reader = csv.reader(f_in)
-            all_rows = list(reader)
-        if self.exp_cfg.get("has_header") and all_rows:
-            all_rows = all_rows[1:]
-        for idx, row in enumerate(all_rows, start=1):
-            raw_cells = [cell.strip() for cell in row]
-            if not any(raw_cells):
-                continue
-            case_id = raw_cells[0] or f"row{idx}"
-            turns = [cell for cell in raw_cells[1:] if cell]
-            entries.append({"case_id": case_id, "alias": f"row{idx}", "turns": turns})
-        return entries
+            if self.exp_cfg.get("has_header"):
+                next(reader, None)
+            for idx, row in enumerate(reader, start=1):
+                raw_cells = [cell.strip() for cell in row]
+                if not any(raw_cells):
+                    continue
+                case_id = raw_cells[0] or f"row{idx}"
+                turns = [cell for cell in raw_cells[1:] if cell]
+                yield {"case_id": case_id, "alias": f"row{idx}", "turns": turns}
+
+    def _cached_prefix(self, prefix_key: Tuple, user_turns: List[str]) -> List[Dict[str, Any]]:
+        with self._prefix_lock:
+            for depth in range(len(user_turns), 0, -1):
+                key = (*prefix_key, tuple(user_turns[:depth]))
+                cached = self._prefix_cache.get(key)
+                if cached is not None:
+                    self._prefix_cache.move_to_end(key)
+                    self.prefix_stats["reused"] += len(cached)
+                    return list(cached)
+        return []
 
-    def _play_case(self, critic, user_turns: List[str], prefix_base: str) -> List[str]:
+    def _store_prefix(self, key: Tuple, model_turns: List[Dict[str, Any]]) -> None:
+        with self._prefix_lock:
+            self._prefix_cache[key] = list(model_turns)
+            self._prefix_cache.move_to_end(key)
+            self.prefix_stats["executed"] += 1
+            while len(self._prefix_cache) > max(1, int(self.exp_cfg.get("prefix_cache_size") or 10000)):
+                self._prefix_cache.popitem(last=False)
+
+    def _play_case(
+        self, critic, user_turns: List[str], prefix_base: str, prefix_key: Optional[Tuple] = None
+    ) -> List[Dict[str, Any]]:
+        """Plays the user turns; with a prefix_key, the longest already played prefix is forked instead of replayed."""
         history = []
         model_turns: List[Dict[str, Any]] = []
+        if prefix_key is not None:
+            model_turns = self._cached_prefix(prefix_key, user_turns)
+            for user_text, model_entry in zip(user_turns, model_turns):
+                history.append({"role": "user", "content": user_text})
+                history.append({"role": "assistant", "content": model_entry["txt"]})
+            CACHE_REQUESTS.inc(len(model_turns), cache="exp_prefix", result="hit")
         total_turns = len(user_turns)
-        for turn_idx, user_text in enumerate(user_turns, start=1):
+        for turn_idx, user_text in enumerate(user_turns[len(model_turns):], start=len(model_turns) + 1):
             turn_prefix = f"{prefix_base} | Turn {turn_idx}/{total_turns}]"
-            SUBMODULE_PROGRESS_LOGGER.set_prefix(turn_prefix)
-            SUBMODULE_PROGRESS_LOGGER.set_single_line_mode(True)
             history.append({"role": "user", "content": user_text})
-            try:
+            with SUBMODULE_PROGRESS_LOGGER.task(turn_prefix, single_line=True), trace_context(turn=turn_idx):
                 rsp = critic.call(history)
-                refs = {}
-                if isinstance(rsp, dict):
-                    assistant_text = rsp.get("txt") or ""
-                    refs = rsp.get("ref") or {}
-                else:
-                    assistant_text = str(rsp)
-                model_turns.append({"txt": assistant_text, "ref": refs})
-                history.append({"role": "assistant", "content": assistant_text})
-            finally:
-                SUBMODULE_PROGRESS_LOGGER.end_line()
-                SUBMODULE_PROGRESS_LOGGER.set_single_line_mode(False)
+            refs = {}
+            if isinstance(rsp, dict):
+                assistant_text = rsp.get("txt") or ""
+                refs = rsp.get("ref") or {}
+            else:
+                assistant_text = str(rsp)
+            model_turns.append({"txt": assistant_text, "ref": refs})
+            history.append({"role": "assistant", "content": assistant_text})
+            SUBMODULE_PROGRESS_LOGGER.turn_done()
+            if prefix_key is not None:
+                self._store_prefix((*prefix_key, tuple(user_turns[:turn_idx])), model_turns)
+                CACHE_REQUESTS.inc(cache="exp_prefix", result="miss")
         return model_turns
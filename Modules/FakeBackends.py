@@ -0,0 +1,247 @@
+"""Offline stand-ins for the OpenAI and Tavily clients (used by bench.py).
+
+Responses follow the JSON schemas the submodules request, latencies are sampled
+and slept (scaled by `time_scale`), and token usage is reported like the real API.
+Rebuttal quality is hidden in the candidate text as a ⟦score⟧ marker so the fake
+judge can score it consistently.
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+_QUALITY_MARKER = re.compile(r"⟦(\d+(?:\.\d+)?)⟧")
+
+DEFAULT_MODEL_LATENCY_S = {
+    "gpt-4o-mini": 2.0,
+    "gpt-5-chat-latest": 4.0,
+    "gpt-5": 9.0,
+}
+
+
+class FakeLatency:
+    """Log-normal latency with an optional Pareto tail for outliers."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        sigma: float = 0.35,
+        tail_prob: float = 0.0,
+        tail_scale: float = 8.0,
+        time_scale: float = 0.01,
+    ) -> None:
+        self.rng = rng
+        self._lock = threading.Lock()
+        self.sigma = sigma
+        self.tail_prob = tail_prob
+        self.tail_scale = tail_scale
+        self.time_scale = time_scale
+
+    def sample(self, median_s: float) -> float:
+        with self._lock:
+            value = median_s * self.rng.lognormvariate(0.0, self.sigma)
+            if self.tail_prob and self.rng.random() < self.tail_prob:
+                value *= self.tail_scale * self.rng.paretovariate(1.5)
+        return value
+
+    def sleep(self, simulated_s: float) -> None:
+        time.sleep(simulated_s * self.time_scale)
+
+    def times_out(self, simulated_s: float, timeout: Any) -> bool:
+        """Client timeouts are wall-clock seconds, like the real SDKs'."""
+        return timeout is not None and simulated_s * self.time_scale > timeout
+
+
+class _FakeCompletions:
+    def __init__(self, owner: "FakeOpenAIClient") -> None:
+        self.owner = owner
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        return self.owner._create(model, messages, **kwargs)
+
+
+class FakeOpenAIClient:
+    def __init__(
+        self,
+        seed: int = 0,
+        base_quality: float = 86.0,
+        grad_bonus: float = 3.0,
+        quality_sd: float = 4.0,
+        judge_noise_sd: float = 1.5,
+        latency: Optional[FakeLatency] = None,
+        model_latency_s: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.base_quality = base_quality
+        self.grad_bonus = grad_bonus
+        self.quality_sd = quality_sd
+        self.judge_noise_sd = judge_noise_sd
+        self.latency = latency or FakeLatency(random.Random(seed + 1))
+        self.model_latency_s = dict(DEFAULT_MODEL_LATENCY_S)
+        self.model_latency_s.update(model_latency_s or {})
+        self._last_prompt_by_system: Dict[str, str] = {}
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self))
+
+    def _gauss(self, mu: float, sd: float) -> float:
+        with self._lock:
+            return self.rng.gauss(mu, sd)
+
+    def _create(self, model, messages, response_format=None, n=1, timeout=None, **_):
+        system = messages[0]["content"]
+        prompt = messages[-1]["content"]
+        schema_name = ((response_format or {}).get("json_schema") or {}).get("name")
+        n = max(1, int(n or 1))
+        latency_s = self.latency.sample(self.model_latency_s.get(model, 3.0))
+        if self.latency.times_out(latency_s, timeout):
+            time.sleep(timeout)
+            raise TimeoutError(f"fake {model} request timed out after {timeout:.3f}s")
+        self.latency.sleep(latency_s)
+        contents = [self._respond(schema_name, prompt) for _ in range(n)]
+        with self._lock:
+            self.calls += 1
+            cached = self._cached_prefix_tokens(system, prompt)
+        usage = SimpleNamespace(
+            prompt_tokens=len(system + prompt) // 2,
+            completion_tokens=sum(len(c) // 2 for c in contents),
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        )
+        choices = [
+            SimpleNamespace(index=i, message=SimpleNamespace(content=c)) for i, c in enumerate(contents)
+        ]
+        return SimpleNamespace(choices=choices, usage=usage, model=model)
+
+    def _cached_prefix_tokens(self, system: str, prompt: str) -> int:
+        previous = self._last_prompt_by_system.get(system, "")
+        self._last_prompt_by_system[system] = prompt
+        common = 0
+        for a, b in zip(previous, prompt):
+            if a != b:
+                break
+            common += 1
+        tokens = (len(system) + common) // 2
+        # Providers cache in 128-token blocks once the prefix reaches 1024 tokens.
+        return tokens // 128 * 128 if tokens >= 1024 else 0
+
+    def _respond(self, schema_name: Optional[str], prompt: str) -> str:
+        if schema_name == "judge_scores" or "total_score" in prompt:
+            marker = _QUALITY_MARKER.search(prompt)
+            quality = float(marker.group(1)) if marker else self.base_quality
+            total = max(0.0, min(100.0, round(self._gauss(quality, self.judge_noise_sd))))
+            per_metric = total / 4
+            return json.dumps(
+                {
+                    "scores": {
+                        "context_alignment": per_metric,
+                        "evidence_quality": per_metric,
+                        "civility": per_metric,
+                        "actionability": per_metric,
+                    },
+                    "total_score": total,
+                    "feedback": "근거의 출처를 더 구체적으로 제시하세요.",
+                },
+                ensure_ascii=False,
+            )
+        if schema_name == "textgrad" or "summarizer_grad" in prompt:
+            return json.dumps(
+                {"summarizer_grad": ["쟁점을 더 분명히 정리하세요."], "rebuttal_grad": ["통계 출처를 명시하세요."]},
+                ensure_ascii=False,
+            )
+        if schema_name == "search_queries" or '"queries"' in prompt:
+            topic = " ".join(_first_user_line(prompt).split()[:3])
+            # The third query paraphrases the first, as models often do.
+            return json.dumps(
+                {
+                    "queries": [
+                        f"{topic} 통계 추이",
+                        f"{topic} 해외 도입 사례",
+                        f"통계로 본 {topic} 추이",
+                        f"{topic} 전문가 평가",
+                        f"{topic} 반대 근거",
+                    ]
+                },
+                ensure_ascii=False,
+            )
+        if schema_name == "rebuttal" or '"rebuttal"' in prompt:
+            bonus = self.grad_bonus if "[개선 지시]" in prompt else 0.0
+            quality = self._gauss(self.base_quality + bonus, self.quality_sd)
+            urls = re.findall(r"URL: (\S+)", prompt)
+            refs = [{"title": f"출처 {i + 1}", "url": url} for i, url in enumerate(urls[:2])]
+            return json.dumps(
+                {
+                    "rebuttal": f"말씀하신 점도 일리가 있어요. 다만 공개된 통계를 보면 다른 해석이 가능합니다. ⟦{quality:.1f}⟧",
+                    "references": refs,
+                },
+                ensure_ascii=False,
+            )
+        return "- 사용자는 정책 변경을 주장함\n- 근거는 부작용에 대한 우려임"
+
+
+def _first_user_line(prompt: str) -> str:
+    for line in prompt.splitlines():
+        if line.startswith("User: "):
+            return line[len("User: "):][:40]
+    return "주장"
+
+
+class FakeTavilyClient:
+    """Search stand-in; `advanced` depth is slower, costs 2 credits and ranks better."""
+
+    CREDITS = {"basic": 1, "advanced": 2}
+    LATENCY_S = {"basic": 0.8, "advanced": 2.5}
+
+    def __init__(self, seed: int = 0, latency: Optional[FakeLatency] = None, weak_query_prob: float = 0.3) -> None:
+        self._lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.latency = latency or FakeLatency(random.Random(seed + 2))
+        self.weak_query_prob = weak_query_prob
+        self.calls: Dict[str, int] = {"basic": 0, "advanced": 0}
+        self.credits = 0
+        self.simulated_s = 0.0
+        # Outage simulation: while down every search hangs until the client timeout (or down_hang_s) and fails.
+        self.down = False
+        self.down_hang_s = 30.0
+        self.failed = 0
+
+    def search(self, query: str, search_depth: str = "basic", max_results: int = 5, timeout: Any = None, **_):
+        depth = search_depth if search_depth in self.CREDITS else "basic"
+        if self.down:
+            with self._lock:
+                self.failed += 1
+            if self.latency.times_out(self.down_hang_s, timeout):
+                time.sleep(timeout)
+                raise TimeoutError(f"fake tavily search timed out after {timeout:.3f}s")
+            self.latency.sleep(self.down_hang_s)
+            raise ConnectionError("fake tavily is down")
+        latency_s = self.latency.sample(self.LATENCY_S[depth])
+        if self.latency.times_out(latency_s, timeout):
+            time.sleep(timeout)
+            raise TimeoutError(f"fake tavily search timed out after {timeout:.3f}s")
+        self.latency.sleep(latency_s)
+        with self._lock:
+            self.calls[depth] += 1
+            self.credits += self.CREDITS[depth]
+            self.simulated_s += latency_s
+            weak = depth == "basic" and self.rng.random() < self.weak_query_prob
+            count = self.rng.randint(0, 1) if weak else max_results
+        results = []
+        for idx in range(count):
+            slug = zlib.crc32(f"{query}|{idx}".encode("utf-8")) % 10_000
+            results.append(
+                {
+                    "title": f"{query} 관련 자료 {idx + 1}",
+                    "url": f"https://example.org/{depth}/{slug}",
+                    "content": (
+                        f"{query}에 대한 공공 통계가 공개되어 있다. "
+                        "최근 5년간 지표는 완만하게 변화했다. "
+                        "전문가들은 정책 효과를 두고 의견이 엇갈린다."
+                    ),
+                    "score": 0.35 if weak else 0.75 + 0.05 * (depth == "advanced"),
+                }
+            )
+        return {"query": query, "results": results}
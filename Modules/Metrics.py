@@ -0,0 +1,240 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS_S = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+LOOP_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"[CritiqueBot] {self.name} 라벨은 {self.labelnames} 이어야 합니다: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS_S
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels -> [per-bucket counts..., sum, count]
+        self._series: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[idx] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide counters/gauges/histograms rendered in the Prometheus text format.
+
+    Exposed over HTTP with serve() (CLI/Streamlit deployments) and written to a
+    file with write() at the end of EXP runs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS_S
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Starts (once per process) a background HTTP server answering GET /metrics."""
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            registry = self
+
+            class _Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/metrics", "/"):
+                        self.send_error(404)
+                        return
+                    body = registry.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((host, int(port)), _Handler)
+            threading.Thread(target=self._server.serve_forever, name="critiquebot-metrics", daemon=True).start()
+            print(f"[CritiqueBot] 메트릭 엔드포인트: http://{host}:{self._server.server_port}/metrics")
+            return self._server
+
+
+METRICS = MetricsRegistry()
+
+LLM_CALLS = METRICS.counter(
+    "critiquebot_llm_calls_total", "Chat completion calls by submodule, model and status.", ("module", "model", "status")
+)
+LLM_LATENCY = METRICS.histogram(
+    "critiquebot_llm_call_duration_seconds", "Chat completion latency.", ("module", "model")
+)
+LLM_TOKENS = METRICS.counter(
+    "critiquebot_llm_tokens_total", "Tokens by submodule, model and kind (prompt, cached, completion).",
+    ("module", "model", "kind"),
+)
+LLM_HEDGES = METRICS.counter(
+    "critiquebot_llm_hedges_total", "Hedged chat completions by outcome (won: duplicate answered first, lost, failed).",
+    ("module", "model", "outcome"),
+)
+LLM_HEDGE_WASTED_TOKENS = METRICS.counter(
+    "critiquebot_llm_hedge_wasted_tokens_total", "Tokens of hedge losers that had already been sent.", ("module", "model")
+)
+PARSE_FAILURES = METRICS.counter(
+    "critiquebot_parse_failures_total",
+    "Structured outputs that did not parse, by submodule and whether the repair retry fixed them (true, false).",
+    ("module", "repaired"),
+)
+TAVILY_CALLS = METRICS.counter("critiquebot_tavily_calls_total", "Tavily searches by depth and status.", ("depth", "status"))
+TAVILY_LATENCY = METRICS.histogram("critiquebot_tavily_call_duration_seconds", "Tavily search latency.", ("depth",))
+CACHE_REQUESTS = METRICS.counter(
+    "critiquebot_cache_requests_total", "Lookups of internal caches by cache and result (hit, miss).", ("cache", "result")
+)
+JUDGE_VERDICTS = METRICS.counter(
+    "critiquebot_judge_verdicts_total", "Judged rebuttals by result (pass, fail, prejudge_fail).", ("result",)
+)
+LOOPS_PER_TURN = METRICS.histogram(
+    "critiquebot_loops_per_turn", "Refinement loops (rounds for best-of-N) per turn.", ("critic", "stop_reason"), LOOP_BUCKETS
+)
+STAGE_LATENCY = METRICS.histogram("critiquebot_stage_duration_seconds", "Critic stage latency.", ("stage",))
+STAGE_TOKENS = METRICS.counter("critiquebot_stage_tokens_total", "Tokens spent per critic stage.", ("stage",))
@@ -0,0 +1,174 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+from .Metrics import CACHE_REQUESTS
+from .utils import _test_mode_print
+
+# Words that show up when a model puts prose instead of a link into the url field.
+_NON_URL_MARKERS = ("대화", "요약", "히스토리", "반박", "주장", "근거", "없음", "정보", "내용", "결과", "검색")
+# Servers that reject HEAD often answer with one of these; retry with a GET.
+_HEAD_FALLBACK_STATUS = {400, 403, 405, 501}
+
+
+def normalize_url(url) -> Optional[str]:
+    """Syntactic clean-up of a reference URL; None when it cannot be a web link."""
+    url = str(url or "").strip()
+    if not url or any(marker in url.lower() for marker in _NON_URL_MARKERS):
+        return None
+    has_protocol = url.startswith(("http://", "https://"))
+    if not has_protocol:
+        if "." not in url or url.startswith("/"):
+            return None
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    host = parsed.hostname or ""
+    if "." not in host and host != "localhost":
+        return None
+    return url
+
+
+class ReferenceValidator:
+    """Checks whether reference URLs resolve.
+
+    All URLs of a rebuttal are checked in one concurrent batch (HEAD, GET
+    fallback) on a bounded worker pool, and verdicts are cached per URL with a
+    TTL, so a turn never waits for more than one parallel round-trip and
+    re-rendering the same references costs nothing. Timed-out (unknown)
+    verdicts are cached for a short TTL so a slow server is not re-probed for
+    the rest of the turn.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = 3.0,
+        max_workers: int = 8,
+        ttl_s: float = 3600.0,
+        negative_ttl_s: float = 300.0,
+        unknown_ttl_s: float = 60.0,
+        user_agent: str = "CritiqueBot-RefCheck/1.0",
+    ) -> None:
+        self.timeout_s = timeout_s
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.unknown_ttl_s = unknown_ttl_s
+        self.user_agent = user_agent
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refcheck")
+        self._lock = threading.Lock()
+        self._cache: Dict[str, tuple] = {}
+        self.stats = {"checked": 0, "cache_hits": 0, "dead": 0, "unknown": 0}
+
+    def _lookup(self, url: str) -> Tuple[bool, Optional[bool]]:
+        """(hit, verdict); a hit with verdict None is a recent timeout."""
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return False, None
+            verdict, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._cache[url]
+                return False, None
+            return True, verdict
+
+    def cached_verdict(self, url: str) -> Optional[bool]:
+        return self._lookup(url)[1]
+
+    def _store(self, url: str, verdict: Optional[bool]) -> None:
+        if verdict is None:
+            ttl = self.unknown_ttl_s
+        else:
+            ttl = self.ttl_s if verdict else self.negative_ttl_s
+        with self._lock:
+            self._cache[url] = (verdict, time.monotonic() + ttl)
+
+    def _request(self, url: str, method: str, timeout: float) -> int:
+        headers = {"User-Agent": self.user_agent}
+        if method == "GET":
+            headers["Range"] = "bytes=0-0"
+        req = urllib.request.Request(url, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as rsp:
+                return rsp.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+
+    def _check(self, url: str, deadline: float) -> Optional[bool]:
+        try:
+            status = self._request(url, "HEAD", self.timeout_s)
+            if status in _HEAD_FALLBACK_STATUS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return status < 400
+                status = self._request(url, "GET", min(self.timeout_s, remaining))
+        except Exception as exc:
+            if isinstance(exc, TimeoutError) or isinstance(getattr(exc, "reason", None), TimeoutError):
+                # A slow server is not a hallucinated link; leave it unknown.
+                return None
+            _test_mode_print(f"[CritiqueBot] 참조 URL 확인 실패: {url} ({exc})")
+            return False
+        return 200 <= status < 400
+
+    def validate(self, urls: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Verdict per URL: True/False, or None when it timed out (cached for unknown_ttl_s)."""
+        verdicts: Dict[str, Optional[bool]] = {}
+        pending = []
+        for url in dict.fromkeys(u for u in urls if u):
+            hit, cached = self._lookup(url)
+            if hit:
+                verdicts[url] = cached
+            else:
+                pending.append(url)
+        with self._lock:
+            self.stats["cache_hits"] += len(verdicts)
+        CACHE_REQUESTS.inc(len(verdicts), cache="reference_url", result="hit")
+        CACHE_REQUESTS.inc(len(pending), cache="reference_url", result="miss")
+        if not pending:
+            return verdicts
+        # HEAD + GET fallback must fit in one round-trip budget for the whole batch.
+        deadline = time.monotonic() + self.timeout_s * 2
+        futures = {self._pool.submit(self._check, url, deadline): url for url in pending}
+        done, _ = wait(futures, timeout=self.timeout_s * 2 + 0.5)
+        for future, url in futures.items():
+            verdicts[url] = future.result() if future in done else None
+            self._store(url, verdicts[url])
+        with self._lock:
+            self.stats["checked"] += len(pending)
+            self.stats["dead"] += sum(1 for url in pending if verdicts[url] is False)
+            self.stats["unknown"] += sum(1 for url in pending if verdicts[url] is None)
+        return verdicts
+
+    def filter_refs(self, refs: Dict[str, str], network: bool = True) -> Dict[str, str]:
+        """Normalized refs without dead links.
+
+        With network=False only cached verdicts are used (for re-rendering).
+        Unknown verdicts keep the link.
+        """
+        normalized = {}
+        for title, url in (refs or {}).items():
+            clean = normalize_url(url)
+            if clean:
+                normalized[str(title or "제목 없음")] = clean
+        if network:
+            verdicts = self.validate(normalized.values())
+        else:
+            verdicts = {url: self.cached_verdict(url) for url in normalized.values()}
+        return {title: url for title, url in normalized.items() if verdicts.get(url) is not False}
+
+    def report_lines(self):
+        with self._lock:
+            stats = dict(self.stats)
+        if not stats["checked"] and not stats["cache_hits"]:
+            return []
+        return [
+            f"[CritiqueBot] 참조 URL 검증: {stats['checked']}건 확인 (캐시 적중 {stats['cache_hits']}건), "
+            f"접속 불가 {stats['dead']}건, 시간 초과 {stats['unknown']}건"
+        ]
+
+
+REFERENCE_VALIDATOR = ReferenceValidator()
@@ -1,5 +1,9 @@
+import html
+
 import streamlit as st
 
+from .ReferenceValidator import REFERENCE_VALIDATOR
+
 
 class StreamlitModule:
     def __init__(self, critic_module, evaluation_module=None):
@@ -74,54 +78,15 @@ class StreamlitModule:
                                         ref_items.append(item)
                         
                         if ref_items:
-                            valid_refs = []
-                            for title, url in ref_items:
-                                if not title:
-                                    title = "제목 없음"
-                                if not url:
-                                    continue
-                                
-                                url = str(url).strip()
-                                if not url:
-                                    continue
-                                
-                                # Filter out common non-URL patterns
-                                invalid_patterns = [
-                                    "대화", "요약", "히스토리", "반박", "주장", "근거",
-                                    "없음", "정보", "내용", "결과", "검색"
-                                ]
-                                url_lower = url.lower()
-                                if any(pattern in url_lower for pattern in invalid_patterns):
-                                    continue
-                                
-                                # Check if it looks like a URL
-                                has_domain = "." in url and not url.startswith("/")
-                                has_protocol = url.startswith(("http://", "https://"))
-                                
-                                if not has_domain and not has_protocol:
-                                    continue
-                                
-                                # Add protocol if missing
-                                if has_domain and not has_protocol:
-                                    url = f"https://{url}"
-                                
-                                # Validate URL format
-                                from urllib.parse import urlparse
-                                try:
-                                    parsed = urlparse(url)
-                                    if not parsed.scheme or not parsed.netloc:
-                                        continue
-                                    if "." not in parsed.netloc:
-                                        continue
-                                    valid_refs.append((title, url))
-                                except Exception:
-                                    continue
-                            
+                            # Verdicts were fetched once when the turn was produced; re-rendering only reads the cache.
+                            valid_refs = list(
+                                REFERENCE_VALIDATOR.filter_refs(dict(ref_items), network=False).items()
+                            )
+
                             # Display only valid references
                             if valid_refs:
                                 st.markdown("**🔗 참조 링크:**")
                                 for title, url in valid_refs:
-                                    import html
                                     escaped_url = html.escape(url)
                                     escaped_title = html.escape(str(title))
                                     
@@ -216,6 +181,9 @@ class StreamlitModule:
                     refs = refs_dict
                 else:
                     refs = {}
+            # A validating critic already probed these; only read its cached verdicts then.
+            network = not getattr(self.cm, "validate_refs", False)
+            refs = REFERENCE_VALIDATOR.filter_refs(refs, network=network)
             
             st.session_state.history.append({
                 "role": "assistant",
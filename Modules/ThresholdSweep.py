@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from .utils import ensure_packages
+
+ensure_packages(["numpy", "pandas"])
+
+import numpy as np
+import pandas as pd
+
+_TURN_KEYS = ["source", "config", "case_id", "run", "turn"]
+
+
+class ThresholdSweep:
+    """Replays a recorded run (critic option record_loops + EXP trace) for any pass_threshold / max_loop.
+
+    For every turn the recorded loops hold the candidate, its judge score and
+    the cumulative time/tokens after judging it. With threshold T and limit L
+    the critic would have returned the first loop <= L scoring >= T (cost up
+    to that loop), otherwise the best-scoring loop <= L (cost up to loop L).
+    Turns after the first are conditioned on the recorded history, so for
+    multi-turn cases only turn 1 is exact.
+    """
+
+    def __init__(self, inputs: List[str], thresholds: Sequence[float], max_loops: Sequence[int], report_path=None) -> None:
+        self.inputs = [Path(p) for p in inputs]
+        self.thresholds = [float(t) for t in thresholds]
+        self.max_loops = [int(n) for n in max_loops]
+        self.report_path = Path(report_path) if report_path else None
+
+    def _load_candidates(self) -> pd.DataFrame:
+        frames = []
+        for path in self.inputs:
+            if path.suffix == ".parquet":
+                ensure_packages(["pyarrow"])
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_json(path, lines=True, dtype=False)
+            df = df[df["stage"] == "candidate"].copy()
+            df["source"] = path.name
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        df["score"] = pd.to_numeric(df["score"], errors="coerce")
+        # Loops without a score (pre-judge rejects) can neither pass nor win.
+        df["rank_score"] = df["score"].fillna(-np.inf)
+        return df.sort_values(_TURN_KEYS + ["loop"]).reset_index(drop=True)
+
+    def simulate(self, candidates: pd.DataFrame, threshold: float, max_loop: int) -> pd.DataFrame:
+        """One row per turn: returned score, pass flag, loops spent and cumulative cost."""
+        window = candidates[candidates["loop"] <= max_loop]
+        grouped = window.groupby(_TURN_KEYS, sort=False)
+        last = window.loc[grouped["loop"].idxmax()].set_index(_TURN_KEYS)
+        # Ties keep the earliest loop, matching LoopController (only a strictly higher score replaces).
+        best = window.loc[grouped["rank_score"].idxmax()].set_index(_TURN_KEYS)
+        passing = window[window["score"] >= threshold]
+        first_pass = passing.loc[passing.groupby(_TURN_KEYS, sort=False)["loop"].idxmin()].set_index(_TURN_KEYS)
+
+        outcome = pd.DataFrame(index=last.index)
+        outcome["passed"] = outcome.index.isin(first_pass.index)
+        passed = outcome["passed"]
+        outcome["score"] = first_pass["score"].reindex(outcome.index).where(passed, best["score"])
+        for column, spent in (("loops_spent", "loop"), ("duration_ms", "duration_ms"), ("total_tokens", "total_tokens")):
+            outcome[column] = first_pass[spent].reindex(outcome.index).where(passed, last[spent])
+        return outcome.reset_index()
+
+    def run(self) -> Dict[str, Any]:
+        candidates = self._load_candidates()
+        if candidates.empty:
+            print(
+                "[CritiqueBot] sweep: candidate 레코드가 없습니다. "
+                "critic 옵션 record_loops와 exp_config trace를 켠 EXP 결과를 지정하세요."
+            )
+            return {}
+        recorded_max = int(candidates["loop"].max())
+        rows = []
+        for threshold in self.thresholds:
+            for max_loop in self.max_loops:
+                if max_loop > recorded_max:
+                    continue
+                outcome = self.simulate(candidates, threshold, max_loop)
+                rows.append(
+                    {
+                        "threshold": threshold,
+                        "max_loop": max_loop,
+                        "turns": len(outcome),
+                        "pass_rate": outcome["passed"].mean() * 100,
+                        "score_mean": outcome["score"].mean(),
+                        "loops_mean": outcome["loops_spent"].mean(),
+                        "tokens_mean": outcome["total_tokens"].mean(),
+                        "latency_p50_s": outcome["duration_ms"].quantile(0.5) / 1000,
+                        "latency_p95_s": outcome["duration_ms"].quantile(0.95) / 1000,
+                    }
+                )
+        table = pd.DataFrame(rows)
+        print(f"\n[CritiqueBot] 임계값/max_loop 시뮬레이션 (기록된 최대 루프 {recorded_max}, 턴 {len(candidates.groupby(_TURN_KEYS))}개)")
+        print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+        report = {"recorded_max_loop": recorded_max, "grid": table.round(3).to_dict(orient="records")}
+        if self.report_path:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"[CritiqueBot] sweep 리포트 저장: {self.report_path}")
+        return report
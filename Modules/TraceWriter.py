@@ -0,0 +1,202 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .Deadline import deadline_stage
+from .Metrics import STAGE_LATENCY, STAGE_TOKENS
+from .utils import _usage_scope, ensure_packages
+
+# Fixed column order; every record has all of them (None when not applicable),
+# so JSONL and Parquet scans see one flat schema.
+TRACE_FIELDS = (
+    "config",
+    "case_id",
+    "run",
+    "turn",
+    "loop",
+    "stage",
+    "candidate",
+    "started_at",
+    "duration_ms",
+    "calls",
+    "prompt_tokens",
+    "cached_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "summary",
+    "queries",
+    "rebuttal",
+    "refs",
+    "score",
+    "passed",
+    "feedback",
+    "grad",
+    "stop_reason",
+    "route",
+)
+# Nested values are kept as-is in JSONL and stored as JSON strings in Parquet.
+_NESTED_FIELDS = ("summary", "queries", "refs", "grad", "route")
+
+_TRACE_SINK: contextvars.ContextVar = contextvars.ContextVar("critiquebot_trace_sink", default=None)
+_TRACE_CONTEXT: contextvars.ContextVar = contextvars.ContextVar("critiquebot_trace_context", default={})
+
+
+class TraceWriter:
+    """Streams long-format trace records, one per (case, run, turn, loop, stage).
+
+    Every record is appended to a JSONL file as soon as it is emitted; with a
+    parquet_path the records are also written in row groups of `batch_size`
+    (pyarrow is installed on demand).
+    """
+
+    def __init__(self, jsonl_path: Path, parquet_path: Optional[Path] = None, batch_size: int = 5000) -> None:
+        self.jsonl_path = Path(jsonl_path)
+        self.parquet_path = Path(parquet_path) if parquet_path else None
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._file = None
+        self._parquet_writer = None
+        self._batch: List[Dict[str, Any]] = []
+        self.records = 0
+
+    def __enter__(self) -> "TraceWriter":
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.jsonl_path.open("w", encoding="utf-8")
+        if self.parquet_path:
+            ensure_packages(["pyarrow"])
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        row = {field: record.get(field) for field in TRACE_FIELDS}
+        line = json.dumps(row, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records += 1
+            if self.parquet_path:
+                self._batch.append(row)
+                if len(self._batch) >= self.batch_size:
+                    self._flush_parquet()
+
+    def _flush_parquet(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._batch:
+            return
+        columns = {field: [row[field] for row in self._batch] for field in TRACE_FIELDS}
+        for field in _NESTED_FIELDS:
+            columns[field] = [
+                None if value is None or isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+                for value in columns[field]
+            ]
+        for field in ("config", "case_id", "stage", "rebuttal", "feedback", "stop_reason"):
+            columns[field] = [None if value is None else str(value) for value in columns[field]]
+        table = pa.table(columns, schema=_parquet_schema(pa))
+        if self._parquet_writer is None:
+            self.parquet_path.parent.mkdir(parents=True, exist_ok=True)
+            self._parquet_writer = pq.ParquetWriter(str(self.parquet_path), table.schema)
+        self._parquet_writer.write_table(table)
+        self._batch = []
+
+    def close(self) -> None:
+        with self._lock:
+            if self.parquet_path:
+                self._flush_parquet()
+                if self._parquet_writer is not None:
+                    self._parquet_writer.close()
+                    self._parquet_writer = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _parquet_schema(pa):
+    types = {
+        "run": pa.int32(),
+        "turn": pa.int32(),
+        "loop": pa.int32(),
+        "candidate": pa.int32(),
+        "started_at": pa.float64(),
+        "duration_ms": pa.float64(),
+        "calls": pa.int64(),
+        "prompt_tokens": pa.int64(),
+        "cached_tokens": pa.int64(),
+        "completion_tokens": pa.int64(),
+        "total_tokens": pa.int64(),
+        "score": pa.float64(),
+        "passed": pa.bool_(),
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in TRACE_FIELDS])
+
+
+@contextmanager
+def trace_sink(writer: Optional[TraceWriter]):
+    """Route trace records emitted inside the block (and threads started via _submit_in_context) to writer."""
+    token = _TRACE_SINK.set(writer)
+    try:
+        yield writer
+    finally:
+        _TRACE_SINK.reset(token)
+
+
+@contextmanager
+def trace_context(**fields):
+    """Adds identifying fields (config, case_id, run, turn, ...) to every record emitted inside the block."""
+    token = _TRACE_CONTEXT.set({**_TRACE_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        _TRACE_CONTEXT.reset(token)
+
+
+def tracing_enabled() -> bool:
+    return _TRACE_SINK.get() is not None
+
+
+def emit_trace(stage: str, loop: Optional[int] = None, **fields) -> None:
+    writer = _TRACE_SINK.get()
+    if writer is None:
+        return
+    writer.write({**_TRACE_CONTEXT.get(), "stage": stage, "loop": loop, **fields})
+
+
+def rebuttal_fields(rebuttal: Any) -> Dict[str, Any]:
+    if isinstance(rebuttal, dict):
+        return {"rebuttal": rebuttal.get("txt"), "refs": rebuttal.get("ref"), "queries": rebuttal.get("queries")}
+    return {"rebuttal": str(rebuttal)}
+
+
+@contextmanager
+def trace_stage(stage: str, loop: Optional[int] = None, **fields):
+    """Times a stage and records its token usage (stage metrics always, a trace record when tracing);
+    the caller fills the yielded dict with outputs. Network calls inside get the stage's timeout cap."""
+    record: Dict[str, Any] = dict(fields)
+    started_at = time.time()
+    started = time.perf_counter()
+    with _usage_scope() as usage, deadline_stage(stage):
+        yield record
+    elapsed = time.perf_counter() - started
+    STAGE_LATENCY.observe(elapsed, stage=stage)
+    STAGE_TOKENS.inc(usage["total_tokens"], stage=stage)
+    if not tracing_enabled():
+        return
+    emit_trace(
+        stage,
+        loop,
+        started_at=started_at,
+        duration_ms=elapsed * 1000,
+        calls=usage["calls"],
+        prompt_tokens=usage["prompt_tokens"],
+        cached_tokens=usage["cached_tokens"],
+        completion_tokens=usage["completion_tokens"],
+        total_tokens=usage["total_tokens"],
+        **record,
+    )
@@ -1,16 +1,38 @@
+import contextvars
+import copy
 import importlib.util
 import json
+import re
+import shutil
 import subprocess
 import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .Deadline import call_timeout, is_timeout, record_timeout
+from .Metrics import LLM_CALLS, LLM_HEDGE_WASTED_TOKENS, LLM_HEDGES, LLM_LATENCY, LLM_TOKENS, PARSE_FAILURES
 
 
 CONFIG_DEFAULTS: Dict[str, Any] = {
     "mode": "cli",
     "test_mode": False,
     "version": None,
+    # CriticFactory LRU size and presets/experiments built at startup
+    "critic_cache_size": 32,
+    "prewarm": [],
+    # Serve Prometheus metrics on http://127.0.0.1:<port>/metrics (cli/streamlit); None disables
+    "metrics_port": None,
+    # Hedged LLM requests (see HEDGING_DEFAULTS); {"enabled": true} turns them on
+    "hedging": {"enabled": False},
+    # Shared Tavily circuit breaker (see CIRCUIT_BREAKER_DEFAULTS)
+    "search_breaker": {"failure_threshold": 3, "reset_timeout_s": 30.0},
     "exp_module": {
         "input_csv": "EXP001/in.csv",
         "output_csv": "EXP001/out.csv",
@@ -23,98 +45,428 @@ EXP_CONFIG_DEFAULTS: Dict[str, Any] = {
     "default_version": None,
     "rows": {},
     "has_header": False,
+    # False | True/"cases" (reuse identical leading user turns across cases) | "all" (also across runs)
+    "share_prefixes": False,
+    # {label: experiment} or [experiment, ...]; runs every config per case into one long-format CSV
+    "matrix": None,
+    # true (out.trace.jsonl next to the output CSV) or a path; trace_parquet also writes .parquet
+    "trace": False,
+    "trace_parquet": False,
+    # true (out.prom next to the output CSV) or a path; Prometheus text dump written when the run ends
+    "metrics": False,
+    # Read the input lazily (CSV or .jsonl, `read_ahead` cases buffered) and write the long-format CSV
+    # (config, case_id, run, turn, user, model, ref) as cases finish; no global max_turns needed.
+    "stream": False,
+    "read_ahead": 64,
+    # Entries kept in the share_prefixes cache (least recently used dropped first)
+    "prefix_cache_size": 10000,
+    # Play the runs of a case side by side; identical model calls go out once with n=runs samples and
+    # identical searches run once (runs > 1; not with share_prefixes "all" or matrix runs)
+    "batch_runs": False,
 }
 
 TEST_MODE = False
 
 
-class _SubmoduleProgressLogger:
-    """Single line progress printing when GPT calls take time."""
+class _TaskProgress:
+    """Progress state of one task (an interactive call or one EXP turn)."""
 
-    def __init__(self) -> None:
-        self.enabled = False
+    def __init__(self, prefix: str = "", single_line: bool = False) -> None:
+        self.prefix = prefix
+        self.single_line = single_line
         self.total_steps = 0
         self.started_steps = 0
-        self.prefix = ""
-        self.single_line = False
-        self.line_open = False
+        self.tokens: List[str] = []
+        self.current = ""
+        self.open_steps = 0
+
+    def head(self) -> str:
+        return f"[CritiqueBot] {self.prefix}" if self.prefix else "[CritiqueBot]"
+
+    def live_text(self) -> str:
+        if self.single_line:
+            return " ".join([self.head()] + self.tokens)
+        return f"{self.head()} {self.current}"
+
+
+class _SubmoduleProgressLogger:
+    """Progress output for critic calls, safe to share between concurrent tasks.
+
+    Each task (contextvar) keeps its own prefix, step counter and line; tasks
+    only enqueue finished lines, and a single renderer thread owns stdout. On a
+    TTY the renderer redraws one live status line below the finished lines;
+    otherwise it prints finished lines plus a dashboard line every
+    `log_interval_s` while an EXP run is active.
+    """
+
+    def __init__(self, refresh_s: float = 0.2, log_interval_s: float = 30.0) -> None:
+        self.enabled = False
+        self.refresh_s = refresh_s
+        self.log_interval_s = log_interval_s
+        self._task: contextvars.ContextVar = contextvars.ContextVar("critiquebot_progress_task", default=None)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: List[str] = []
+        self._syncs: List[threading.Event] = []
+        self._active: Dict[int, _TaskProgress] = {}
+        self._dashboard: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._status_drawn = False
+        self._last_log = 0.0
+
+    # -- per-task API (unchanged for callers) ------------------------------------
+
+    def _state(self) -> _TaskProgress:
+        state = self._task.get()
+        if state is None:
+            state = _TaskProgress()
+            self._task.set(state)
+        return state
+
+    @contextmanager
+    def task(self, prefix: str = "", single_line: bool = False):
+        """Runs the block as its own progress task; its open line is closed on exit."""
+        token = self._task.set(_TaskProgress(prefix, single_line))
+        try:
+            yield
+        finally:
+            self.end_line()
+            self._task.reset(token)
+
+    @property
+    def single_line(self) -> bool:
+        return self._state().single_line
 
     def set_enabled(self, flag: bool) -> None:
         self.enabled = bool(flag)
 
     def prepare(self, total_steps: int) -> None:
         self.set_enabled(not TEST_MODE)
-        self.total_steps = max(0, total_steps)
-        self.started_steps = 0
+        state = self._state()
+        state.total_steps = max(0, total_steps)
+        state.started_steps = 0
 
     def extend(self, additional_steps: int) -> None:
         if not self.enabled:
             return
-        self.total_steps = max(self.total_steps + int(additional_steps), self.started_steps)
+        state = self._state()
+        state.total_steps = max(state.total_steps + int(additional_steps), state.started_steps)
 
     def set_prefix(self, text: str) -> None:
-        self.prefix = text or ""
+        self._state().prefix = text or ""
 
     def set_single_line_mode(self, flag: bool) -> None:
         if not flag:
             self.end_line()
-        self.single_line = bool(flag)
+        self._state().single_line = bool(flag)
 
     @contextmanager
     def step(self, label: str):
-        token = self._start(label)
+        state = self._start(label)
         try:
             yield
         except Exception:
-            self._finish(token, status="failed")
+            self._finish(state, status="failed")
             raise
         else:
-            self._finish(token)
+            self._finish(state)
 
-    def _start(self, label: str):
+    def _start(self, label: str) -> Optional[_TaskProgress]:
         if not self.enabled:
             return None
-        self.started_steps += 1
-        idx = self.started_steps
-        total = self.total_steps or idx
-        if total < idx:
-            total = idx
-            self.total_steps = total
-        prefix = f" {self.prefix}" if self.prefix else ""
-        if self.single_line:
-            if not self.line_open:
-                print(f"[CritiqueBot]{prefix}", end="", flush=True)
-                self.line_open = True
-            print(f" {label}", end="", flush=True)
-        else:
-            line = f"[CritiqueBot]{prefix} ({idx}/{total}) {label} ..."
-            print(line, end="", flush=True)
-        return True
+        state = self._state()
+        with self._lock:
+            state.started_steps += 1
+            idx = state.started_steps
+            state.total_steps = max(state.total_steps, idx)
+            if state.single_line:
+                state.tokens.append(label)
+            else:
+                state.current = f"({idx}/{state.total_steps}) {label} ..."
+            state.open_steps += 1
+            self._active[id(state)] = state
+            if self._dashboard is not None:
+                self._dashboard["in_flight"] += 1
+        self._ensure_renderer()
+        return state
 
-    def _finish(self, token, status: str = "complete!") -> None:
-        if token is None:
+    def _finish(self, state: Optional[_TaskProgress], status: str = "complete!") -> None:
+        if state is None:
             return
-        if not self.single_line:
-            print(f" {status}")
+        with self._lock:
+            state.open_steps -= 1
+            if self._dashboard is not None:
+                self._dashboard["in_flight"] -= 1
+                if status == "failed":
+                    self._dashboard["errors"] += 1
+            if not state.single_line:
+                self._pending.append(f"{state.live_text()} {status}")
+                state.current = ""
+                if not state.open_steps:
+                    self._active.pop(id(state), None)
+            self._wakeup.notify()
+        if not state.single_line and not state.open_steps:
+            self.sync()
 
     def end_line(self) -> None:
-        if self.line_open:
-            print()
-            self.line_open = False
+        state = self._task.get()
+        if state is None:
+            return
+        with self._lock:
+            if not state.tokens:
+                return
+            self._pending.append(state.live_text())
+            state.tokens = []
+            if not state.open_steps:
+                self._active.pop(id(state), None)
+            self._wakeup.notify()
+        self.sync()
 
     def append_token(self, text: str) -> None:
-        if not self.enabled or not self.single_line:
+        if not self.enabled:
+            return
+        state = self._state()
+        if not state.single_line:
+            return
+        with self._lock:
+            state.tokens.append(text)
+            self._active[id(state)] = state
+        self._ensure_renderer()
+
+    # -- dashboard ------------------------------------------------------------------
+
+    def start_dashboard(self, total_cases: Optional[int]) -> None:
+        """total_cases None (streamed input): progress is shown without total and ETA."""
+        if TEST_MODE:
+            return
+        with self._lock:
+            self._dashboard = {
+                "total": None if total_cases is None else int(total_cases),
+                "done": 0,
+                "turns": 0,
+                "in_flight": 0,
+                "errors": 0,
+                "started": time.perf_counter(),
+            }
+            self._last_log = time.perf_counter()
+        self._ensure_renderer()
+
+    def turn_done(self) -> None:
+        with self._lock:
+            if self._dashboard is not None:
+                self._dashboard["turns"] += 1
+
+    def case_done(self) -> None:
+        with self._lock:
+            if self._dashboard is not None:
+                self._dashboard["done"] += 1
+
+    def stop_dashboard(self) -> None:
+        with self._lock:
+            dashboard, self._dashboard = self._dashboard, None
+            if dashboard is not None and self._thread is not None:
+                self._pending.append(self._dashboard_text(dashboard))
+                self._wakeup.notify()
+        self.sync()
+
+    @staticmethod
+    def _dashboard_text(dashboard: Dict[str, Any]) -> str:
+        elapsed = time.perf_counter() - dashboard["started"]
+        done, total = dashboard["done"], dashboard["total"]
+        turns_per_s = dashboard["turns"] / elapsed if elapsed > 0 else 0.0
+        if total is not None and done and done < total:
+            eta_s = int(elapsed / done * (total - done))
+            eta = f"{eta_s // 60}m{eta_s % 60:02d}s"
+        else:
+            eta = "-"
+        progress = f"{done}" if total is None else f"{done}/{total}"
+        return (
+            f"[CritiqueBot] 진행 {progress} 케이스 | 진행 중 호출 {dashboard['in_flight']} | "
+            f"{turns_per_s:.2f} 턴/s | ETA {eta} | 오류 {dashboard['errors']}"
+        )
+
+    # -- renderer -------------------------------------------------------------------
+
+    def _ensure_renderer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._render_loop, name="critiquebot-progress", daemon=True)
+                self._thread.start()
+
+    def sync(self) -> None:
+        """Blocks until everything enqueued so far is on stdout (and a stale status line is cleared)."""
+        if self._thread is None:
             return
-        if not self.line_open:
-            prefix = f" {self.prefix}" if self.prefix else ""
-            print(f"[CritiqueBot]{prefix}", end="", flush=True)
-            self.line_open = True
-        print(f" {text}", end="", flush=True)
+        done = threading.Event()
+        with self._lock:
+            self._syncs.append(done)
+            self._wakeup.notify()
+        done.wait()
+
+    def _render_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending and not self._syncs:
+                    self._wakeup.wait(self.refresh_s)
+                lines, self._pending = self._pending, []
+                syncs, self._syncs = self._syncs, []
+                status = self._status_text_locked()
+                dashboard = self._dashboard_text(self._dashboard) if self._dashboard is not None else ""
+            self._render(lines, status, dashboard)
+            for done in syncs:
+                done.set()
+
+    def _status_text_locked(self) -> str:
+        live = [state.live_text() for state in self._active.values()]
+        if self._dashboard is not None:
+            text = self._dashboard_text(self._dashboard)
+            if len(live) == 1:
+                text += " | " + live[0].replace("[CritiqueBot] ", "", 1)
+            return text
+        if len(live) > 1:
+            return f"[CritiqueBot] 진행 중 작업 {len(live)}개"
+        return live[0] if live else ""
+
+    def _render(self, lines: List[str], status: str, dashboard: str) -> None:
+        stream = sys.stdout
+        is_tty = stream.isatty()
+        out = []
+        if is_tty and self._status_drawn and (lines or not status):
+            out.append("\r\x1b[2K")
+            self._status_drawn = False
+        out.extend(line + "\n" for line in lines)
+        if is_tty:
+            if status:
+                width = shutil.get_terminal_size((120, 20)).columns - 1
+                out.append("\r\x1b[2K" + _fit_width(status, width))
+                self._status_drawn = True
+        elif dashboard and time.perf_counter() - self._last_log >= self.log_interval_s:
+            self._last_log = time.perf_counter()
+            out.append(dashboard + "\n")
+        if out:
+            stream.write("".join(out))
+            stream.flush()
+
+
+def _fit_width(text: str, width: int) -> str:
+    # Hangul is double width; a status line that wraps could no longer be cleared with \r.
+    used = 0
+    for idx, char in enumerate(text):
+        used += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+        if used > width:
+            return text[:idx]
+    return text
 
 
 SUBMODULE_PROGRESS_LOGGER = _SubmoduleProgressLogger()
 
 
+def _usage_field(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class _UsageStats:
+    """Per-module token usage (incl. provider prefix-cache hits) from chat completions."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._modules: Dict[str, Dict[str, int]] = {}
+
+    def _entry(self, module_name: str) -> Dict[str, int]:
+        return self._modules.setdefault(
+            module_name,
+            {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+                "parse_failures": 0,
+                "parse_repaired": 0,
+            },
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._modules.clear()
+
+    def record(self, module_name: str, usage: Any) -> None:
+        prompt_tokens = int(_usage_field(usage, "prompt_tokens") or 0)
+        completion_tokens = int(_usage_field(usage, "completion_tokens") or 0)
+        details = _usage_field(usage, "prompt_tokens_details")
+        cached_tokens = int(_usage_field(details, "cached_tokens") or 0)
+        with self._lock:
+            entry = self._entry(module_name)
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["cached_tokens"] += cached_tokens
+            entry["completion_tokens"] += completion_tokens
+
+    def record_parse_failure(self, module_name: str, repaired: bool) -> None:
+        with self._lock:
+            entry = self._entry(module_name)
+            entry["parse_failures"] += 1
+            if repaired:
+                entry["parse_repaired"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._modules.items()}
+
+    def report_lines(self) -> List[str]:
+        lines = []
+        for name, entry in sorted(self.snapshot().items()):
+            prompt_tokens = entry["prompt_tokens"]
+            hit_rate = entry["cached_tokens"] / prompt_tokens * 100 if prompt_tokens else 0.0
+            lines.append(
+                f"[CritiqueBot] 토큰 사용량 {name}: 호출 {entry['calls']}회, "
+                f"prompt {prompt_tokens} (cached {entry['cached_tokens']}, {hit_rate:.1f}%), "
+                f"completion {entry['completion_tokens']}"
+            )
+            if entry["parse_failures"]:
+                lines.append(
+                    f"[CritiqueBot] JSON 파싱 실패 {name}: {entry['parse_failures']}회 "
+                    f"(재시도로 복구 {entry['parse_repaired']}회)"
+                )
+        return lines
+
+
+USAGE_STATS = _UsageStats()
+
+_USAGE_SCOPES: contextvars.ContextVar = contextvars.ContextVar("critiquebot_usage_scopes", default=())
+_USAGE_SCOPE_LOCK = threading.Lock()
+
+
+@contextmanager
+def _usage_scope():
+    """Accumulate token usage of every chat completion issued inside the block."""
+    totals = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    reset_token = _USAGE_SCOPES.set(_USAGE_SCOPES.get() + (totals,))
+    try:
+        yield totals
+    finally:
+        _USAGE_SCOPES.reset(reset_token)
+
+
+def _record_usage(module_name: str, usage: Any) -> None:
+    USAGE_STATS.record(module_name, usage)
+    prompt_tokens = int(_usage_field(usage, "prompt_tokens") or 0)
+    completion_tokens = int(_usage_field(usage, "completion_tokens") or 0)
+    cached_tokens = int(_usage_field(_usage_field(usage, "prompt_tokens_details"), "cached_tokens") or 0)
+    with _USAGE_SCOPE_LOCK:
+        for totals in _USAGE_SCOPES.get():
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["cached_tokens"] += cached_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["total_tokens"] += prompt_tokens + completion_tokens
+
+
 def set_test_mode(flag: bool) -> None:
     global TEST_MODE
     TEST_MODE = bool(flag)
@@ -171,6 +523,508 @@ def _log_submodule_io(
     )
 
 
+# Models that rejected `response_format=json_schema`; they fall back to prompt-only JSON.
+_STRUCTURED_OUTPUT_UNSUPPORTED = set()
+
+
+def _json_schema_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": True},
+    }
+
+
+def _submit_in_context(executor, fn, *args, **kwargs):
+    """executor.submit() that carries the caller's contextvars (usage scopes etc.) into the worker."""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+HEDGING_DEFAULTS: Dict[str, Any] = {
+    "enabled": False,
+    # Fire a duplicate once a call outlives this latency quantile of its module/model.
+    "quantile": 0.95,
+    "min_samples": 20,
+    "min_delay_s": 1.0,
+    # Budget: hedges per module <= this share of its calls; cap: concurrent hedges per module.
+    "max_hedge_ratio": 0.1,
+    "max_in_flight": 2,
+    "window": 200,
+}
+
+
+class _RequestHedger:
+    """Hedged chat completions: a call still running after its module's p95 gets a duplicate, first answer wins.
+
+    Latencies are learned per (module, model) from primary calls only, so
+    hedging does not pull its own trigger down. The loser cannot be aborted
+    once it is on the wire (the SDK call is blocking); it is cancelled if it
+    has not started, and otherwise its tokens are booked as hedge waste.
+    """
+
+    def __init__(self) -> None:
+        self.options = dict(HEDGING_DEFAULTS)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._modules: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, options: Optional[Dict[str, Any]]) -> None:
+        self.options = dict(HEDGING_DEFAULTS)
+        self.options.update(options or {})
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._modules.clear()
+
+    def _entry(self, module_name: str) -> Dict[str, int]:
+        return self._modules.setdefault(
+            module_name, {"calls": 0, "hedged": 0, "in_flight": 0, "won": 0, "wasted_tokens": 0}
+        )
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="critiquebot-llm")
+            return self._executor
+
+    def _observe(self, key: Tuple[str, str], started: float, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            samples = self._latencies.setdefault(key, deque(maxlen=int(self.options["window"])))
+            samples.append(time.perf_counter() - started)
+
+    def _hedge_delay(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < int(self.options["min_samples"]):
+            return None
+        idx = min(len(samples) - 1, int(self.options["quantile"] * len(samples)))
+        return max(float(self.options["min_delay_s"]), samples[idx])
+
+    def _acquire(self, module_name: str) -> bool:
+        with self._lock:
+            entry = self._entry(module_name)
+            if entry["in_flight"] >= int(self.options["max_in_flight"]):
+                return False
+            if entry["hedged"] + 1 > self.options["max_hedge_ratio"] * entry["calls"]:
+                return False
+            entry["in_flight"] += 1
+            entry["hedged"] += 1
+            return True
+
+    def _release(self, module_name: str) -> None:
+        with self._lock:
+            self._entry(module_name)["in_flight"] -= 1
+
+    def _book_waste(self, module_name: str, model: str, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        usage = getattr(future.result(), "usage", None)
+        tokens = int(_usage_field(usage, "prompt_tokens") or 0) + int(_usage_field(usage, "completion_tokens") or 0)
+        USAGE_STATS.record(module_name, usage)
+        LLM_HEDGE_WASTED_TOKENS.inc(tokens, module=module_name, model=model)
+        with self._lock:
+            self._entry(module_name)["wasted_tokens"] += tokens
+
+    def create(self, client, model: str, messages, module_name: str, **kwargs):
+        if not self.options.get("enabled"):
+            return client.chat.completions.create(model=model, messages=messages, **kwargs)
+        key = (module_name, model)
+        with self._lock:
+            self._entry(module_name)["calls"] += 1
+        delay = self._hedge_delay(key)
+        pool = self._pool()
+        started = time.perf_counter()
+        primary = _submit_in_context(pool, client.chat.completions.create, model=model, messages=messages, **kwargs)
+        primary.add_done_callback(lambda future: self._observe(key, started, future))
+        if delay is None or wait([primary], timeout=delay).done or not self._acquire(module_name):
+            return primary.result()
+        _test_mode_print(f"[CritiqueBot] {module_name}/{model}: {delay:.1f}s 초과, 중복 요청 발송")
+        hedge = _submit_in_context(pool, client.chat.completions.create, model=model, messages=messages, **kwargs)
+        hedge.add_done_callback(lambda _: self._release(module_name))
+        pending, winner, error = {primary, hedge}, None, None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = error or future.exception()
+        if winner is None:
+            LLM_HEDGES.inc(module=module_name, model=model, outcome="failed")
+            raise error
+        loser = hedge if winner is primary else primary
+        loser.cancel()
+        loser.add_done_callback(lambda future: self._book_waste(module_name, model, future))
+        LLM_HEDGES.inc(module=module_name, model=model, outcome="won" if winner is hedge else "lost")
+        if winner is hedge:
+            with self._lock:
+                self._entry(module_name)["won"] += 1
+        return winner.result()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._modules.items()}
+
+    def totals(self) -> Dict[str, int]:
+        totals = {"calls": 0, "hedged": 0, "won": 0, "wasted_tokens": 0}
+        for entry in self.snapshot().values():
+            for key in totals:
+                totals[key] += entry[key]
+        return totals
+
+    def report_lines(self) -> List[str]:
+        lines = []
+        for name, entry in sorted(self.snapshot().items()):
+            if not entry["hedged"]:
+                continue
+            lines.append(
+                f"[CritiqueBot] 중복 요청(hedge) {name}: 호출 {entry['calls']}회 중 {entry['hedged']}회 "
+                f"({entry['hedged'] / entry['calls'] * 100:.1f}%), 중복 요청이 먼저 응답 {entry['won']}회, "
+                f"추가 토큰 {entry['wasted_tokens']}"
+            )
+        return lines
+
+
+REQUEST_HEDGER = _RequestHedger()
+
+
+_SAMPLE_BATCH: contextvars.ContextVar = contextvars.ContextVar("critiquebot_sample_batch", default=None)
+
+
+class _BatchRequest:
+    def __init__(self, key: Tuple, member: int, call) -> None:
+        self.key = key
+        self.member = member
+        self.call = call
+        self.context = contextvars.copy_context()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SampleBatch:
+    """Lockstep scheduler for the runs of one EXP case played side by side.
+
+    Every model/search call of a member waits until each still-running member
+    has a call pending too; identical pending chat completions then go out as
+    one request with n = number of callers (each gets one choice and an equal
+    share of the usage), and identical deterministic calls (searches) run once
+    with the result copied to every caller. Members diverge naturally: as soon
+    as their prompts differ, their calls are simply dispatched separately.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._cond = threading.Condition()
+        self.active = size
+        self._pending: List[_BatchRequest] = []
+        self.stats = {"requests": 0, "dispatched": 0}
+
+    @contextmanager
+    def member(self, index: int):
+        token = _SAMPLE_BATCH.set((self, index))
+        try:
+            yield
+        finally:
+            _SAMPLE_BATCH.reset(token)
+            with self._cond:
+                self.active -= 1
+                self._dispatch_ready()
+
+    def submit(self, key: Tuple, member: int, call):
+        """call(requests) performs the merged call and sets result/error on every request."""
+        request = _BatchRequest(key, member, call)
+        with self._cond:
+            self._pending.append(request)
+            self.stats["requests"] += 1
+            self._dispatch_ready()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _dispatch_ready(self) -> None:
+        if not self._pending or len({request.member for request in self._pending}) < self.active:
+            return
+        groups: Dict[Tuple, List[_BatchRequest]] = {}
+        for request in self._pending:
+            groups.setdefault(request.key, []).append(request)
+        self._pending = []
+        self.stats["dispatched"] += len(groups)
+        for requests in groups.values():
+            threading.Thread(target=self._run_group, args=(requests,), daemon=True).start()
+
+    @staticmethod
+    def _run_group(requests: List[_BatchRequest]) -> None:
+        try:
+            # Run in the first caller's context (deadline, trace stage) with batching switched off.
+            requests[0].context.run(_unbatched, requests[0].call, requests)
+        except BaseException as exc:
+            for request in requests:
+                request.error = request.error or exc
+        finally:
+            for request in requests:
+                request.done.set()
+
+
+def _unbatched(call, requests: List[_BatchRequest]) -> None:
+    _SAMPLE_BATCH.set(None)
+    call(requests)
+
+
+def _merged_completion(client, model: str, messages, module_name: str, kwargs: Dict[str, Any]):
+    def call(requests: List[_BatchRequest]) -> None:
+        pending = list(requests)
+        if len(pending) > 1:
+            try:
+                rsp = _timed_create(client, model, messages, module_name, n=len(pending), **kwargs)
+            except Exception as exc:
+                _test_mode_print(f"[CritiqueBot] {model}: n={len(pending)} 요청 실패, 개별 요청으로 대체합니다: {exc}")
+                rsp = None
+            choices = list(getattr(rsp, "choices", None) or [])
+            usage = getattr(rsp, "usage", None)
+            for request, choice in zip(pending, choices):
+                request.result = SimpleNamespace(choices=[choice], usage=_usage_share(usage, len(choices)))
+            # Providers that ignore n return fewer choices; the rest is requested one by one.
+            pending = pending[len(choices):]
+        for request in pending:
+            request.result = _timed_create(client, model, messages, module_name, **kwargs)
+
+    return call
+
+
+def _usage_share(usage: Any, parts: int) -> Dict[str, Any]:
+    def share(value) -> int:
+        return int(round((value or 0) / max(1, parts)))
+
+    cached = _usage_field(_usage_field(usage, "prompt_tokens_details"), "cached_tokens")
+    return {
+        "prompt_tokens": share(_usage_field(usage, "prompt_tokens")),
+        "completion_tokens": share(_usage_field(usage, "completion_tokens")),
+        "prompt_tokens_details": {"cached_tokens": share(cached)},
+    }
+
+
+def _batch_key(*parts) -> str:
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _shared_in_batch(key: Tuple, fn, *args):
+    """fn(*args), issued once for every run of a sample batch asking with the same key (deterministic calls only)."""
+    batch = _SAMPLE_BATCH.get()
+    if batch is None:
+        return fn(*args)
+    group, member = batch
+
+    def call(requests: List[_BatchRequest]) -> None:
+        result = fn(*args)
+        for request in requests:
+            request.result = copy.deepcopy(result)
+
+    return group.submit(("shared", _batch_key(*key)), member, call)
+
+
+def _timed_create(client, model: str, messages, module_name: str, **kwargs):
+    batch = _SAMPLE_BATCH.get()
+    if batch is not None and "n" not in kwargs:
+        group, member = batch
+        key = ("chat", _batch_key(id(client), model, messages, {k: v for k, v in kwargs.items() if k != "timeout"}))
+        kwargs.pop("timeout", None)
+        return group.submit(key, member, _merged_completion(client, model, messages, module_name, kwargs))
+    # min(remaining request deadline, stage cap); raises DeadlineExceeded without calling once it has passed.
+    kwargs.setdefault("timeout", call_timeout())
+    started = time.perf_counter()
+    try:
+        rsp = REQUEST_HEDGER.create(client, model, messages, module_name, **kwargs)
+    except Exception as exc:
+        timed_out = is_timeout(exc)
+        if timed_out:
+            record_timeout()
+        LLM_CALLS.inc(module=module_name, model=model, status="timeout" if timed_out else "error")
+        raise
+    LLM_LATENCY.observe(time.perf_counter() - started, module=module_name, model=model)
+    LLM_CALLS.inc(module=module_name, model=model, status="ok")
+    return rsp
+
+
+def _chat_completion(
+    client,
+    model: str,
+    system: str,
+    prompt: str,
+    *,
+    tag: str,
+    module_name: str,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Single chat completion shared by every submodule.
+
+    The system prompt always goes first and callers keep the static part of their
+    user prompt (instructions, rubric, output format) ahead of the conversation so
+    that provider-side prefix caching can reuse it across loops and turns.
+    """
+    kwargs: Dict[str, Any] = {}
+    if response_format and model not in _STRUCTURED_OUTPUT_UNSUPPORTED:
+        kwargs["response_format"] = response_format
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+    try:
+        rsp = _timed_create(client, model, messages, module_name, **kwargs)
+    except Exception as exc:
+        if "response_format" not in kwargs or not re.search(r"response_format|json_schema", str(exc)):
+            raise
+        _test_mode_print(f"[CritiqueBot] {model}: structured output 미지원, 프롬프트 JSON으로 대체합니다.")
+        _STRUCTURED_OUTPUT_UNSUPPORTED.add(model)
+        rsp = _timed_create(client, model, messages, module_name)
+    usage = getattr(rsp, "usage", None)
+    _record_usage(module_name, usage)
+    LLM_TOKENS.inc(int(_usage_field(usage, "prompt_tokens") or 0), module=module_name, model=model, kind="prompt")
+    LLM_TOKENS.inc(
+        int(_usage_field(_usage_field(usage, "prompt_tokens_details"), "cached_tokens") or 0),
+        module=module_name,
+        model=model,
+        kind="cached",
+    )
+    LLM_TOKENS.inc(int(_usage_field(usage, "completion_tokens") or 0), module=module_name, model=model, kind="completion")
+    content = (rsp.choices[0].message.content or "").strip()
+    _log_submodule_io(tag, prompt, content, module_name, model)
+    return content
+
+
+def _close_partial_json(text: str) -> str:
+    """Close strings/brackets left open by a truncated JSON object.
+
+    A member cut off before its value ("key": <EOF>) is dropped.
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    expect_key = False
+    after_colon = False
+    # Start of the last object member whose value has not begun yet.
+    member_start: Optional[int] = None
+    for idx, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if after_colon and not ch.isspace():
+            after_colon = False
+            member_start = None
+        if ch == '"':
+            in_string = True
+            if expect_key:
+                member_start, expect_key = idx, False
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            expect_key = ch == "{"
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            expect_key = False
+        elif ch == ",":
+            expect_key = bool(stack) and stack[-1] == "}"
+        elif ch == ":":
+            after_colon = True
+    if member_start is not None:
+        closed = text[:member_start]
+    else:
+        closed = text + ('"' if in_string else "")
+    closed = re.sub(r"[,:\s]+$", "", closed)
+    return closed + "".join(reversed(stack))
+
+
+def _parse_json_response(text: str) -> Optional[Dict[str, Any]]:
+    """Tolerant JSON object parser shared by every submodule.
+
+    Handles fenced blocks, prose before/after the object and truncated output.
+    Returns None when nothing usable could be recovered.
+    """
+    cleaned = (text or "").strip()
+    if not cleaned:
+        return None
+    fenced = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", cleaned, re.DOTALL | re.IGNORECASE)
+    candidates = [cleaned]
+    if fenced:
+        candidates.insert(0, fenced.group(1).strip())
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        start = candidate.find("{")
+        if start < 0:
+            continue
+        body = candidate[start:]
+        try:
+            data, _ = decoder.raw_decode(body)
+        except json.JSONDecodeError:
+            try:
+                data = json.loads(_close_partial_json(body))
+            except json.JSONDecodeError:
+                continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def _chat_json(
+    client,
+    model: str,
+    system: str,
+    prompt: str,
+    *,
+    tag: str,
+    module_name: str,
+    schema_name: str,
+    schema: Dict[str, Any],
+) -> Tuple[Dict[str, Any], str]:
+    """Chat completion constrained to `schema`, with one cheap repair retry.
+
+    Returns the parsed object ({} if even the repair failed) and the raw content.
+    """
+    response_format = _json_schema_format(schema_name, schema)
+    content = _chat_completion(
+        client,
+        model,
+        system,
+        prompt,
+        tag=tag,
+        module_name=module_name,
+        response_format=response_format,
+    )
+    data = _parse_json_response(content)
+    if data is not None:
+        return data, content
+    repair_prompt = (
+        "다음 응답을 아래 JSON 스키마에 맞는 JSON 객체 하나로만 다시 출력하세요. 내용은 바꾸지 마세요.\n"
+        f"스키마: {json.dumps(schema, ensure_ascii=False)}\n\n"
+        f"응답:\n{content}"
+    )
+    repaired = _chat_completion(
+        client,
+        model,
+        "You convert text into strictly valid JSON.",
+        repair_prompt,
+        tag=f"{tag}-Repair",
+        module_name=module_name,
+        response_format=response_format,
+    )
+    data = _parse_json_response(repaired)
+    USAGE_STATS.record_parse_failure(module_name, repaired=data is not None)
+    PARSE_FAILURES.inc(module=module_name, repaired=str(data is not None).lower())
+    if data is None:
+        _test_mode_print(f"[CritiqueBot] {tag}: JSON 파싱 실패 (복구 재시도 실패)")
+        return {}, content
+    return data, content
+
+
 def _format_grad_for_module(grad: Any) -> Optional[str]:
     if not grad:
         return None
@@ -297,6 +1151,14 @@ def load_batch_config(config_path: Path):
         "default_runs": 1,
         "default_version": None,
         "has_header": False,
+        "share_prefixes": False,
+        "matrix": None,
+        "trace": False,
+        "trace_parquet": False,
+        "stream": False,
+        "read_ahead": 64,
+        "batch_runs": False,
+        "metrics": None,
         "rows": {},
     }
     runner_source = data.get("exp_runner") or data.get("runner") or {}
@@ -2,6 +2,7 @@
 Streamlit 웹 애플리케이션 진입점
 실행 방법: streamlit run app.py
 """
+import json
 import os
 import sys
 from pathlib import Path
@@ -10,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from Modules.utils import ensure_packages, load_config, set_test_mode
+from Modules.utils import REQUEST_HEDGER, ensure_packages, load_config, set_test_mode
 
 # 필요한 패키지 확인 및 설치
 ensure_packages(["openai", "tavily", "streamlit"])
@@ -29,7 +30,9 @@ from openai import OpenAI
 from tavily import TavilyClient
 
 from Modules.StreamlitModule import StreamlitModule
+from Modules.CircuitBreaker import TAVILY_BREAKER
 from Modules.CriticModule import CriticFactory
+from Modules.Metrics import METRICS
 
 
 def load_clients(config: dict):
@@ -49,11 +52,31 @@ def load_clients(config: dict):
     return openai_client, tavily_client
 
 
+@st.cache_resource(show_spinner=False)
+def get_factory(config_json: str):
+    """재실행/세션 간에 공유되는 CriticFactory (critic LRU 캐시와 서브모듈 인스턴스 풀 유지)"""
+    config = json.loads(config_json)
+    openai_client, tavily_client = load_clients(config)
+    factory = CriticFactory(
+        openai_client=openai_client,
+        tavily_client=tavily_client,
+        custom_presets=config.get("experiment_presets"),
+        cache_size=config.get("critic_cache_size", 32),
+    )
+    if config.get("prewarm"):
+        factory.prewarm(config["prewarm"])
+    return factory
+
+
 def format_summary(config, runtime_meta):
     """설정 요약 포맷팅"""
-    cfg_summary = {module: f"{cfg['version']}@{cfg['model']}" for module, cfg in config.items()}
+    cfg_summary = {
+        module: f"{cfg['version']}@{cfg['model']}" if cfg.get("model") else cfg["version"]
+        for module, cfg in config.items()
+    }
     runtime_summary = {
-        module: f"{meta['class']}({meta['model']})" for module, meta in runtime_meta.items()
+        module: f"{meta['class']}({meta['model']})" if meta.get("model") else meta["class"]
+        for module, meta in runtime_meta.items()
     }
     return cfg_summary, runtime_summary
 
@@ -84,20 +107,19 @@ def main():
     test_mode_flag = bool(config.get("test_mode", False))
     set_test_mode(test_mode_flag)
     
-    # API 클라이언트 로드
+    # Prometheus 메트릭 엔드포인트 (프로세스당 한 번 시작)
+    if config.get("metrics_port"):
+        METRICS.serve(int(config["metrics_port"]))
+    REQUEST_HEDGER.configure(config.get("hedging"))
+    TAVILY_BREAKER.configure(config.get("search_breaker"))
+
+    # API 클라이언트 로드 + CriticFactory 초기화 (프로세스당 한 번)
     try:
-        openai_client, tavily_client = load_clients(config)
+        factory = get_factory(json.dumps(config, sort_keys=True, ensure_ascii=False))
     except Exception as e:
         st.error(f"❌ API 클라이언트 로드 오류: {e}")
         st.stop()
     
-    # CriticFactory 초기화
-    factory = CriticFactory(
-        openai_client=openai_client,
-        tavily_client=tavily_client,
-        custom_presets=config.get("experiment_presets"),
-    )
-    
     # 버전 설정
     version_override = config.get("version")
     try:
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks that run the critic pipeline against the fake OpenAI/Tavily
+backends in Modules/FakeBackends.py (no API keys, no network).
+
+    python bench.py strategies --claims 20
+    python bench.py search-depth --claims 20
+    python bench.py concurrency --threads 16 --turns 64
+    python bench.py --claims 99 hedging --tail-prob 0.05
+    python bench.py --claims 99 deadline --deadline 150
+    python bench.py --claims 60 search-outage
+    python bench.py stream-input --cases 1000000
+    python bench.py --claims 30 batch-runs --runs 4
+
+Latencies are reported in simulated seconds (wall clock / time_scale).
+"""
+import argparse
+import contextlib
+import contextvars
+import csv
+import io
+import json
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from Modules.CircuitBreaker import CIRCUIT_BREAKER_DEFAULTS, TAVILY_BREAKER
+from Modules.CriticModule import CriticFactory
+from Modules.Deadline import STAGE_TIMEOUT_DEFAULTS, STAGE_TIMEOUTS
+from Modules.EXPModule import EXPModule
+from Modules.FakeBackends import FakeLatency, FakeOpenAIClient, FakeTavilyClient
+from Modules.TraceWriter import trace_context, trace_sink
+from Modules.utils import HEDGING_DEFAULTS, REQUEST_HEDGER, _submit_in_context, _usage_scope
+
+# Conversation a judge call belongs to (set per worker by the concurrency check).
+_CASE = contextvars.ContextVar("bench_case", default=None)
+
+
+def _load_claims(path: Path, limit: int, has_header: bool = True):
+    with path.open("r", encoding="utf-8-sig") as f_in:
+        rows = list(csv.reader(f_in))
+    if has_header and rows:
+        rows = rows[1:]
+    claims = [row[-1].strip() for row in rows if row and row[-1].strip()]
+    return claims[:limit]
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _build_fakes(seed: int, time_scale: float, tail_prob: float = 0.0):
+    import random
+
+    openai_client = FakeOpenAIClient(
+        seed=seed,
+        latency=FakeLatency(random.Random(seed + 1), tail_prob=tail_prob, time_scale=time_scale),
+    )
+    tavily_client = FakeTavilyClient(
+        seed=seed,
+        latency=FakeLatency(random.Random(seed + 2), time_scale=time_scale),
+    )
+    return openai_client, tavily_client
+
+
+class _ScoreRecorder:
+    """Wraps judge.score() so the bench can look up the score(s) given to a rebuttal in a conversation."""
+
+    def __init__(self, judge) -> None:
+        self._lock = threading.Lock()
+        self._inner = judge.score
+        self.scores = {}
+        judge.score = self
+
+    def __call__(self, history, summary, rebuttal):
+        score, feedback = self._inner(history, summary, rebuttal)
+        with self._lock:
+            self.scores.setdefault((_CASE.get(), rebuttal.get("txt")), []).append(score)
+        return score, feedback
+
+    def last(self, txt, case=None):
+        scores = self.scores.get((case, txt))
+        return scores[-1] if scores else None
+
+
+class _TraceCollector:
+    """In-memory trace sink with TraceWriter's write() interface."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.records = []
+
+    def write(self, record) -> None:
+        with self._lock:
+            self.records.append(dict(record))
+
+
+def _run_turns(critic, claims, time_scale):
+    recorder = _ScoreRecorder(critic.ij)
+    threshold = getattr(critic.ij, "pass_threshold", None)
+    rows = []
+    for claim in claims:
+        history = [{"role": "user", "content": claim}]
+        started = time.perf_counter()
+        with _usage_scope() as usage, contextlib.redirect_stdout(io.StringIO()):
+            rsp = critic.call(history)
+        elapsed = (time.perf_counter() - started) / time_scale
+        score = recorder.last(rsp.get("txt"))
+        rows.append(
+            {
+                "latency_s": elapsed,
+                "calls": usage["calls"],
+                "tokens": usage["total_tokens"],
+                "passed": threshold is None or (score is not None and score >= threshold),
+            }
+        )
+    return rows
+
+
+def _summarize(label, rows):
+    latencies = [row["latency_s"] for row in rows]
+    count = max(1, len(rows))
+    return {
+        "strategy": label,
+        "pass_rate": sum(row["passed"] for row in rows) / count * 100,
+        "p50_s": _percentile(latencies, 50),
+        "p95_s": _percentile(latencies, 95),
+        "mean_s": sum(latencies) / count,
+        "calls": sum(row["calls"] for row in rows) / count,
+        "tokens": sum(row["tokens"] for row in rows) / count,
+    }
+
+
+def _print_table(results):
+    header = f"{'strategy':<22} {'pass%':>6} {'p50(s)':>8} {'p95(s)':>8} {'mean(s)':>8} {'calls/turn':>11} {'tokens/turn':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['strategy']:<22} {r['pass_rate']:>6.1f} {r['p50_s']:>8.1f} {r['p95_s']:>8.1f} "
+            f"{r['mean_s']:>8.1f} {r['calls']:>11.1f} {r['tokens']:>12.0f}"
+        )
+
+
+def bench_strategies(args):
+    """Serial refinement loop (default preset) vs best-of-N (parallel preset)."""
+    claims = _load_claims(Path(args.input), args.claims)
+    results = []
+    for label, preset in (
+        ("serial (v1, 5 loops)", "default"),
+        (f"best-of-{args.n} (bon)", {"critic": {"version": "bon", "options": {"n_candidates": args.n}}}),
+    ):
+        openai_client, tavily_client = _build_fakes(args.seed, args.time_scale)
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        critic = factory.get_or_build(preset)
+        results.append(_summarize(label, _run_turns(critic, claims, args.time_scale)))
+    _print_table(results)
+
+
+def bench_search_depth(args):
+    """Always-advanced Tavily search vs the adaptive basic-first policy."""
+    claims = _load_claims(Path(args.input), args.claims)
+    header = f"{'search_depth':<14} {'pass%':>6} {'p50(s)':>8} {'basic':>6} {'advanced':>9} {'credits':>8} {'search s/turn':>14}"
+    print(header)
+    print("-" * len(header))
+    for depth in ("advanced", "adaptive"):
+        openai_client, tavily_client = _build_fakes(args.seed, args.time_scale)
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        critic = factory.get_or_build({"rebuttal": {"options": {"search_depth": depth}}})
+        summary = _summarize(depth, _run_turns(critic, claims, args.time_scale))
+        turns = max(1, len(claims))
+        print(
+            f"{depth:<14} {summary['pass_rate']:>6.1f} {summary['p50_s']:>8.1f} {tavily_client.calls['basic']:>6} "
+            f"{tavily_client.calls['advanced']:>9} {tavily_client.credits:>8} {tavily_client.simulated_s / turns:>14.1f}"
+        )
+
+
+def bench_hedging(args):
+    """Hedged vs plain LLM requests on a heavy-tailed fake backend: turn p99 and the extra tokens paid for it."""
+    claims = _load_claims(Path(args.input), args.claims)
+    header = (
+        f"{'hedging':<9} {'pass%':>6} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8} {'tokens/turn':>12} "
+        f"{'hedges':>7} {'won':>5} {'wasted tok':>11} {'extra tok%':>11}"
+    )
+    print(f"LLM 지연 꼬리 확률 {args.tail_prob}, 주장 {len(claims)}개")
+    print(header)
+    print("-" * len(header))
+    for enabled in (False, True):
+        REQUEST_HEDGER.reset()
+        REQUEST_HEDGER.configure(
+            {
+                "enabled": enabled,
+                "max_hedge_ratio": args.max_hedge_ratio,
+                # The trigger is learned from wall-clock latencies, so the floor is scaled like the fake sleeps.
+                "min_delay_s": HEDGING_DEFAULTS["min_delay_s"] * args.time_scale,
+            }
+        )
+        openai_client, tavily_client = _build_fakes(args.seed, args.time_scale, tail_prob=args.tail_prob)
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        critic = factory.get_or_build(args.preset)
+        rows = _run_turns(critic, claims, args.time_scale)
+        # Losers finish in the background; give them time to land before reading the totals.
+        time.sleep(args.time_scale * 120)
+        summary = _summarize("on" if enabled else "off", rows)
+        latencies = [row["latency_s"] for row in rows]
+        stats = REQUEST_HEDGER.totals()
+        useful = sum(row["tokens"] for row in rows)
+        print(
+            f"{summary['strategy']:<9} {summary['pass_rate']:>6.1f} {summary['p50_s']:>8.1f} {summary['p95_s']:>8.1f} "
+            f"{_percentile(latencies, 99):>8.1f} {summary['tokens']:>12.0f} {stats['hedged']:>7} {stats['won']:>5} "
+            f"{stats['wasted_tokens']:>11} {stats['wasted_tokens'] / max(1, useful) * 100:>10.1f}%"
+        )
+    REQUEST_HEDGER.configure(None)
+
+
+def bench_deadline(args):
+    """Turn latency with and without a hard request deadline on a heavy-tailed fake backend."""
+    claims = _load_claims(Path(args.input), args.claims)
+    stages = ("summarizer", "rebuttal", "judge", "textgrad", "search")
+    header = f"{'deadline':<10} {'pass%':>6} {'p50(s)':>8} {'p99(s)':>8} {'max(s)':>8} {'stopped':>8}  timeouts by stage"
+    print(f"LLM 지연 꼬리 확률 {args.tail_prob}, 주장 {len(claims)}개")
+    print(header)
+    print("-" * len(header))
+    # Deadlines and caps are wall-clock seconds; scale them like the fake sleeps.
+    stage_timeouts = {stage: cap * args.time_scale for stage, cap in STAGE_TIMEOUT_DEFAULTS.items()}
+    for budget in (None, args.deadline):
+        before = {stage: STAGE_TIMEOUTS.value(stage=stage) for stage in stages}
+        openai_client, tavily_client = _build_fakes(args.seed, args.time_scale, tail_prob=args.tail_prob)
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        options = {
+            "request_timeout_s": None if budget is None else budget * args.time_scale,
+            "stage_timeouts": stage_timeouts,
+        }
+        critic = factory.get_or_build({"critic": {"options": options}})
+        collector = _TraceCollector()
+        with trace_sink(collector):
+            rows = _run_turns(critic, claims, args.time_scale)
+        summary = _summarize("off" if budget is None else f"{budget:g}s", rows)
+        latencies = [row["latency_s"] for row in rows]
+        stopped = sum(
+            1 for record in collector.records
+            if record["stage"] == "final" and record["stop_reason"] in ("deadline", "timeout")
+        )
+        timeouts = ", ".join(
+            f"{stage} {STAGE_TIMEOUTS.value(stage=stage) - before[stage]:.0f}" for stage in stages
+        )
+        print(
+            f"{summary['strategy']:<10} {summary['pass_rate']:>6.1f} {summary['p50_s']:>8.1f} "
+            f"{_percentile(latencies, 99):>8.1f} {max(latencies):>8.1f} {stopped:>8}  {timeouts}"
+        )
+
+
+def bench_search_outage(args):
+    """Tavily down for the middle third of the claims: breaker off vs on (skip search + query generation)."""
+    claims = _load_claims(Path(args.input), args.claims)
+    third = max(1, len(claims) // 3)
+    phases = (
+        ("before", claims[:third], False),
+        ("outage", claims[third : 2 * third], True),
+        ("after", claims[2 * third :], False),
+    )
+    header = (
+        f"{'breaker':<8} {'phase':<7} {'turns':>5} {'pass%':>6} {'p50(s)':>8} {'p95(s)':>8} {'calls/turn':>11} "
+        f"{'searches':>9} {'failed':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for enabled in (False, True):
+        TAVILY_BREAKER.reset()
+        TAVILY_BREAKER.configure(
+            {
+                # "off" never trips; wall-clock reset period scaled like the fake sleeps.
+                "failure_threshold": CIRCUIT_BREAKER_DEFAULTS["failure_threshold"] if enabled else 10**9,
+                "reset_timeout_s": args.reset_timeout * args.time_scale,
+            }
+        )
+        openai_client, tavily_client = _build_fakes(args.seed, args.time_scale)
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        critic = factory.get_or_build(args.preset)
+        for phase, phase_claims, down in phases:
+            tavily_client.down = down
+            searches = sum(tavily_client.calls.values()) + tavily_client.failed
+            summary = _summarize(phase, _run_turns(critic, phase_claims, args.time_scale))
+            searches = sum(tavily_client.calls.values()) + tavily_client.failed - searches
+            print(
+                f"{'on' if enabled else 'off':<8} {phase:<7} {len(phase_claims):>5} {summary['pass_rate']:>6.1f} "
+                f"{summary['p50_s']:>8.1f} {summary['p95_s']:>8.1f} {summary['calls']:>11.1f} {searches:>9} "
+                f"{tavily_client.failed:>7}"
+            )
+        for line in TAVILY_BREAKER.report_lines():
+            print(line)
+    TAVILY_BREAKER.reset()
+    TAVILY_BREAKER.configure(None)
+
+
+class _EchoFactory:
+    """Critic factory whose critic answers instantly, so the EXP input/output path is all that is measured."""
+
+    class _Critic:
+        def call(self, history):
+            return {"txt": f"반박 {len(history)}", "ref": {}}
+
+    def __init__(self) -> None:
+        self.critic = self._Critic()
+
+    def get_or_build(self, experiment=None, stage_memo=None):
+        return self.critic
+
+    def report_lines(self):
+        return []
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_stream_input(args):
+    """EXP on a synthetic JSONL of `--cases` cases: time to first written result and peak RSS, streamed vs loaded."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "in.jsonl"
+        with input_path.open("w", encoding="utf-8") as f_out:
+            for idx in range(args.cases):
+                turns = [f"주장 {idx}-{turn}: 주간 아파트값 통계는 폐지해야 해." for turn in range(1 + idx % 3)]
+                f_out.write(json.dumps({"case_id": f"c{idx}", "turns": turns}, ensure_ascii=False) + "\n")
+        size_mb = input_path.stat().st_size / 1024 / 1024
+        print(f"입력 {args.cases:,}케이스 ({size_mb:.0f} MB), 시작 시 최대 RSS {_peak_rss_mb():.0f} MB")
+        header = f"{'mode':<8} {'first row(s)':>13} {'total(s)':>9} {'cases/s':>9} {'peak RSS(MB)':>13}"
+        print(header)
+        print("-" * len(header))
+        modes = ("stream", "load") if args.compare else ("stream",)
+        for mode in modes:
+            output_path = Path(tmp) / f"out-{mode}.csv"
+            exp_config = {"default_runs": 1, "default_version": None, "rows": {}, "has_header": False}
+            exp_config["stream"] = mode == "stream"
+            first_row = {}
+            started = time.perf_counter()
+
+            def watch():
+                # The header is one line; the first result row makes the file span two.
+                while not first_row:
+                    if output_path.exists() and output_path.read_bytes()[:4096].count(b"\n") >= 2:
+                        first_row["s"] = time.perf_counter() - started
+                    time.sleep(0.01)
+
+            watcher = threading.Thread(target=watch, daemon=True)
+            watcher.start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                EXPModule(_EchoFactory(), exp_config, input_path, output_path).run()
+            total = time.perf_counter() - started
+            first_row.setdefault("s", total)
+            print(
+                f"{mode:<8} {first_row['s']:>13.2f} {total:>9.1f} {args.cases / total:>9,.0f} {_peak_rss_mb():>13.0f}"
+            )
+
+
+def bench_batch_runs(args):
+    """EXP with `--runs` runs per case, runs one after another vs batched: actual API calls, time and quality spread."""
+    claims = _load_claims(Path(args.input), args.claims)
+    header = (
+        f"{'batch_runs':<10} {'LLM calls':>10} {'searches':>9} {'time(s)':>9} {'quality mean':>13} {'quality sd':>11}"
+    )
+    print(f"주장 {len(claims)}개 x run {args.runs}회")
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "in.csv"
+        with input_path.open("w", newline="", encoding="utf-8") as f_out:
+            csv.writer(f_out).writerows([f"c{idx}", claim] for idx, claim in enumerate(claims))
+        for batched in (False, True):
+            openai_client, tavily_client = _build_fakes(args.seed, args.time_scale)
+            factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+            output_path = Path(tmp) / f"out-{batched}.csv"
+            exp_config = {"default_runs": args.runs, "default_version": args.preset, "rows": {}, "has_header": False}
+            exp_config["batch_runs"] = batched
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                EXPModule(factory, exp_config, input_path, output_path).run()
+            elapsed = (time.perf_counter() - started) / args.time_scale
+            # Fake rebuttals end with their latent quality, e.g. "... ⟦91.2⟧".
+            text = output_path.read_text(encoding="utf-8")
+            quality = [float(value) for value in re.findall(r"⟦([\d.]+)⟧", text)]
+            print(
+                f"{'on' if batched else 'off':<10} {openai_client.calls:>10} {sum(tavily_client.calls.values()):>9} "
+                f"{elapsed:>9.0f} {statistics.mean(quality):>13.1f} {statistics.pstdev(quality):>11.2f}"
+            )
+
+
+def _concurrency_problems(responses, records, recorder, threshold):
+    by_case = {}
+    for record in records:
+        by_case.setdefault(record.get("case_id"), []).append(record)
+    problems = []
+    for case, rsp in enumerate(responses):
+        finals = [r for r in by_case.get(case, []) if r["stage"] == "final"]
+        if len(finals) != 1:
+            problems.append(f"case {case}: final 레코드 {len(finals)}건")
+            continue
+        final = finals[0]
+        if final["rebuttal"] != rsp.get("txt"):
+            problems.append(f"case {case}: 반환된 반박문과 trace가 다릅니다")
+        if threshold is not None:
+            judged = recorder.scores.get((case, rsp.get("txt")), [])
+            if final["score"] not in judged:
+                problems.append(f"case {case}: 점수 {final['score']}는 이 대화에서 매겨진 점수가 아닙니다 {judged}")
+            elif final["passed"] != (final["score"] >= threshold):
+                problems.append(f"case {case}: 통과 판정 {final['passed']}이 점수 {final['score']}와 맞지 않습니다")
+        stage_tokens = sum(r["total_tokens"] or 0 for r in by_case[case] if r["stage"] != "final")
+        if stage_tokens != final["total_tokens"]:
+            problems.append(f"case {case}: 단계 토큰 합 {stage_tokens} != 턴 토큰 {final['total_tokens']}")
+    return problems
+
+
+def hammer_critic(preset, claims, threads, turns, seed=0, time_scale=0.005):
+    """Plays `turns` conversations on one cached critic from `threads` threads; returns (problems, wall seconds)."""
+    openai_client, tavily_client = _build_fakes(seed, time_scale)
+    factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+    critic = factory.get_or_build(preset)
+    recorder = _ScoreRecorder(critic.ij)
+    collector = _TraceCollector()
+
+    def play(case):
+        _CASE.set(case)
+        shared = factory.get_or_build(preset)
+        assert shared is critic, "factory returned a different critic"
+        with trace_context(case_id=case):
+            return shared.call([{"role": "user", "content": claims[case % len(claims)]}])
+
+    # Force very frequent GIL hand-offs so races between a write and its read-back actually interleave.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    started = time.perf_counter()
+    try:
+        with trace_sink(collector), contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(threads) as pool:
+            futures = [_submit_in_context(pool, play, case) for case in range(turns)]
+            responses = [future.result() for future in futures]
+    finally:
+        sys.setswitchinterval(switch_interval)
+    wall_s = time.perf_counter() - started
+    problems = _concurrency_problems(responses, collector.records, recorder, getattr(critic.ij, "pass_threshold", None))
+    return problems, wall_s
+
+
+def check_concurrency(args):
+    """Hammers one cached critic per preset from many threads; every turn must only see its own state."""
+    claims = _load_claims(Path(args.input), args.claims)
+    header = f"{'preset':<16} {'threads':>7} {'turns':>6} {'wall(s)':>8} {'problems':>9}"
+    print(header)
+    print("-" * len(header))
+    failures = []
+    for preset in args.presets.split(","):
+        problems, wall_s = hammer_critic(preset, claims, args.threads, args.turns, args.seed, args.time_scale)
+        print(f"{preset:<16} {args.threads:>7} {args.turns:>6} {wall_s:>8.2f} {len(problems):>9}")
+        failures.extend(f"{preset} {problem}" for problem in problems)
+    for problem in failures[:20]:
+        print(problem)
+    if failures:
+        raise SystemExit(1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CritiqueBot offline benchmarks (fake backends)")
+    parser.add_argument("--input", default="EXP001/in99.csv", help="주장 CSV (마지막 열 사용)")
+    parser.add_argument("--claims", type=int, default=20, help="벤치에 사용할 주장 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-scale", type=float, default=0.005, help="실제 sleep = 시뮬레이션 초 x time_scale")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    strategies = sub.add_parser("strategies", help="직렬 루프 vs best-of-N 통과율/지연 비교")
+    strategies.add_argument("--n", type=int, default=3, help="best-of-N 후보 수")
+    strategies.set_defaults(func=bench_strategies)
+    search_depth = sub.add_parser("search-depth", help="advanced 고정 vs 적응형 검색 깊이의 지연/크레딧 비교")
+    search_depth.set_defaults(func=bench_search_depth)
+    concurrency = sub.add_parser("concurrency", help="캐시된 critic 하나를 여러 스레드에서 동시에 호출해 상태 공유 여부 확인")
+    concurrency.add_argument("--threads", type=int, default=16)
+    concurrency.add_argument("--turns", type=int, default=64)
+    concurrency.add_argument("--presets", default="default,judge-cascade,parallel,budget")
+    concurrency.set_defaults(func=check_concurrency)
+    hedging = sub.add_parser("hedging", help="꼬리 지연이 큰 백엔드에서 중복 요청(hedge) 유무의 p99/토큰 비교")
+    hedging.add_argument("--tail-prob", type=float, default=0.05, help="LLM 호출이 꼬리 지연에 걸릴 확률")
+    hedging.add_argument("--max-hedge-ratio", type=float, default=HEDGING_DEFAULTS["max_hedge_ratio"])
+    hedging.add_argument("--preset", default="default")
+    hedging.set_defaults(func=bench_hedging)
+    deadline = sub.add_parser("deadline", help="요청 제한 시간(deadline) 유무의 턴 지연/단계별 타임아웃 비교")
+    deadline.add_argument("--deadline", type=float, default=150.0, help="턴당 제한 시간 (시뮬레이션 초)")
+    deadline.add_argument("--tail-prob", type=float, default=0.05)
+    deadline.set_defaults(func=bench_deadline)
+    search_outage = sub.add_parser("search-outage", help="Tavily 장애 구간에서 차단기(circuit breaker) 유무의 지연/호출 수 비교")
+    search_outage.add_argument("--reset-timeout", type=float, default=CIRCUIT_BREAKER_DEFAULTS["reset_timeout_s"],
+                               help="half-open 재시도 간격 (시뮬레이션 초)")
+    search_outage.add_argument("--preset", default="default")
+    search_outage.set_defaults(func=bench_search_outage)
+    stream_input = sub.add_parser("stream-input", help="대용량 JSONL 입력의 스트리밍 EXP: 첫 결과까지 시간과 최대 메모리")
+    stream_input.add_argument("--cases", type=int, default=1_000_000)
+    stream_input.add_argument("--compare", action="store_true", help="전체 로드(stream=false) 방식도 이어서 측정")
+    stream_input.set_defaults(func=bench_stream_input)
+    batch_runs = sub.add_parser("batch-runs", help="run 여러 번 반복 시 순차 실행 vs 묶음 실행(n 샘플/검색 공유)의 호출 수 비교")
+    batch_runs.add_argument("--runs", type=int, default=4)
+    batch_runs.add_argument("--preset", default=None)
+    batch_runs.set_defaults(func=bench_batch_runs)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.input = str((Path(__file__).parent / args.input).resolve())
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import argparse
 import os
 from pathlib import Path
 
-from Modules.utils import ensure_packages, load_config, load_exp_config, set_test_mode
+from Modules.utils import REQUEST_HEDGER, ensure_packages, load_config, load_exp_config, set_test_mode
 
 ensure_packages(["openai", "tavily"])
 
@@ -10,19 +10,38 @@ from openai import OpenAI
 from tavily import TavilyClient
 
 from Modules.CLIModule import CLIModule
+from Modules.CircuitBreaker import TAVILY_BREAKER
 from Modules.CriticModule import CriticFactory
 from Modules.EXPModule import EXPModule
+from Modules.Metrics import METRICS
 from Modules.StreamlitModule import StreamlitModule
 
 
 def parse_args():
     parser = argparse.ArgumentParser(description="CritiqueBot runner")
     parser.add_argument("--config", default="config.txt", help="경로 지정 (기본: config.txt)")
-    parser.add_argument("--mode", choices=["cli", "exp", "streamlit"], help="실행 모드 강제 지정")
+    parser.add_argument("--mode", choices=["cli", "exp", "streamlit", "analyze", "sweep"], help="실행 모드 강제 지정")
     parser.add_argument("--version", help="모듈 버전 구성(JSON 또는 프리셋 이름)")
     parser.add_argument("--experiment", help=argparse.SUPPRESS)
     parser.add_argument("--exp-dir", help="실험 CSV 디렉터리 (in/out/exp_config 포함)")
     parser.add_argument("--test-mode", action="store_true", help="TEST_MODE 강제 활성화")
+    parser.add_argument(
+        "--inputs", nargs="+", help="analyze 모드: 결과 파일 또는 EXP 디렉터리, sweep 모드: trace 파일"
+    )
+    parser.add_argument(
+        "--baseline", help="analyze 모드: 비교 기준 설정 (EXP 디렉터리 이름, 매트릭스/trace는 '디렉터리:설정'; 기본: 첫 입력)"
+    )
+    parser.add_argument("--report", help="analyze/sweep 모드: JSON 리포트 저장 경로")
+    parser.add_argument(
+        "--thresholds",
+        nargs="+",
+        type=float,
+        default=[80.0, 85.0, 88.0, 90.0, 92.0, 95.0],
+        help="sweep 모드: 시뮬레이션할 judge pass_threshold 목록",
+    )
+    parser.add_argument(
+        "--max-loops", nargs="+", type=int, default=[1, 2, 3, 4, 5], help="sweep 모드: 시뮬레이션할 max_loop 목록"
+    )
     return parser.parse_args()
 
 
@@ -41,9 +60,13 @@ def load_clients(config: dict):
 
 
 def format_summary(config, runtime_meta):
-    cfg_summary = {module: f"{cfg['version']}@{cfg['model']}" for module, cfg in config.items()}
+    cfg_summary = {
+        module: f"{cfg['version']}@{cfg['model']}" if cfg.get("model") else cfg["version"]
+        for module, cfg in config.items()
+    }
     runtime_summary = {
-        module: f"{meta['class']}({meta['model']})" for module, meta in runtime_meta.items()
+        module: f"{meta['class']}({meta['model']})" if meta.get("model") else meta["class"]
+        for module, meta in runtime_meta.items()
     }
     return cfg_summary, runtime_summary
 
@@ -72,6 +95,22 @@ def _resolve_config_path(arg_path: str) -> Path:
 
 def main():
     args = parse_args()
+    if args.mode == "analyze":
+        # Offline: needs neither config.txt nor API clients.
+        from Modules.AnalyzeModule import AnalyzeModule
+
+        if not args.inputs:
+            raise SystemExit("[CritiqueBot] analyze 모드에는 --inputs 가 필요합니다.")
+        AnalyzeModule(args.inputs, args.report, args.baseline).run()
+        return
+    if args.mode == "sweep":
+        from Modules.ThresholdSweep import ThresholdSweep
+
+        if not args.inputs:
+            raise SystemExit("[CritiqueBot] sweep 모드에는 기록 모드로 만든 trace(--inputs)가 필요합니다.")
+        ThresholdSweep(args.inputs, args.thresholds, args.max_loops, args.report).run()
+        return
+
     config_path = _resolve_config_path(args.config or "config.txt")
     config = load_config(config_path)
     mode = args.mode or config.get("mode", "cli")
@@ -80,11 +119,18 @@ def main():
     set_test_mode(test_mode_flag)
 
     openai_client, tavily_client = load_clients(config)
+    REQUEST_HEDGER.configure(config.get("hedging"))
+    TAVILY_BREAKER.configure(config.get("search_breaker"))
+    if config.get("metrics_port") and mode in ("cli", "exp"):
+        METRICS.serve(int(config["metrics_port"]))
     factory = CriticFactory(
         openai_client=openai_client,
         tavily_client=tavily_client,
         custom_presets=config.get("experiment_presets"),
+        cache_size=config.get("critic_cache_size", 32),
     )
+    if config.get("prewarm"):
+        factory.prewarm(config["prewarm"])
 
     version_override = args.version or args.experiment or config.get("version")
     critic = factory.get_or_build(version_override)
@@ -0,0 +1,29 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the app modules the way main.py does (`from Modules...`).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from Modules.CriticModule import CriticFactory  # noqa: E402
+from Modules.FakeBackends import FakeLatency, FakeOpenAIClient, FakeTavilyClient  # noqa: E402
+
+
+@pytest.fixture
+def history():
+    return [{"role": "user", "content": "주간 아파트값 통계는 폐지해야 해."}]
+
+
+@pytest.fixture
+def fake_factory():
+    """Builds (CriticFactory, fake OpenAI client, fake Tavily client) at a given latency scale."""
+
+    def build(time_scale=0.0):
+        openai_client = FakeOpenAIClient(seed=0, latency=FakeLatency(random.Random(1), time_scale=time_scale))
+        tavily_client = FakeTavilyClient(seed=0, latency=FakeLatency(random.Random(2), time_scale=time_scale))
+        factory = CriticFactory(openai_client=openai_client, tavily_client=tavily_client)
+        return factory, openai_client, tavily_client
+
+    return build
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from Modules.utils import load_batch_config
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [("trace", True), ("stream", True), ("read_ahead", 8), ("batch_runs", True), ("metrics", "run.prom")],
+)
+def test_runner_options_work_as_top_level_keys(tmp_path, key, value):
+    path = tmp_path / "exp_config.txt"
+    path.write_text(json.dumps({key: value}), encoding="utf-8")
+
+    _, runner = load_batch_config(path)
+
+    assert runner[key] == value
+
+
+def test_exp_runner_section_wins_over_top_level_keys(tmp_path):
+    path = tmp_path / "exp_config.txt"
+    path.write_text(json.dumps({"stream": False, "exp_runner": {"stream": True}}), encoding="utf-8")
+
+    _, runner = load_batch_config(path)
+
+    assert runner["stream"] is True
+    assert (runner["read_ahead"], runner["batch_runs"], runner["metrics"]) == (64, False, None)
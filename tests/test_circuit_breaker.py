@@ -0,0 +1,110 @@
+import contextlib
+import io
+
+import pytest
+
+from Modules.CircuitBreaker import CIRCUIT_STATE, CircuitBreaker
+from Modules.CriticModule.Rebuttal import RebuttalSubModule_ver2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _state(breaker):
+    return breaker.state, CIRCUIT_STATE.value(backend=breaker.backend)
+
+
+def test_state_machine(clock):
+    breaker = CircuitBreaker("test-states", failure_threshold=2, reset_timeout_s=30.0, clock=clock)
+    assert _state(breaker) == ("closed", 0)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert _state(breaker) == ("closed", 0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert _state(breaker) == ("open", 2)
+    assert not breaker.available()
+    assert not breaker.allow()
+
+    clock.now += 29.9
+    assert not breaker.allow()
+    clock.now += 0.1
+    assert breaker.available()
+    assert breaker.allow()
+    assert _state(breaker) == ("half_open", 1)
+    # Only one probe at a time.
+    assert not breaker.available()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert _state(breaker) == ("open", 2)
+    assert not breaker.allow()
+
+    clock.now += 30.0
+    assert breaker.allow()
+    assert _state(breaker) == ("half_open", 1)
+    breaker.record_success()
+    assert _state(breaker) == ("closed", 0)
+    assert breaker.stats == {"opened": 1, "rejected": 4, "probes": 2}
+
+
+def test_success_resets_the_failure_streak(clock):
+    breaker = CircuitBreaker("test-streak", failure_threshold=2, clock=clock)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert _state(breaker) == ("closed", 0)
+
+
+def test_released_probe_frees_the_slot_without_a_verdict(clock):
+    breaker = CircuitBreaker("test-release", failure_threshold=1, reset_timeout_s=30.0, clock=clock)
+    breaker.record_failure()
+    clock.now += 30.0
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert _state(breaker) == ("half_open", 1)
+    assert breaker.allow()
+
+
+def test_open_breaker_skips_search_and_query_generation(monkeypatch, clock, fake_factory, history):
+    breaker = CircuitBreaker("test-rebuttal", failure_threshold=2, reset_timeout_s=30.0, clock=clock)
+    monkeypatch.setattr(RebuttalSubModule_ver2, "TAVILY_BREAKER", breaker)
+    factory, openai_client, tavily_client = fake_factory()
+    rebuttal = factory.get_or_build({}).r
+    tavily_client.down = True
+
+    def prepare():
+        calls = openai_client.calls, tavily_client.failed, dict(tavily_client.calls)
+        with contextlib.redirect_stdout(io.StringIO()):
+            context = rebuttal.prepare(history, "요약", None)
+        return context, (openai_client.calls, tavily_client.failed, dict(tavily_client.calls)) != calls
+
+    context, called = prepare()
+    assert called
+    assert context.get("fallback")
+    assert breaker.state == "open"
+
+    context, called = prepare()
+    assert not called
+    assert context == {"fallback": True, "queries": []}
+
+    clock.now += 30.0
+    tavily_client.down = False
+    context, called = prepare()
+    assert called
+    assert not context.get("fallback")
+    assert _state(breaker) == ("closed", 0)
@@ -0,0 +1,33 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+import bench
+from Modules.CriticModule.InternalJudge.InternalJudge_ver1 import InternalJudge_ver1
+
+CLAIMS = bench._load_claims(Path(__file__).resolve().parents[1] / "EXP001" / "in99.csv", 20)
+
+
+@pytest.mark.parametrize("preset", ["default", "judge-cascade", "parallel", "budget", "routed"])
+def test_cached_critic_shared_by_many_threads(preset):
+    problems, _ = bench.hammer_critic(preset, CLAIMS, threads=16, turns=48, time_scale=0.0005)
+
+    assert problems == []
+
+
+def test_cross_talk_is_detected(monkeypatch):
+    # Reintroduce the old bug: the judge keeps its last score on the shared instance and
+    # the verdict reads it back, so concurrent turns can pick up each other's score.
+    call = InternalJudge_ver1.call
+
+    def leaky_call(self, history, summary, rebuttal):
+        verdict = call(self, history, summary, rebuttal)
+        self.last_total_score = verdict.score
+        bench.time.sleep(0.002)
+        return dataclasses.replace(verdict, score=self.last_total_score)
+
+    monkeypatch.setattr(InternalJudge_ver1, "call", leaky_call)
+    problems, _ = bench.hammer_critic("default", CLAIMS, threads=16, turns=48, time_scale=0.0005)
+
+    assert problems
@@ -0,0 +1,37 @@
+import contextlib
+import io
+
+import pytest
+
+from Modules.CriticModule.CriticModule_ver1 import TIMEOUT_REBUTTAL
+
+
+@pytest.fixture
+def call(fake_factory, history):
+    factory, _, _ = fake_factory(time_scale=0.001)
+
+    def run(version, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return factory.get_or_build({"critic": {"version": version, "options": options}}).call(history)
+
+    return run
+
+
+@pytest.mark.parametrize("version", ["v1", "bon"])
+def test_judge_timeouts_return_a_rebuttal(call, version):
+    # Fake latencies are ~2-9 ms at this time scale, so every judge call times out.
+    result = call(version, stage_timeouts={"judge": 0.0005})
+
+    assert set(result) == {"txt", "ref"}
+    assert result["txt"] != TIMEOUT_REBUTTAL["txt"]
+
+
+@pytest.mark.parametrize("version", ["v1", "bon"])
+def test_expired_request_deadline_returns_the_apology(call, version):
+    assert call(version, request_timeout_s=0.001) == TIMEOUT_REBUTTAL
+
+
+@pytest.mark.parametrize("version", ["v1", "bon"])
+def test_loop_deadline_also_bounds_network_calls(call, version):
+    # request_timeout_s keeps its 600 s default; the tighter loop deadline_s must still cut the calls.
+    assert call(version, deadline_s=0.001) == TIMEOUT_REBUTTAL
@@ -0,0 +1,103 @@
+import pytest
+
+from Modules.CriticModule.Rebuttal.EvidenceProcessor import (
+    BM25,
+    EvidenceProcessor,
+    canonical_url,
+    estimate_tokens,
+    tokenize,
+)
+
+
+def _hit(url, snippet="스니펫", title="제목"):
+    return {"url": url, "title": title, "snippet": snippet, "score": None}
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("https://www.Example.com/a/", "http://example.com/a"),
+        ("https://example.com/a?utm_source=x&id=3&fbclid=y", "https://example.com/a?id=3"),
+        ("https://example.com/a?b=2&a=1#top", "https://example.com/a?a=1&b=2"),
+        ("https://example.com/a?ref=home&gclid=1&source=rss", "https://example.com/a"),
+    ],
+)
+def test_canonical_url_equivalents(a, b):
+    assert canonical_url(a) == canonical_url(b)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("https://example.com/a?refid=1", "https://example.com/a"),
+        ("https://example.com/a?id=1", "https://example.com/a?id=2"),
+        ("https://example.com/a", "https://example.org/a"),
+    ],
+)
+def test_canonical_url_keeps_content_params(a, b):
+    assert canonical_url(a) != canonical_url(b)
+
+
+def test_dedupe_merges_by_canonical_url_and_keeps_the_longer_snippet():
+    evidence = [
+        {"query": "q1", "hits": [_hit("https://www.example.com/a/?utm_medium=x", "짧다")]},
+        {"query": "q2", "hits": [_hit("https://example.com/a", "더 긴 스니펫"), _hit("https://example.com/b")]},
+    ]
+
+    hits, duplicates = EvidenceProcessor.dedupe(evidence)
+
+    assert duplicates == 1
+    assert [hit["queries"] for hit in hits] == [["q1", "q2"], ["q2"]]
+    assert hits[0]["snippet"] == "더 긴 스니펫"
+
+
+def test_dedupe_keeps_hits_without_url_by_content():
+    evidence = [
+        {"query": "q1", "hits": [_hit(None, "통계 A"), _hit("", "통계 B")]},
+        {"query": "q2", "hits": [_hit(None, "통계 a")]},
+    ]
+
+    hits, duplicates = EvidenceProcessor.dedupe(evidence)
+
+    assert duplicates == 1
+    assert [(hit["snippet"], hit["queries"]) for hit in hits] == [("통계 A", ["q1", "q2"]), ("통계 B", ["q1"])]
+
+
+def test_tokenize_uses_hangul_bigrams():
+    assert tokenize("아파트값 GDP 2.5") == ["gdp", "2.5", "아파", "파트", "트값"]
+
+
+def test_bm25_ranks_the_matching_document_first():
+    docs = [tokenize("날씨가 맑다"), tokenize("아파트값 통계 발표"), tokenize("아파트 단지 조경")]
+    bm25 = BM25(docs)
+    query = tokenize("아파트값 통계")
+
+    scores = [bm25.score(query, idx) for idx in range(len(docs))]
+
+    assert scores[1] > scores[2] > scores[0] == 0.0
+
+
+def test_process_reranks_and_extracts_top_sentences_in_order():
+    relevant = "날씨 이야기. 아파트값 통계는 매주 발표된다. 관계없는 문장. 주간 통계 폐지 논의가 있다."
+    evidence = [
+        {"query": "q", "hits": [_hit("https://a.example/1", "오늘은 날씨가 맑다."), _hit("https://a.example/2", relevant)]},
+    ]
+
+    hits = EvidenceProcessor(max_sentences_per_hit=2).process(evidence, "주간 아파트값 통계는 폐지해야 해.", None)
+
+    assert [hit["url"] for hit in hits][0] == "https://a.example/2"
+    assert hits[0]["snippet"] == "아파트값 통계는 매주 발표된다. 주간 통계 폐지 논의가 있다."
+    assert hits[0]["score"] > hits[-1]["score"]
+
+
+def test_process_stays_within_the_token_budget():
+    sentence = "아파트값 통계 문장입니다."
+    evidence = [{"query": "q", "hits": [_hit(f"https://a.example/{i}", sentence) for i in range(10)]}]
+    budget = estimate_tokens(sentence) * 3
+
+    processor = EvidenceProcessor(budget_tokens=budget)
+    hits = processor.process(evidence, "아파트값 통계", None)
+
+    assert len(hits) == 3
+    assert processor.stats["kept_tokens"] <= budget
+    assert processor.stats["raw_tokens"] == estimate_tokens(sentence) * 10
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from Modules.Metrics import PARSE_FAILURES
+from Modules.utils import _chat_json, _parse_json_response
+
+SCHEMA = {"type": "object", "properties": {"txt": {"type": "string"}}, "required": ["txt"]}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"txt": "a", "score": 3}', {"txt": "a", "score": 3}),
+        ('```json\n{"txt": "a"}\n```', {"txt": "a"}),
+        ('```\n{"txt": "a"}\n```\n설명은 위와 같습니다.', {"txt": "a"}),
+        ('결과입니다: {"txt": "a"} 이상입니다.', {"txt": "a"}),
+        ('{"txt": "a"}\n\n참고: {"txt": "b"}', {"txt": "a"}),
+        ('{"txt": "a", "ref": {"t": "https://example.com', {"txt": "a", "ref": {"t": "https://example.com"}}),
+        ('{"txt": "a", "score": ', {"txt": "a"}),
+        ('{"txt": "a", "sco', {"txt": "a"}),
+        ('{"ref": {"t": "u", "t2"', {"ref": {"t": "u"}}),
+        ('{"txt": "따옴표 \\"인용\\" 포함', {"txt": '따옴표 "인용" 포함'}),
+        ('{"txt": "a", "queries": ["q1", "q2"', {"txt": "a", "queries": ["q1", "q2"]}),
+        ('{"refs": [{"title": "t", "url": "u"}, {"title": "t2"', {"refs": [{"title": "t", "url": "u"}, {"title": "t2"}]}),
+        ('```json\n{"txt": "a", "queries": ["q1",', {"txt": "a", "queries": ["q1"]}),
+        ("", None),
+        ("JSON으로 답할 수 없습니다.", None),
+        ('["not", "an", "object"]', None),
+        ('{"txt": "a" "score": 3}', None),
+    ],
+)
+def test_parse_json_response(text, expected):
+    assert _parse_json_response(text) == expected
+
+
+class _ScriptedClient:
+    """OpenAI-shaped client answering with the given contents in order."""
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        self.prompts.append(messages[-1]["content"])
+        message = SimpleNamespace(content=self.contents.pop(0))
+        usage = {"prompt_tokens": 1, "completion_tokens": 1}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def _chat(client, module_name):
+    return _chat_json(
+        client, "fake-model", "system", "prompt",
+        tag="Test", module_name=module_name, schema_name="test", schema=SCHEMA,
+    )
+
+
+def test_parseable_output_needs_no_repair():
+    client = _ScriptedClient('```json\n{"txt": "a"}\n```')
+
+    assert _chat(client, "ParseOk") == ({"txt": "a"}, '```json\n{"txt": "a"}\n```')
+    assert len(client.prompts) == 1
+    assert PARSE_FAILURES.value(module="ParseOk", repaired="true") == 0
+
+
+def test_hopeless_output_is_repaired_with_one_retry():
+    client = _ScriptedClient("잘 모르겠습니다.", '{"txt": "a"}')
+
+    data, content = _chat(client, "ParseRepaired")
+
+    assert data == {"txt": "a"}
+    assert content == "잘 모르겠습니다."
+    assert len(client.prompts) == 2
+    assert "잘 모르겠습니다." in client.prompts[1]
+    assert PARSE_FAILURES.value(module="ParseRepaired", repaired="true") == 1
+
+
+def test_failed_repair_is_not_retried_again():
+    client = _ScriptedClient("잘 모르겠습니다.", "여전히 모르겠습니다.", '{"txt": "unused"}')
+
+    assert _chat(client, "ParseFailed") == ({}, "잘 모르겠습니다.")
+    assert len(client.prompts) == 2
+    assert PARSE_FAILURES.value(module="ParseFailed", repaired="false") == 1
@@ -0,0 +1,54 @@
+import pytest
+
+from Modules.CriticModule.Rebuttal.QueryDeduper import QueryDeduper, jaccard, shingles
+
+
+def test_shingles_ignore_word_order_and_particles():
+    assert shingles("주간 아파트값 통계는 폐지") == shingles("폐지 주간 아파트값 통계")
+    assert shingles("아파트값을 조사") == shingles("아파트값 조사")
+
+
+@pytest.mark.parametrize(
+    "a, b, similar",
+    [
+        ("주간 아파트값 통계 폐지 논란", "아파트값 주간 통계의 폐지 논란", True),
+        ("한국 출산율 2023 통계", "2023 한국의 출산율 통계", True),
+        ("주간 아파트값 통계 폐지 논란", "전세 사기 피해 지원 대책", False),
+        ("GDP growth 2023", "unemployment rate 2023", False),
+    ],
+)
+def test_jaccard_separates_paraphrases_from_other_questions(a, b, similar):
+    assert (jaccard(shingles(a), shingles(b)) >= 0.7) is similar
+
+
+def test_jaccard_of_empty_sets_is_zero():
+    assert jaccard(frozenset(), shingles("통계")) == 0.0
+
+
+QUERIES = [
+    "주간 아파트값 통계 폐지 논란",
+    "아파트값 주간 통계의 폐지 논란",
+    "한국부동산원 통계 신뢰도",
+    "전세 사기 피해 지원 대책",
+]
+
+
+def test_collapses_near_duplicates_within_the_limit():
+    deduper = QueryDeduper()
+
+    assert deduper.select(QUERIES, limit=3) == [QUERIES[0], QUERIES[2]]
+    assert deduper.stats == {"batches": 1, "considered": 3, "collapsed": 1, "backfilled": 0, "saved": 1}
+
+
+def test_backfills_freed_slots_from_the_remaining_candidates():
+    deduper = QueryDeduper(backfill=True)
+
+    assert deduper.select(QUERIES, limit=3) == [QUERIES[0], QUERIES[2], QUERIES[3]]
+    assert deduper.stats == {"batches": 1, "considered": 4, "collapsed": 1, "backfilled": 1, "saved": 0}
+
+
+def test_no_savings_without_duplicates():
+    deduper = QueryDeduper()
+
+    assert deduper.select(QUERIES[1:], limit=5) == QUERIES[1:]
+    assert deduper.stats["saved"] == 0
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from Modules.ReferenceValidator import REFERENCE_VALIDATOR, ReferenceValidator
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # path -> (HEAD status, GET status); "/slow" sleeps past the validator timeout.
+    ROUTES = {"/ok": (200, 200), "/missing": (404, 404), "/no-head": (405, 206)}
+
+    def _answer(self, method):
+        self.server.requests.append((method, self.path))
+        if self.path == "/slow":
+            time.sleep(self.server.hang_s)
+        head_status, get_status = self.ROUTES.get(self.path, (200, 200))
+        self.send_response(head_status if method == "HEAD" else get_status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._answer("HEAD")
+
+    def do_GET(self):
+        self._answer("GET")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.hang_s = 2.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def test_verdicts_for_ok_missing_and_head_fallback(server):
+    validator = ReferenceValidator(timeout_s=1.0)
+    ok, missing, no_head = _url(server, "/ok"), _url(server, "/missing"), _url(server, "/no-head")
+
+    verdicts = validator.validate([ok, missing, no_head])
+
+    assert verdicts == {ok: True, missing: False, no_head: True}
+    assert ("GET", "/no-head") in server.requests
+    assert ("GET", "/ok") not in server.requests
+    assert validator.stats["dead"] == 1
+
+
+def test_verdicts_are_cached(server):
+    validator = ReferenceValidator(timeout_s=1.0)
+    ok, missing = _url(server, "/ok"), _url(server, "/missing")
+    validator.validate([ok, missing])
+    sent = len(server.requests)
+
+    assert validator.validate([ok, missing]) == {ok: True, missing: False}
+    assert len(server.requests) == sent
+    assert validator.stats["cache_hits"] == 2
+
+
+def test_slow_server_is_unknown_and_not_reprobed(server):
+    validator = ReferenceValidator(timeout_s=0.2)
+    slow = _url(server, "/slow")
+
+    started = time.monotonic()
+    verdicts = validator.validate([slow])
+
+    assert verdicts == {slow: None}
+    assert time.monotonic() - started < 1.5
+    assert validator.stats["unknown"] == 1
+    sent = len(server.requests)
+
+    assert validator.validate([slow]) == {slow: None}
+    assert len(server.requests) == sent
+    assert validator.stats["cache_hits"] == 1
+
+
+def test_unknown_verdicts_expire_quickly(server):
+    validator = ReferenceValidator(timeout_s=0.2, unknown_ttl_s=0.0)
+    slow = _url(server, "/slow")
+    validator.validate([slow])
+    sent = len(server.requests)
+
+    validator.validate([slow])
+
+    assert len(server.requests) > sent
+
+
+def test_filter_refs_drops_only_dead_links(server):
+    validator = ReferenceValidator(timeout_s=0.2)
+    refs = {"ok": _url(server, "/ok"), "dead": _url(server, "/missing"), "slow": _url(server, "/slow")}
+
+    assert validator.filter_refs(refs) == {"ok": refs["ok"], "slow": refs["slow"]}
+
+
+def test_critic_probes_references_once_per_turn(monkeypatch, fake_factory, history):
+    probes = []
+
+    def validate(urls):
+        urls = list(urls)
+        probes.append(urls)
+        return {url: True for url in urls}
+
+    monkeypatch.setattr(REFERENCE_VALIDATOR, "validate", validate)
+    factory, _, _ = fake_factory()
+    # Unreachable threshold: all three loops produce (and pre-judge) a rebuttal with references.
+    config = {
+        "judge": {"options": {"pass_threshold": 101}},
+        "critic": {"options": {"max_loop": 3, "validate_refs": True}},
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = factory.get_or_build(config).call(history)
+
+    assert result["ref"]
+    assert len(probes) == 1
+    assert sorted(probes[0]) == sorted(result["ref"].values())
@@ -0,0 +1,37 @@
+import contextlib
+import io
+
+from Modules.CriticModule.StageMemo import StageMemo
+
+
+def _config(pass_threshold):
+    # Unreachable thresholds: every loop fails the judge, so each loop ends in a TextGrad call.
+    return {"judge": {"options": {"pass_threshold": pass_threshold}}, "critic": {"options": {"max_loop": 3}}}
+
+
+def test_matrix_configs_differing_in_threshold_share_every_stage(fake_factory, history):
+    factory, openai_client, tavily_client = fake_factory()
+    memo = StageMemo()
+    with memo.scope("c1", 1), contextlib.redirect_stdout(io.StringIO()):
+        first = factory.get_or_build(_config(101), stage_memo=memo).call(history)
+        calls = (openai_client.calls, dict(tavily_client.calls))
+        second = factory.get_or_build(_config(102), stage_memo=memo).call(history)
+
+    assert (openai_client.calls, dict(tavily_client.calls)) == calls
+    assert second == first
+    assert memo.stats["hits"] == memo.stats["misses"]
+
+
+def test_separate_scopes_do_not_share(fake_factory, history):
+    factory, openai_client, _ = fake_factory()
+    memo = StageMemo()
+    critic = factory.get_or_build(_config(101), stage_memo=memo)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with memo.scope("c1", 1):
+            critic.call(history)
+        calls = openai_client.calls
+        with memo.scope("c1", 2):
+            critic.call(history)
+
+    assert openai_client.calls == 2 * calls
+    assert memo.stats["hits"] == 0
@@ -6,7 +6,7 @@ with instructions for editing config.txt directly.
 import json
 from pathlib import Path
 
-from Modules.CriticModule import CriticFactory
+from Modules.CriticModule import CRITIC_VARIANTS, CriticFactory
 
 
 def _default_module_map(factory: CriticFactory):
@@ -30,6 +30,8 @@ def render_readme(factory: CriticFactory) -> str:
     for module_name, builders in sorted(factory.builders.items()):
         versions = ", ".join(sorted(builders.keys()))
         lines.append(f"- {module_name}: {versions}")
+    lines.append(f"- critic (루프 전략): {', '.join(sorted(CRITIC_VARIANTS.keys()))}")
+    lines.append(f"- presets: {', '.join(sorted(factory.presets.keys()))}")
     lines.append("")
     sample = {
         "mode": "cli",